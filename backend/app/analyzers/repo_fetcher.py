@@ -8,7 +8,7 @@ import logging
 import shutil
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 from urllib.parse import urlparse
 
 from git import Repo, GitCommandError
@@ -37,17 +37,26 @@ class RepoFetcher:
         self,
         repo_url: str,
         branch: Optional[str] = None,
-        depth: int = 1,
+        depth: Optional[int] = None,
         token: Optional[str] = None,
+        filter_spec: Optional[str] = "blob:none",
     ) -> Path:
         """
         Clone a repository to local storage.
 
+        By default this is a partial clone with every commit and tree but
+        only the blobs of the checked-out revision: git-history metrics
+        (commit counts, authors, per-commit file lists and numstat) run
+        locally over the full log, and other blobs are fetched on demand
+        in batches. Servers without partial clone support fall back to a
+        full clone.
+
         Args:
             repo_url: Git repository URL (HTTPS)
             branch: Branch to clone (default: default branch)
-            depth: Clone depth (default: 1 for shallow clone)
+            depth: Clone depth (default: full history)
             token: GitHub PAT for private repos (optional, uses settings.GITHUB_PAT if not provided)
+            filter_spec: git --filter spec for a partial clone (None for a regular clone)
 
         Returns:
             Path to the cloned repository
@@ -78,6 +87,7 @@ class RepoFetcher:
                 str(local_path),
                 branch,
                 depth,
+                filter_spec,
             )
 
             logger.info(f"Successfully cloned {repo_url}")
@@ -100,15 +110,19 @@ class RepoFetcher:
         repo_url: str,
         local_path: str,
         branch: Optional[str],
-        depth: int,
+        depth: Optional[int],
+        filter_spec: Optional[str] = None,
     ) -> None:
         """Synchronous clone operation for thread pool."""
-        clone_args = {
+        clone_args: Dict[str, Any] = {
             "url": repo_url,
             "to_path": local_path,
-            "depth": depth,
         }
 
+        if depth:
+            clone_args["depth"] = depth
+        if filter_spec:
+            clone_args["filter"] = filter_spec
         if branch:
             clone_args["branch"] = branch
 
@@ -360,11 +360,11 @@ async def quick_cost_estimate(request: QuickEstimateRequest):
     # Add multi-region estimates
     result["regional_estimates"] = {}
     for region, rates in cocomo_estimator.RATES.items():
-        cost = estimate.hours_typical * rates["typical"]
+        cost_typical, cost_min, cost_max = estimate.cost_range(region)
         result["regional_estimates"][region] = {
-            "cost_typical": round(cost, 2),
-            "cost_min": round(estimate.hours_min * rates["min"], 2),
-            "cost_max": round(estimate.hours_max * rates["max"], 2),
+            "cost_typical": round(cost_typical, 2),
+            "cost_min": round(cost_min, 2),
+            "cost_max": round(cost_max, 2),
             "rate": rates["typical"],
             "currency": rates["currency"],
         }
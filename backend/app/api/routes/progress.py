@@ -121,15 +121,24 @@ class ProgressManager:
         stage_progress: float = 0,
     ) -> Optional[AnalysisProgress]:
         """Update analysis stage."""
+        return await self.update_stage_batch(analysis_id, [(stage, current_step, stage_progress)])
+
+    async def update_stage_batch(
+        self,
+        analysis_id: str,
+        updates: list[tuple[AnalysisStage, str, float]],
+    ) -> Optional[AnalysisProgress]:
+        """Apply back-to-back stage updates in order, broadcasting only the final state."""
         async with self._lock:
             progress = _progress_store.get(analysis_id)
             if not progress:
                 return None
 
-            progress.stage = stage
-            progress.current_step = current_step
-            progress.stage_progress = stage_progress
-            progress.overall_progress = calculate_overall_progress(stage, stage_progress)
+            for stage, current_step, stage_progress in updates:
+                progress.stage = stage
+                progress.current_step = current_step
+                progress.stage_progress = stage_progress
+            progress.overall_progress = calculate_overall_progress(progress.stage, progress.stage_progress)
 
             # Estimate remaining time based on elapsed and progress
             if progress.started_at and progress.overall_progress > 5:
@@ -72,6 +72,10 @@ class Settings(BaseSettings):
     S3_BUCKET: Optional[str] = None
     AWS_REGION: str = "us-east-1"
 
+    # Metrics retention
+    METRICS_RETENTION_DAYS: int = 0  # 0 = keep metrics forever
+    METRICS_RETENTION_INTERVAL: int = 3600  # seconds between retention passes
+
     # GitHub (PAT for private repos, App for webhooks)
     GITHUB_PAT: Optional[str] = None  # Personal Access Token for cloning private repos
     GITHUB_APP_ID: str = ""
@@ -1,9 +1,10 @@
 """
 Database connection and session management.
 """
+import json
 import logging
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -15,8 +16,26 @@ from sqlalchemy.pool import NullPool
 from app.core.config import settings
 from app.core.models.database import Base
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+
+def _json_serializer(obj: Any) -> str:
+    """Serialize JSON columns (e.g. the flat metrics dicts), with orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; let json handle or reject them
+    return json.dumps(obj)
+
+
+_json_deserializer = orjson.loads if orjson is not None else json.loads
+
 # Convert sync URL to async
 DATABASE_URL = settings.DATABASE_URL
 if DATABASE_URL.startswith("postgresql://"):
@@ -27,6 +46,8 @@ engine = create_async_engine(
     DATABASE_URL,
     echo=settings.DEBUG,
     poolclass=NullPool,  # Disable pooling for async
+    json_serializer=_json_serializer,
+    json_deserializer=_json_deserializer,
 )
 
 # Session factory
@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 from typing import Optional, List
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -190,24 +190,24 @@ class TaskRepo:
         analysis_id: UUID,
         tasks: List[dict],
     ) -> List[Task]:
-        """Create multiple tasks."""
-        db_tasks = []
-        for task_data in tasks:
-            task = Task(
-                analysis_id=analysis_id,
-                title=task_data["title"],
-                description=task_data["description"],
-                category=TaskCategory(task_data["category"]),
-                priority=TaskPriority(task_data["priority"]),
-                estimate_hours=task_data["estimate_hours"],
-                labels=task_data.get("labels", []),
-                status=TaskStatus.open,
-            )
-            self.session.add(task)
-            db_tasks.append(task)
-
-        await self.session.flush()
-        return db_tasks
+        """Create multiple tasks (one bulk INSERT, not a flush per object)."""
+        if not tasks:
+            return []
+        rows = [
+            {
+                "analysis_id": analysis_id,
+                "title": task_data["title"],
+                "description": task_data["description"],
+                "category": TaskCategory(task_data["category"]),
+                "priority": TaskPriority(task_data["priority"]),
+                "estimate_hours": task_data["estimate_hours"],
+                "labels": task_data.get("labels", []),
+                "status": TaskStatus.open,
+            }
+            for task_data in tasks
+        ]
+        result = await self.session.scalars(insert(Task).returning(Task), rows)
+        return result.all()
 
     async def get_by_analysis(self, analysis_id: UUID) -> List[Task]:
         """Get all tasks for an analysis."""
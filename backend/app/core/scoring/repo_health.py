@@ -7,24 +7,26 @@ Calculates health scores (0-3) for:
 - Runability
 - Commit History
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any
 import yaml
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RepoHealthScore:
     """Repo Health scoring result."""
     documentation: int  # 0-3
     structure: int      # 0-3
     runability: int     # 0-3
     commit_history: int # 0-3
+    total: int = field(init=False, compare=False)  # Sum of all scores (0-12)
 
-    @property
-    def total(self) -> int:
-        """Sum of all scores (0-12)."""
-        return self.documentation + self.structure + self.runability + self.commit_history
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "total",
+            self.documentation + self.structure + self.runability + self.commit_history,
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -8,11 +8,11 @@ Calculates technical debt scores (0-3) for:
 - Infrastructure
 - Security & Dependencies
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, List
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TechDebtScore:
     """Tech Debt scoring result."""
     architecture: int       # 0-3
@@ -20,16 +20,16 @@ class TechDebtScore:
     testing: int            # 0-3
     infrastructure: int     # 0-3
     security_deps: int      # 0-3
+    total: int = field(init=False, compare=False)  # Sum of all scores (0-15)
 
-    @property
-    def total(self) -> int:
-        """Sum of all scores (0-15)."""
-        return (
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "total",
             self.architecture +
             self.code_quality +
             self.testing +
             self.infrastructure +
-            self.security_deps
+            self.security_deps,
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -3,9 +3,10 @@ Repo Auditor - Main FastAPI Application.
 
 Run with: uvicorn app.main:app --reload
 """
+import asyncio
 import logging
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -30,6 +31,7 @@ from app.api.routes import quick_audit as quick_audit_routes
 from app.api.routes import mcp as mcp_routes
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.metrics.storage import metrics_store
 from app.core.middleware import RateLimitMiddleware, APIKeyMiddleware, RequestLoggingMiddleware
 
 # Configure logging
@@ -47,10 +49,20 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Repo Auditor...")
     await init_db()
     logger.info("Database initialized")
+    retention_task = None
+    if settings.METRICS_RETENTION_DAYS > 0:
+        retention_task = asyncio.create_task(metrics_store.run_retention(
+            settings.METRICS_RETENTION_DAYS, settings.METRICS_RETENTION_INTERVAL,
+        ))
     yield
     # Shutdown
     logger.info("Shutting down Repo Auditor...")
+    if retention_task is not None:
+        retention_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await retention_task
     await close_db()
+    metrics_store.close()
     logger.info("Cleanup complete")
 
 
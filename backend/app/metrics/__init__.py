@@ -14,7 +14,8 @@ Architecture:
                                          └─────────────┘
 
 Components:
-- schema: Unified metric format (Metric, MetricSet, MetricNames)
+- schema: Unified metric format (Metric, MetricSet, MetricColumns, MetricNames)
+- exporters: Prometheus / Datadog encoders (loaded on first use)
 - collectors: Data collection agents (Structure, Git, Static, CI)
 - storage: Metric persistence (JSON, SQLite backends)
 - scoring_engine: Scoring logic (Repo Health, Tech Debt, Classification)
@@ -23,11 +24,13 @@ Components:
 from .schema import (
     Metric,
     MetricSet,
+    MetricColumns,
     MetricType,
     MetricSource,
     MetricCategory,
     MetricLabel,
     MetricNames,
+    MetricSpec,
 )
 from .pipeline import (
     AnalysisPipeline,
@@ -42,11 +45,13 @@ __all__ = [
     # Schema
     "Metric",
     "MetricSet",
+    "MetricColumns",
     "MetricType",
     "MetricSource",
     "MetricCategory",
     "MetricLabel",
     "MetricNames",
+    "MetricSpec",
     # Pipeline
     "AnalysisPipeline",
     "PipelineConfig",
@@ -12,6 +12,7 @@ Additional collectors for:
 import asyncio
 import json
 import logging
+import re
 import shlex
 import subprocess
 from collections import Counter, defaultdict
@@ -25,6 +26,8 @@ from .schema import (
     MetricCategory,
     MetricLabel,
     MetricNames,
+    MetricSpec,
+    MetricType,
 )
 
 logger = logging.getLogger(__name__)
@@ -773,6 +776,11 @@ class GitAnalyticsCollector(BaseCollector):
             logger.warning(f"Churn calculation failed: {e}")
 
 
+# Dockerfile best-practice patterns (bytes, so they scan the raw file contents)
+_DOCKER_USER_RE = re.compile(rb'^(?![ \t]*#).*USER', re.MULTILINE)
+_DOCKER_FROM_RE = re.compile(rb'^FROM ', re.MULTILINE)
+
+
 class DockerAnalyzer(BaseCollector):
     """
     Analyzes Docker configuration best practices.
@@ -846,19 +854,24 @@ class DockerAnalyzer(BaseCollector):
         except Exception as e:
             logger.warning(f"Hadolint analysis failed: {e}")
 
+    @staticmethod
+    def _scan_dockerfile(data: bytes) -> Tuple[bool, bool, bool, bool]:
+        """Check best practices on the raw Dockerfile bytes."""
+        has_user = _DOCKER_USER_RE.search(data) is not None
+        has_healthcheck = data.find(b'HEALTHCHECK') != -1
+        uses_latest = data.find(b':latest') != -1
+        from_count = sum(1 for _ in _DOCKER_FROM_RE.finditer(data))
+        return has_user, has_healthcheck, uses_latest, from_count > 1
+
     async def _analyze_dockerfile(self, repo_path: Path, metrics: MetricSet) -> None:
         """Basic Dockerfile analysis."""
         dockerfile = repo_path / "Dockerfile"
 
         try:
-            content = dockerfile.read_text()
-            lines = content.split('\n')
-
-            # Check for best practices
-            has_user = any('USER' in l and not l.strip().startswith('#') for l in lines)
-            has_healthcheck = any('HEALTHCHECK' in l for l in lines)
-            uses_latest = any(':latest' in l for l in lines)
-            has_multistage = content.count('FROM ') > 1
+            # Dockerfile keywords are ASCII, so scan the raw bytes instead of
+            # decoding the file into a str
+            has_user, has_healthcheck, uses_latest, has_multistage = \
+                self._scan_dockerfile(dockerfile.read_bytes())
 
             # Calculate score
             score = 0
@@ -871,41 +884,16 @@ class DockerAnalyzer(BaseCollector):
             if has_multistage:
                 score += 1  # Multi-stage build
 
-            metrics.add_gauge(
-                "repo.docker.best_practices_score",
-                score,
-                self.source,
-                MetricCategory.INFRASTRUCTURE,
-                description="Docker best practices (0-4)",
-            )
-
-            metrics.add_info(
-                "repo.docker.has_nonroot_user",
-                has_user,
-                self.source,
-                MetricCategory.INFRASTRUCTURE,
-            )
-
-            metrics.add_info(
-                "repo.docker.has_healthcheck",
-                has_healthcheck,
-                self.source,
-                MetricCategory.INFRASTRUCTURE,
-            )
-
-            metrics.add_info(
-                "repo.docker.uses_latest_tag",
-                uses_latest,
-                self.source,
-                MetricCategory.INFRASTRUCTURE,
-            )
-
-            metrics.add_info(
-                "repo.docker.multistage_build",
-                has_multistage,
-                self.source,
-                MetricCategory.INFRASTRUCTURE,
-            )
+            gauge, info = MetricType.GAUGE, MetricType.INFO
+            infra = MetricCategory.INFRASTRUCTURE
+            metrics.add_many([
+                MetricSpec("repo.docker.best_practices_score", score, gauge, self.source, infra,
+                           description="Docker best practices (0-4)"),
+                MetricSpec("repo.docker.has_nonroot_user", has_user, info, self.source, infra),
+                MetricSpec("repo.docker.has_healthcheck", has_healthcheck, info, self.source, infra),
+                MetricSpec("repo.docker.uses_latest_tag", uses_latest, info, self.source, infra),
+                MetricSpec("repo.docker.multistage_build", has_multistage, info, self.source, infra),
+            ])
 
         except Exception as e:
             logger.warning(f"Dockerfile analysis failed: {e}")
@@ -959,29 +947,19 @@ class ComplexityAnalyzer(BaseCollector):
                         avg_complexity = sum(all_complexities) / len(all_complexities)
                         max_complexity = max(all_complexities)
 
-                        metrics.add_gauge(
-                            "repo.quality.complexity_avg",
-                            round(avg_complexity, 2),
-                            self.source,
-                            MetricCategory.CODE_QUALITY,
-                        )
-
-                        metrics.add_gauge(
-                            "repo.quality.complexity_max",
-                            max_complexity,
-                            self.source,
-                            MetricCategory.CODE_QUALITY,
-                        )
-
                         # Count high complexity functions (>10)
                         high_complexity = sum(1 for c in all_complexities if c > 10)
-                        metrics.add_gauge(
-                            "repo.quality.high_complexity_count",
-                            high_complexity,
-                            self.source,
-                            MetricCategory.CODE_QUALITY,
-                            description="Functions with complexity > 10",
-                        )
+
+                        gauge, quality = MetricType.GAUGE, MetricCategory.CODE_QUALITY
+                        metrics.add_many([
+                            MetricSpec("repo.quality.complexity_avg", round(avg_complexity, 2),
+                                       gauge, self.source, quality),
+                            MetricSpec("repo.quality.complexity_max", max_complexity,
+                                       gauge, self.source, quality),
+                            MetricSpec("repo.quality.high_complexity_count", high_complexity,
+                                       gauge, self.source, quality,
+                                       description="Functions with complexity > 10"),
+                        ])
 
                         logger.info(f"  Complexity: avg={avg_complexity:.1f}, max={max_complexity}")
 
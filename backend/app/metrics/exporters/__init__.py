@@ -0,0 +1,6 @@
+"""
+Format-specific metric exporters.
+
+Imported lazily by Metric.to_prometheus / Metric.to_datadog so deployments
+that only serve JSON never load them.
+"""
@@ -0,0 +1,16 @@
+"""
+Datadog DogStatsD / series API format.
+"""
+from typing import Any, Dict
+
+from ..schema import Metric, _TYPE_STR
+
+
+def encode(metric: Metric) -> Dict[str, Any]:
+    """Encode a metric as a Datadog series point."""
+    return {
+        "metric": metric.name,
+        "points": [[metric.timestamp_ns // 1_000_000_000, metric.value]],
+        "type": _TYPE_STR[metric.metric_type],
+        "tags": [f"{l.key}:{l.value}" for l in metric.labels],
+    }
@@ -0,0 +1,20 @@
+"""
+Prometheus text exposition format.
+"""
+from functools import lru_cache
+from typing import Tuple
+
+from ..schema import Metric, MetricLabel
+
+
+@lru_cache(maxsize=4096)
+def _format_labels(labels: Tuple[MetricLabel, ...]) -> str:
+    """Prometheus label string; label sets repeat a lot (e.g. language=python)."""
+    return ",".join(f'{l.key}="{l.value}"' for l in labels)
+
+
+def encode(metric: Metric) -> str:
+    """Encode a metric as a Prometheus sample line."""
+    if metric.labels:
+        return f'{metric.name}{{{_format_labels(tuple(metric.labels))}}} {metric.value}'
+    return f'{metric.name} {metric.value}'
@@ -21,10 +21,13 @@ Pipeline stages:
 5. REPORT: Generate output documents
 """
 import asyncio
+import hashlib
+import json
 import logging
+import time
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
@@ -46,6 +49,11 @@ class PipelineConfig:
     storage_backend: str = "json"
     storage_path: Optional[Path] = None
 
+    @property
+    def reports_needed(self) -> bool:
+        """Whether Stage 4 has anything to render."""
+        return self.generate_reports and bool(self.report_types)
+
 
 @dataclass
 class PipelineResult:
@@ -72,6 +80,8 @@ class PipelineResult:
     # Errors
     errors: List[str]
 
+    _summary: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "analysis_id": self.analysis_id,
@@ -88,7 +98,12 @@ class PipelineResult:
         }
 
     def summary(self) -> str:
-        """Generate human-readable summary."""
+        """Generate human-readable summary (rendered once, then reused)."""
+        if self._summary is None:
+            self._summary = self._render_summary()
+        return self._summary
+
+    def _render_summary(self) -> str:
         if not self.scoring_result:
             return f"Analysis {self.analysis_id} failed: {', '.join(self.errors)}"
 
@@ -163,10 +178,15 @@ class AnalysisPipeline:
 
     def __init__(self, config: Optional[PipelineConfig] = None):
         self.config = config or PipelineConfig()
-        self.store = MetricsStore(
-            backend=self.config.storage_backend,
-            path=self.config.storage_path,
-        )
+        if self.config.storage_path is None and self.config.storage_backend == metrics_store.backend_type:
+            # Default location: share the app-wide store, so its retention
+            # job (METRICS_RETENTION_DAYS) covers what analyses write
+            self.store = metrics_store
+        else:
+            self.store = MetricsStore(
+                backend=self.config.storage_backend,
+                path=self.config.storage_path,
+            )
 
     async def run(
         self,
@@ -188,6 +208,7 @@ class AnalysisPipeline:
             PipelineResult with all analysis data
         """
         started_at = datetime.now(timezone.utc)
+        t0 = time.perf_counter()
         analysis_id = analysis_id or str(uuid.uuid4())[:8]
         repo_path = Path(repo_path)
         repo_url = repo_url or str(repo_path)
@@ -219,13 +240,16 @@ class AnalysisPipeline:
             )
             logger.info(f"[Pipeline] Scoring complete: {scoring_result.verdict}")
 
+            # Scored metrics are in; the set is read-only from here on
+            metrics.freeze()
+
             # Stage 3: STORE
             logger.info(f"[Pipeline] Stage 3: Storing results...")
             await self.store.save(metrics)
             logger.info(f"[Pipeline] Metrics stored")
 
             # Stage 4: REPORT
-            if self.config.generate_reports:
+            if self.config.reports_needed:
                 logger.info(f"[Pipeline] Stage 4: Generating reports...")
                 reports, report_files = await self._generate_reports(
                     analysis_id=analysis_id,
@@ -243,8 +267,8 @@ class AnalysisPipeline:
             errors.append(str(e))
             status = "failed"
 
-        finished_at = datetime.now(timezone.utc)
-        duration = (finished_at - started_at).total_seconds()
+        duration = time.perf_counter() - t0
+        finished_at = started_at + timedelta(seconds=duration)
 
         result = PipelineResult(
             analysis_id=analysis_id,
@@ -273,30 +297,47 @@ class AnalysisPipeline:
         repo_url: str,
         branch: Optional[str],
     ) -> tuple:
-        """Generate reports based on config."""
+        """
+        Generate reports based on config.
+
+        Reports already stored for this analysis are reused when they were
+        rendered from the same inputs (idempotent replay of an analysis).
+        """
         reports = {}
         report_files = []
 
-        # Build AnalysisReport for report builder
-        analysis_report = AnalysisReport(
-            analysis_id=analysis_id,
-            repo_url=repo_url,
-            branch=branch,
-            analyzed_at=metrics.collected_at,
-            repo_health=scoring_result.repo_health,
-            tech_debt=scoring_result.tech_debt,
-            product_level=scoring_result.product_level,
-            complexity=scoring_result.complexity,
-            forward_estimate=scoring_result.forward_estimate,
-            historical_estimate=scoring_result.historical_estimate,
-            tasks=scoring_result.tasks,
-            structure_data=metrics.to_flat_dict(),
-            static_metrics=metrics.to_flat_dict(),
-        )
+        # The report builder only reads these dicts, so one flattened view
+        # serves both structure_data and static_metrics
+        flat_metrics = metrics.to_flat_dict()
+        digest = self._report_digest(metrics, scoring_result, repo_url, branch)
+        analysis_report = None
 
         # Generate requested reports
         for report_type in self.config.report_types:
             try:
+                cached = await self.store.load_report(analysis_id, report_type, digest)
+                if cached is not None:
+                    reports[report_type], file_path = cached
+                    report_files.append(file_path)
+                    continue
+
+                if analysis_report is None:
+                    analysis_report = AnalysisReport(
+                        analysis_id=analysis_id,
+                        repo_url=repo_url,
+                        branch=branch,
+                        analyzed_at=metrics.collected_at,
+                        repo_health=scoring_result.repo_health,
+                        tech_debt=scoring_result.tech_debt,
+                        product_level=scoring_result.product_level,
+                        complexity=scoring_result.complexity,
+                        forward_estimate=scoring_result.forward_estimate,
+                        historical_estimate=scoring_result.historical_estimate,
+                        tasks=scoring_result.tasks,
+                        structure_data=flat_metrics,
+                        static_metrics=flat_metrics,
+                    )
+
                 if report_type == "review":
                     content = report_builder.build_repo_review(analysis_report)
                 elif report_type == "summary":
@@ -304,7 +345,6 @@ class AnalysisPipeline:
                 elif report_type == "markdown":
                     content = report_builder.build_markdown(analysis_report)
                 elif report_type == "json":
-                    import json
                     content = json.dumps(report_builder.build_json(analysis_report), indent=2)
                 else:
                     continue
@@ -312,7 +352,7 @@ class AnalysisPipeline:
                 reports[report_type] = content
 
                 # Save to storage
-                file_path = await self.store.save_report(analysis_id, report_type, content)
+                file_path = await self.store.save_report(analysis_id, report_type, content, digest)
                 if file_path:
                     report_files.append(file_path)
 
@@ -321,6 +361,35 @@ class AnalysisPipeline:
 
         return reports, report_files
 
+    @staticmethod
+    def _report_digest(
+        metrics: MetricSet,
+        scoring_result: ScoringResult,
+        repo_url: str,
+        branch: Optional[str],
+    ) -> str:
+        """
+        Fingerprint of the inputs a rendered report depends on.
+
+        Only values that repeat between runs of an unchanged repository go
+        in: collected_at is a fresh datetime.now() on every collection, so
+        a replayed report keeps the analysis date of the run that rendered it.
+        Collectors run concurrently, so metrics are sorted before hashing.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(json.dumps([repo_url, branch]).encode("utf-8"))
+        for entry in sorted(
+            json.dumps(
+                [m.name, {l.key: l.value for l in m.labels}, m.value],
+                sort_keys=True,
+                default=str,
+            )
+            for m in metrics.metrics
+        ):
+            h.update(entry.encode("utf-8"))
+        h.update(json.dumps(scoring_result.to_dict(), sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
     async def run_batch(
         self,
         repos: List[Dict[str, Any]],
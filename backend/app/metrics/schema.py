@@ -9,11 +9,18 @@ All metrics follow a standardized format for:
 
 Based on OpenMetrics/Prometheus conventions with extensions for repo analysis.
 """
+from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, Any, List, Optional, Union
-import json
+from typing import Dict, Any, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+import sys
+import time
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to stdlib json
+    orjson = None  # type: ignore[assignment]
 
 
 class MetricType(str, Enum):
@@ -52,7 +59,36 @@ class MetricCategory(str, Enum):
     SIZE = "size"
 
 
-@dataclass
+# Enum member -> interned wire string, so exports do one dict probe per field
+# instead of going through the Enum .value descriptor
+_TYPE_STR: Dict[MetricType, str] = {t: sys.intern(t.value) for t in MetricType}
+_SOURCE_STR: Dict[MetricSource, str] = {s: sys.intern(s.value) for s in MetricSource}
+_CATEGORY_STR: Dict[MetricCategory, str] = {c: sys.intern(c.value) for c in MetricCategory}
+
+# ...and back, for decoding stored metrics without calling the Enum constructor
+_TYPE_BY_STR: Dict[str, MetricType] = {t.value: t for t in MetricType}
+_SOURCE_BY_STR: Dict[str, MetricSource] = {s.value: s for s in MetricSource}
+_CATEGORY_BY_STR: Dict[str, MetricCategory] = {c.value: c for c in MetricCategory}
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def ns_to_datetime(ns: int) -> datetime:
+    """Convert epoch nanoseconds to an aware UTC datetime (microsecond precision)."""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def datetime_to_ns(dt: datetime) -> int:
+    """Convert a datetime (naive values are taken as UTC) to epoch nanoseconds."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    # Integer field arithmetic: about twice as fast as dividing timedeltas
+    delta = dt - _EPOCH
+    return ((delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1000
+
+
+@dataclass(slots=True, frozen=True)
 class MetricLabel:
     """Label/tag for a metric (Datadog-style tagging)."""
     key: str
@@ -62,7 +98,11 @@ class MetricLabel:
         return f"{self.key}:{self.value}"
 
 
-@dataclass
+# Shared label container for unlabelled metrics (most of them)
+EMPTY_LABELS: Tuple[MetricLabel, ...] = ()
+
+
+@dataclass(slots=True, frozen=True)
 class Metric:
     """
     Single metric data point — Datadog-style.
@@ -75,50 +115,136 @@ class Metric:
             source=MetricSource.STATIC,
             category=MetricCategory.SIZE,
             labels=[MetricLabel("language", "python")],
-            timestamp=datetime.now(timezone.utc),
         )
+
+    The timestamp is stored as epoch nanoseconds (time.time_ns(), no datetime
+    allocation per metric); `timestamp` converts it to a datetime on demand.
     """
     name: str                           # Namespaced name: "repo.health.documentation"
     value: Union[int, float, bool, str] # Metric value
     metric_type: MetricType             # Type of metric
     source: MetricSource                # What collected it
     category: MetricCategory            # Logical grouping
-    labels: List[MetricLabel] = field(default_factory=list)  # Tags
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    labels: Sequence[MetricLabel] = EMPTY_LABELS  # Tags
+    timestamp_ns: int = field(default_factory=time.time_ns)  # Epoch nanoseconds
     unit: Optional[str] = None          # "lines", "files", "percent", etc.
     description: Optional[str] = None   # Human-readable description
 
+    @property
+    def timestamp(self) -> datetime:
+        """Collection time as an aware UTC datetime."""
+        return ns_to_datetime(self.timestamp_ns)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "value": self.value,
-            "type": self.metric_type.value,
-            "source": self.source.value,
-            "category": self.category.value,
-            "labels": {l.key: l.value for l in self.labels},
-            "timestamp": self.timestamp.isoformat(),
-            "unit": self.unit,
-            "description": self.description,
-        }
+        return _encode_metric(self, self.timestamp.isoformat())
 
     def to_prometheus(self) -> str:
         """Export in Prometheus format."""
-        labels_str = ",".join(f'{l.key}="{l.value}"' for l in self.labels)
-        if labels_str:
-            return f'{self.name}{{{labels_str}}} {self.value}'
-        return f'{self.name} {self.value}'
+        from .exporters.prometheus import encode
+        return encode(self)
 
     def to_datadog(self) -> Dict[str, Any]:
         """Export in Datadog DogStatsD format."""
-        return {
-            "metric": self.name,
-            "points": [[int(self.timestamp.timestamp()), self.value]],
-            "type": self.metric_type.value,
-            "tags": [str(l) for l in self.labels],
-        }
+        from .exporters.datadog import encode
+        return encode(self)
+
 
+def _encode_metric(
+    m: Metric,
+    timestamp: str,
+    _type_str: Dict[MetricType, str] = _TYPE_STR,
+    _source_str: Dict[MetricSource, str] = _SOURCE_STR,
+    _category_str: Dict[MetricCategory, str] = _CATEGORY_STR,
+) -> Dict[str, Any]:
+    """
+    Encode a Metric into its export dict.
+
+    Specialized for the fixed Metric schema: straight-line field access with
+    the enum string maps bound as locals, so Metric.to_dict and
+    MetricSet.iter_records share one encoder.
+    """
+    return {
+        "name": m.name,
+        "value": m.value,
+        "type": _type_str[m.metric_type],
+        "source": _source_str[m.source],
+        "category": _category_str[m.category],
+        "labels": {l.key: l.value for l in m.labels} if m.labels else {},
+        "timestamp": timestamp,
+        "unit": m.unit,
+        "description": m.description,
+    }
+
+
+class MetricSpec(NamedTuple):
+    """
+    Lightweight metric description for bulk insertion via MetricSet.add_many.
+
+    Example:
+        metrics.add_many([
+            MetricSpec("repo.docker.has_healthcheck", True, MetricType.INFO,
+                       MetricSource.CI, MetricCategory.INFRASTRUCTURE),
+            ...
+        ])
+    """
+    name: str
+    value: Union[int, float, bool, str]
+    metric_type: MetricType
+    source: MetricSource
+    category: MetricCategory
+    description: Optional[str] = None
+    unit: Optional[str] = None
+    labels: Optional[Sequence[MetricLabel]] = None
+
+
+@dataclass(slots=True)
+class MetricColumns:
+    """
+    Column-oriented (struct-of-arrays) view of a list of metrics.
 
-@dataclass
+    One list per Metric field, all the same length, so callers that
+    aggregate over values or timestamps walk flat lists instead of Metric
+    objects. to_metric_list() rebuilds the row form for legacy callers.
+    """
+    names: List[str] = field(default_factory=list)
+    values: List[Union[int, float, bool, str]] = field(default_factory=list)
+    metric_types: List[MetricType] = field(default_factory=list)
+    sources: List[MetricSource] = field(default_factory=list)
+    categories: List[MetricCategory] = field(default_factory=list)
+    labels: List[Sequence[MetricLabel]] = field(default_factory=list)
+    timestamps_ns: List[int] = field(default_factory=list)
+    units: List[Optional[str]] = field(default_factory=list)
+    descriptions: List[Optional[str]] = field(default_factory=list)
+
+    @classmethod
+    def from_metrics(cls, metrics: Iterable[Metric]) -> "MetricColumns":
+        """Transpose Metric objects into columns."""
+        columns = cls()
+        for m in metrics:
+            columns.names.append(m.name)
+            columns.values.append(m.value)
+            columns.metric_types.append(m.metric_type)
+            columns.sources.append(m.source)
+            columns.categories.append(m.category)
+            columns.labels.append(m.labels)
+            columns.timestamps_ns.append(m.timestamp_ns)
+            columns.units.append(m.unit)
+            columns.descriptions.append(m.description)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def to_metric_list(self) -> List[Metric]:
+        """Rebuild Metric objects, in column order."""
+        return list(map(
+            Metric,
+            self.names, self.values, self.metric_types, self.sources, self.categories,
+            self.labels, self.timestamps_ns, self.units, self.descriptions,
+        ))
+
+
+@dataclass(slots=True)
 class MetricSet:
     """
     Collection of metrics for a single analysis run.
@@ -130,12 +256,57 @@ class MetricSet:
     repo_url: str
     branch: Optional[str]
     collected_at: datetime
-    metrics: List[Metric] = field(default_factory=list)
+    metrics: Sequence[Metric] = field(default_factory=list)  # tuple once frozen
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    # Column views kept parallel to `metrics` for bulk name/value access
+    _names: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _values: List[Any] = field(default_factory=list, init=False, repr=False, compare=False)
+    # name -> position of the first metric with that name in the columns
+    _by_name: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Category/source buckets so filter_by_* don't rescan every metric
+    _by_category: Dict[MetricCategory, List[Metric]] = field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False,
+    )
+    _by_source: Dict[MetricSource, List[Metric]] = field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False,
+    )
+
+    _frozen: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for m in self.metrics:
+            self._index(m)
+
+    def _index(self, metric: Metric) -> None:
+        name = sys.intern(metric.name)
+        self._by_name.setdefault(name, len(self._names))
+        self._names.append(name)
+        self._values.append(metric.value)
+        self._by_category[metric.category].append(metric)
+        self._by_source[metric.source].append(metric)
+
     def add(self, metric: Metric) -> None:
         """Add a metric to the set."""
-        self.metrics.append(metric)
+        if self._frozen:
+            raise RuntimeError(f"MetricSet {self.analysis_id} is frozen")
+        self.metrics.append(metric)  # type: ignore[attr-defined]  # list until freeze()
+        self._index(metric)
+
+    def freeze(self) -> None:
+        """
+        Mark collection as finished.
+
+        Metrics are stored as a tuple from here on (no list over-allocation)
+        and further add() calls raise RuntimeError.
+        """
+        if not self._frozen:
+            self.metrics = tuple(self.metrics)
+            self._frozen = True
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
 
     def add_gauge(
         self,
@@ -143,18 +314,23 @@ class MetricSet:
         value: Union[int, float],
         source: MetricSource,
         category: MetricCategory,
-        labels: List[MetricLabel] = None,
-        unit: str = None,
-        description: str = None,
+        labels: Optional[Sequence[MetricLabel]] = None,
+        unit: Optional[str] = None,
+        description: Optional[str] = None,
     ) -> None:
         """Convenience method to add a gauge metric."""
+        if labels is None and unit is None and description is None:
+            # Fast lane for plain values: positional construction, defaults
+            # for everything else
+            self.add(Metric(name, value, MetricType.GAUGE, source, category))
+            return
         self.add(Metric(
             name=name,
             value=value,
             metric_type=MetricType.GAUGE,
             source=source,
             category=category,
-            labels=labels or [],
+            labels=labels if labels is not None else EMPTY_LABELS,
             unit=unit,
             description=description,
         ))
@@ -165,17 +341,20 @@ class MetricSet:
         value: int,
         source: MetricSource,
         category: MetricCategory,
-        labels: List[MetricLabel] = None,
-        description: str = None,
+        labels: Optional[Sequence[MetricLabel]] = None,
+        description: Optional[str] = None,
     ) -> None:
         """Convenience method to add a counter metric."""
+        if labels is None and description is None:
+            self.add(Metric(name, value, MetricType.COUNTER, source, category))
+            return
         self.add(Metric(
             name=name,
             value=value,
             metric_type=MetricType.COUNTER,
             source=source,
             category=category,
-            labels=labels or [],
+            labels=labels if labels is not None else EMPTY_LABELS,
             description=description,
         ))
 
@@ -185,39 +364,200 @@ class MetricSet:
         value: Union[bool, str],
         source: MetricSource,
         category: MetricCategory,
-        labels: List[MetricLabel] = None,
-        description: str = None,
+        labels: Optional[Sequence[MetricLabel]] = None,
+        description: Optional[str] = None,
     ) -> None:
         """Convenience method to add an info/boolean metric."""
+        if labels is None and description is None:
+            self.add(Metric(name, value, MetricType.INFO, source, category))
+            return
         self.add(Metric(
             name=name,
             value=value,
             metric_type=MetricType.INFO,
             source=source,
             category=category,
-            labels=labels or [],
+            labels=labels if labels is not None else EMPTY_LABELS,
             description=description,
         ))
 
+    def add_gauges_bulk(
+        self,
+        source: MetricSource,
+        category: MetricCategory,
+        items: Iterable[Tuple[str, Union[int, float]]],
+        *,
+        unit: Optional[str] = None,
+    ) -> None:
+        """
+        Add unlabelled gauges sharing one source/category.
+
+        Args:
+            items: (name, value) pairs
+        """
+        self.add_gauge_rows(source, ((name, value, category) for name, value in items), unit=unit)
+
+    def add_gauge_rows(
+        self,
+        source: MetricSource,
+        rows: Iterable[Tuple[str, Union[int, float], MetricCategory]],
+        *,
+        unit: Optional[str] = None,
+    ) -> None:
+        """
+        Add unlabelled gauges sharing one source (one timestamp for the batch).
+
+        Args:
+            rows: (name, value, category) triples
+        """
+        if self._frozen:
+            raise RuntimeError(f"MetricSet {self.analysis_id} is frozen")
+        timestamp_ns = time.time_ns()
+        gauge = MetricType.GAUGE
+        append, index = self.metrics.append, self._index  # type: ignore[attr-defined]
+        for name, value, category in rows:
+            metric = Metric(name, value, gauge, source, category, EMPTY_LABELS, timestamp_ns, unit)
+            append(metric)
+            index(metric)
+
+    def set_gauge_rows(
+        self,
+        source: MetricSource,
+        rows: Iterable[Tuple[str, Union[int, float], MetricCategory]],
+        *,
+        unit: Optional[str] = None,
+    ) -> None:
+        """
+        Add or replace unlabelled gauges by name.
+
+        Like add_gauge_rows(), but a name that is already in the set has its
+        first metric replaced in place instead of a duplicate appended. Rows
+        whose value is unchanged are skipped, so re-applying the same values
+        to a frozen set is a no-op; any other change to a frozen set raises.
+
+        Args:
+            rows: (name, value, category) triples
+        """
+        by_name, values = self._by_name, self._values
+        replaced = []
+        added = []
+        for row in rows:
+            i = by_name.get(row[0])
+            if i is None:
+                added.append(row)
+            elif values[i] != row[1]:
+                replaced.append((i, row))
+        if not replaced and not added:
+            return
+        if self._frozen:
+            raise RuntimeError(f"MetricSet {self.analysis_id} is frozen")
+
+        timestamp_ns = time.time_ns()
+        metrics = self.metrics
+        for i, (name, value, category) in replaced:
+            old = metrics[i]
+            metric = Metric(old.name, value, MetricType.GAUGE, source, category, EMPTY_LABELS, timestamp_ns, unit)
+            metrics[i] = metric  # type: ignore[index]  # list until freeze()
+            values[i] = value
+            self._rebucket(self._by_category, old, old.category, metric, category)
+            self._rebucket(self._by_source, old, old.source, metric, source)
+        self.add_gauge_rows(source, added, unit=unit)
+
+    @staticmethod
+    def _rebucket(buckets: Dict[Any, List[Metric]], old: Metric, old_key: Any, new: Metric, new_key: Any) -> None:
+        """Swap old for new in a category/source bucket, keeping its position if the key is unchanged."""
+        bucket = buckets[old_key]
+        # Identity, not ==: another metric may compare equal to old
+        pos = next(k for k, m in enumerate(bucket) if m is old)
+        if old_key == new_key:
+            bucket[pos] = new
+        else:
+            del bucket[pos]
+            buckets[new_key].append(new)
+
+    def add_many(self, specs: Iterable[MetricSpec]) -> None:
+        """
+        Add several metrics in one call (one timestamp for the whole batch).
+
+        The batch is built up front and appended to the metric list and the
+        name/value columns with one extend each, instead of per-metric add().
+        """
+        if self._frozen:
+            raise RuntimeError(f"MetricSet {self.analysis_id} is frozen")
+        timestamp_ns = time.time_ns()
+        batch = [
+            Metric(
+                spec.name,
+                spec.value,
+                spec.metric_type,
+                spec.source,
+                spec.category,
+                spec.labels if spec.labels is not None else EMPTY_LABELS,
+                timestamp_ns,
+                spec.unit,
+                spec.description,
+            )
+            for spec in specs
+        ]
+        names = [sys.intern(m.name) for m in batch]
+        start = len(self._names)
+
+        self.metrics.extend(batch)  # type: ignore[attr-defined]  # list until freeze()
+        self._names.extend(names)
+        self._values.extend([m.value for m in batch])
+
+        by_name = self._by_name
+        for i, name in enumerate(names, start):
+            by_name.setdefault(name, i)
+        by_category, by_source = self._by_category, self._by_source
+        for m in batch:
+            by_category[m.category].append(m)
+            by_source[m.source].append(m)
+
     def get(self, name: str) -> Optional[Metric]:
-        """Get a metric by name."""
-        for m in self.metrics:
-            if m.name == name:
-                return m
-        return None
+        """Get a metric by name (first one added wins)."""
+        i = self._by_name.get(name)
+        return None if i is None else self.metrics[i]
 
     def get_value(self, name: str, default: Any = None) -> Any:
-        """Get metric value by name."""
-        m = self.get(name)
-        return m.value if m else default
+        """Get metric value by name (read straight from the value column)."""
+        i = self._by_name.get(name)
+        return default if i is None else self._values[i]
+
+    def value_map(self) -> Dict[str, Any]:
+        """
+        Snapshot of name -> value for bulk lookups.
+
+        Gives the same answer as get_value() for every name (first metric
+        added wins), so repeated reads can be plain dict lookups.
+        """
+        values = self._values
+        return {name: values[i] for name, i in self._by_name.items()}
 
     def filter_by_category(self, category: MetricCategory) -> List[Metric]:
         """Get all metrics in a category."""
-        return [m for m in self.metrics if m.category == category]
+        return list(self._by_category.get(category, ()))
 
     def filter_by_source(self, source: MetricSource) -> List[Metric]:
         """Get all metrics from a source."""
-        return [m for m in self.metrics if m.source == source]
+        return list(self._by_source.get(source, ()))
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield each metric in Metric.to_dict() form.
+
+        Same output as calling to_dict() per metric, but the ISO timestamp
+        is reused across metrics that share a timestamp (e.g. everything
+        from one add_many batch).
+        """
+        encode = _encode_metric
+        last_ns: Optional[int] = None
+        last_iso = ""
+        for m in self.metrics:
+            ns = m.timestamp_ns
+            if ns != last_ns:
+                last_ns, last_iso = ns, m.timestamp.isoformat()
+            yield encode(m, last_iso)
 
     def to_dict(self) -> Dict[str, Any]:
         """Export as dictionary."""
@@ -227,12 +567,18 @@ class MetricSet:
             "branch": self.branch,
             "collected_at": self.collected_at.isoformat(),
             "metrics_count": len(self.metrics),
-            "metrics": [m.to_dict() for m in self.metrics],
+            "metrics": list(self.iter_records()),
             "metadata": self.metadata,
         }
 
     def to_json(self) -> str:
         """Export as JSON string."""
+        if orjson is not None:
+            return orjson.dumps(
+                self.to_dict(),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            ).decode("utf-8")
+        import json
         return json.dumps(self.to_dict(), indent=2)
 
     def to_flat_dict(self) -> Dict[str, Any]:
@@ -241,7 +587,7 @@ class MetricSet:
 
         Returns: {"repo.loc.total": 135000, "repo.health.has_readme": True, ...}
         """
-        return {m.name: m.value for m in self.metrics}
+        return dict(zip(self._names, self._values))
 
 
 # Standard metric names (constants for consistency)
@@ -374,3 +720,11 @@ class MetricNames:
     SCORE_SECURITY = "repo.score.security"
     SCORE_REPO_HEALTH_TOTAL = "repo.score.health_total"
     SCORE_TECH_DEBT_TOTAL = "repo.score.tech_debt_total"
+
+
+# Dotted names are not interned by the compiler; intern them so lookups
+# against the (also interned) MetricSet name index hit on identity
+for _attr, _name in list(vars(MetricNames).items()):
+    if not _attr.startswith("_") and isinstance(_name, str):
+        setattr(MetricNames, _attr, sys.intern(_name))
+del _attr, _name
@@ -9,10 +9,17 @@ This is the core logic layer that:
 
 Datadog analogy: This is like Datadog's metric processing pipeline
 where raw metrics are transformed into actionable insights.
+
+Everything on the scoring path (schema, core.scoring, estimators, task
+generator) is pure Python; keep it free of C-extension-only imports so
+batch scoring can run under PyPy.
 """
 import logging
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 
 from .schema import (
     MetricSet,
@@ -30,8 +37,74 @@ from ..services.task_generator import task_generator, GeneratedTask
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (inclusive) of commit-count buckets for history scores 0..2;
+# the bucket index is the score, anything above the last bound scores 3
+_COMMIT_THRESHOLDS = (5, 30, 200)
+
+# Security score by worst finding severity level (clean, medium, high, critical)
+_SECURITY_SCORES = (3, 2, 1, 0)
+
+# Verdicts that follow directly from the product level; the rest depend on scores
+_VERDICTS = {
+    ProductLevel.NEAR_PRODUCT: "Near-Product",
+    ProductLevel.PLATFORM_MODULE: "Platform Module Candidate",
+    ProductLevel.INTERNAL_TOOL: "Internal Tool",
+}
+
+# Scored metrics written back to the MetricSet: (metric name, score getter, category)
+_REPO_HEALTH_SCORES = (
+    (MetricNames.SCORE_DOCUMENTATION, attrgetter("documentation"), MetricCategory.DOCUMENTATION),
+    (MetricNames.SCORE_STRUCTURE, attrgetter("structure"), MetricCategory.STRUCTURE),
+    (MetricNames.SCORE_RUNABILITY, attrgetter("runability"), MetricCategory.RUNABILITY),
+    (MetricNames.SCORE_HISTORY, attrgetter("commit_history"), MetricCategory.HISTORY),
+    (MetricNames.SCORE_REPO_HEALTH_TOTAL, attrgetter("total"), MetricCategory.DOCUMENTATION),
+)
+_TECH_DEBT_SCORES = (
+    (MetricNames.SCORE_ARCHITECTURE, attrgetter("architecture"), MetricCategory.ARCHITECTURE),
+    (MetricNames.SCORE_CODE_QUALITY, attrgetter("code_quality"), MetricCategory.CODE_QUALITY),
+    (MetricNames.SCORE_TESTING, attrgetter("testing"), MetricCategory.TESTING),
+    (MetricNames.SCORE_INFRASTRUCTURE, attrgetter("infrastructure"), MetricCategory.INFRASTRUCTURE),
+    (MetricNames.SCORE_SECURITY, attrgetter("security_deps"), MetricCategory.SECURITY),
+    (MetricNames.SCORE_TECH_DEBT_TOTAL, attrgetter("total"), MetricCategory.ARCHITECTURE),
+)
+
+# (structure_data key, metric name, default), limited to the keys its
+# consumers read: classify_product_level (api docs, changelog),
+# cost_estimator.estimate_historical (git history) and task_generator
+# (docs folder, Dockerfile)
+_STRUCT_KEYS = (
+    ("has_docs_folder", MetricNames.HAS_DOCS_FOLDER, False),
+    ("has_api_docs", MetricNames.HAS_API_DOCS, False),
+    ("has_changelog", MetricNames.HAS_CHANGELOG, False),
+    ("has_dockerfile", MetricNames.HAS_DOCKERFILE, False),
+    ("commits_total", MetricNames.COMMITS_TOTAL, 0),
+    ("authors_count", MetricNames.AUTHORS_COUNT, 1),
+    ("recent_commits", MetricNames.COMMITS_RECENT, 0),
+)
+
+# static_metrics fields we don't collect yet (default estimates)
+_STATIC_DEFAULTS: Mapping[str, Any] = MappingProxyType({
+    "max_file_lines": 500,
+    "max_function_lines": 50,
+    "duplication_percent": 5,
+    "cyclomatic_complexity_avg": 10,
+    "external_deps_count": 20,
+})
+
+# (static_metrics key, metric name, default)
+_STATIC_KEYS = (
+    ("total_loc", MetricNames.LOC_TOTAL, 0),
+    ("files_count", MetricNames.FILES_TOTAL, 0),
+    ("test_files_count", MetricNames.TEST_FILES_COUNT, 0),
+    ("has_clear_layers", MetricNames.HAS_SRC_DIR, False),
+    ("has_ci", MetricNames.HAS_CI, False),
+    ("ci_has_tests", MetricNames.CI_HAS_TESTS, False),
+    ("has_dockerfile", MetricNames.HAS_DOCKERFILE, False),
+    ("has_deploy_config", MetricNames.CI_HAS_DEPLOY, False),
+)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ScoringResult:
     """Complete scoring result."""
     repo_health: RepoHealthScore
@@ -45,6 +118,7 @@ class ScoringResult:
     verdict: str
 
     def to_dict(self) -> Dict[str, Any]:
+        """Export as dictionary (a new dict on every call, safe to modify)."""
         return {
             "repo_health": self.repo_health.to_dict(),
             "tech_debt": self.tech_debt.to_dict(),
@@ -83,29 +157,49 @@ class ScoringEngine:
         Returns:
             ScoringResult with all calculated scores
         """
-        logger.info(f"[ScoringEngine] Calculating scores for {metrics.analysis_id}")
+        logger.info("[ScoringEngine] Calculating scores for %s", metrics.analysis_id)
+
+        # One pass over the MetricSet; every helper below reads from this dict
+        snap = metrics.value_map()
+
+        result = self._score(snap, region_mode)
+
+        # Add scored metrics back to MetricSet; a rescore replaces the scores
+        # an earlier run wrote, so they always match the returned result
+        self._add_scored_metrics(
+            metrics, result.repo_health, result.tech_debt, result.product_level, result.complexity,
+        )
+        return result
+
+    def _score(self, snap: Mapping[str, Any], region_mode: str) -> ScoringResult:
+        """Compute every score from a metric value snapshot (no side effects)."""
+        # Real or estimated coverage, shared by static_metrics and tech debt
+        coverage = self._estimate_coverage(snap)
 
         # Convert metrics to structure_data format for existing scoring functions
-        structure_data = self._metrics_to_structure_data(metrics)
-        static_metrics = self._metrics_to_static_metrics(metrics)
+        structure_data = self._metrics_to_structure_data(snap)
+        static_metrics = self._metrics_to_static_metrics(snap, coverage)
 
         # Calculate Repo Health
-        repo_health = self._calculate_repo_health(metrics)
-        logger.info(f"  Repo Health: {repo_health.total}/12")
+        repo_health = self._calculate_repo_health(snap)
+        logger.info("  Repo Health: %s/12", repo_health.total)
 
         # Calculate Tech Debt
-        tech_debt = self._calculate_tech_debt(metrics, static_metrics)
-        logger.info(f"  Tech Debt: {tech_debt.total}/15")
+        tech_debt = self._calculate_tech_debt(snap, static_metrics, coverage)
+        logger.info("  Tech Debt: %s/15", tech_debt.total)
 
         # Classify Product Level
         product_level = classify_product_level(repo_health, tech_debt, structure_data)
-        logger.info(f"  Product Level: {product_level.value}")
+        logger.info("  Product Level: %s", product_level.value)
 
         # Calculate Complexity
         complexity = calculate_complexity(static_metrics, repo_health, tech_debt)
-        logger.info(f"  Complexity: {complexity.value}")
+        logger.info("  Complexity: %s", complexity.value)
 
         # Cost Estimation
+        # The estimators and task generator below are pure in-memory CPU work
+        # (tens of microseconds each), so they run inline: a thread pool would
+        # only add submit/join overhead under the GIL.
         forward_estimate = cost_estimator.estimate_forward(complexity, tech_debt, region_mode)
         historical_estimate = cost_estimator.estimate_historical(structure_data)
 
@@ -116,8 +210,10 @@ class ScoringEngine:
             repo_health_total=repo_health.total,
         )
         logger.info(
-            f"  COCOMO II: {cocomo_estimate.hours_typical:.0f} hrs "
-            f"(±20%: {cocomo_estimate.hours_min:.0f}-{cocomo_estimate.hours_max:.0f})"
+            "  COCOMO II: %.0f hrs (±20%%: %.0f-%.0f)",
+            cocomo_estimate.hours_typical,
+            cocomo_estimate.hours_min,
+            cocomo_estimate.hours_max,
         )
 
         # Generate Tasks
@@ -133,9 +229,6 @@ class ScoringEngine:
         # Determine verdict
         verdict = self._determine_verdict(product_level, repo_health, tech_debt)
 
-        # Add scored metrics back to MetricSet
-        self._add_scored_metrics(metrics, repo_health, tech_debt, product_level, complexity)
-
         return ScoringResult(
             repo_health=repo_health,
             tech_debt=tech_debt,
@@ -148,70 +241,31 @@ class ScoringEngine:
             verdict=verdict,
         )
 
-    def _metrics_to_structure_data(self, metrics: MetricSet) -> Dict[str, Any]:
-        """Convert MetricSet to structure_data format for legacy scoring functions."""
-        return {
-            "has_readme": metrics.get_value(MetricNames.HAS_README, False),
-            "readme_has_usage": metrics.get_value(MetricNames.README_HAS_USAGE, False),
-            "readme_has_install": metrics.get_value(MetricNames.README_HAS_INSTALL, False),
-            "has_docs_folder": metrics.get_value(MetricNames.HAS_DOCS_FOLDER, False),
-            "has_architecture_docs": metrics.get_value(MetricNames.HAS_ARCHITECTURE_DOCS, False),
-            "has_api_docs": metrics.get_value(MetricNames.HAS_API_DOCS, False),
-            "has_changelog": metrics.get_value(MetricNames.HAS_CHANGELOG, False),
-            "directory_structure": self._extract_directory_patterns(metrics),
-            "dependency_files": ["requirements.txt"] if metrics.get_value(MetricNames.HAS_DEPS_FILE, False) else [],
-            "has_dockerfile": metrics.get_value(MetricNames.HAS_DOCKERFILE, False),
-            "has_docker_compose": metrics.get_value(MetricNames.HAS_DOCKER_COMPOSE, False),
-            "has_run_instructions": metrics.get_value(MetricNames.HAS_RUN_INSTRUCTIONS, False),
-            "commits_total": metrics.get_value(MetricNames.COMMITS_TOTAL, 0),
-            "authors_count": metrics.get_value(MetricNames.AUTHORS_COUNT, 1),
-            "recent_commits": metrics.get_value(MetricNames.COMMITS_RECENT, 0),
-            "has_version_file": False,  # TODO: add version file detection
-        }
+    def _metrics_to_structure_data(self, snap: Mapping[str, Any]) -> Dict[str, Any]:
+        """Convert MetricSet to the structure_data keys read by the scoring/estimation functions."""
+        data = {key: snap.get(name, default) for key, name, default in _STRUCT_KEYS}
+        data["has_version_file"] = False  # TODO: add version file detection
+        return data
 
-    def _metrics_to_static_metrics(self, metrics: MetricSet) -> Dict[str, Any]:
+    def _metrics_to_static_metrics(self, snap: Mapping[str, Any], coverage: Optional[float]) -> Dict[str, Any]:
         """Convert MetricSet to static_metrics format for legacy scoring functions."""
-        return {
-            "total_loc": metrics.get_value(MetricNames.LOC_TOTAL, 0),
-            "files_count": metrics.get_value(MetricNames.FILES_TOTAL, 0),
-            "test_files_count": metrics.get_value(MetricNames.TEST_FILES_COUNT, 0),
-            "max_file_lines": 500,  # Default estimate
-            "max_function_lines": 50,
-            "has_clear_layers": metrics.get_value(MetricNames.HAS_SRC_DIR, False),
-            "duplication_percent": 5,  # Default estimate
-            "cyclomatic_complexity_avg": 10,
-            "has_ci": metrics.get_value(MetricNames.HAS_CI, False),
-            "ci_has_tests": metrics.get_value(MetricNames.CI_HAS_TESTS, False),
-            "has_dockerfile": metrics.get_value(MetricNames.HAS_DOCKERFILE, False),
-            "has_deploy_config": metrics.get_value(MetricNames.CI_HAS_DEPLOY, False),
-            "test_coverage": self._estimate_coverage(metrics),
-            "external_deps_count": 20,  # Default estimate
-        }
+        gv = snap.get
+        data = {key: gv(name, default) for key, name, default in _STATIC_KEYS}
+        data.update(_STATIC_DEFAULTS)
+        data["test_coverage"] = coverage
+        return data
 
-    def _extract_directory_patterns(self, metrics: MetricSet) -> list:
-        """Extract directory patterns from metrics."""
-        patterns = []
-        if metrics.get_value(MetricNames.HAS_SRC_DIR, False):
-            patterns.append("src")
-        if metrics.get_value(MetricNames.HAS_TESTS_DIR, False):
-            patterns.append("tests")
-        if metrics.get_value(MetricNames.HAS_DOCS_DIR, False):
-            patterns.append("docs")
-        if metrics.get_value(MetricNames.HAS_CONFIG_DIR, False):
-            patterns.append("config")
-        return patterns
-
-    def _estimate_coverage(self, metrics: MetricSet) -> Optional[float]:
+    def _estimate_coverage(self, snap: Mapping[str, Any]) -> Optional[float]:
         """Get real coverage or estimate from metrics."""
         # First, try to get real coverage from CoverageCollector
-        real_coverage = metrics.get_value(MetricNames.TEST_COVERAGE, None)
+        real_coverage = snap.get(MetricNames.TEST_COVERAGE, None)
         if real_coverage is not None and real_coverage > 0:
-            logger.debug(f"Using real coverage: {real_coverage}%")
+            logger.debug("Using real coverage: %s%%", real_coverage)
             return real_coverage
 
         # Fall back to estimate based on test file ratio
-        test_files = metrics.get_value(MetricNames.TEST_FILES_COUNT, 0)
-        total_files = metrics.get_value(MetricNames.FILES_TOTAL, 1)
+        test_files = snap.get(MetricNames.TEST_FILES_COUNT, 0)
+        total_files = snap.get(MetricNames.FILES_TOTAL, 1)
 
         if test_files == 0:
             return 0
@@ -226,46 +280,41 @@ class ScoringEngine:
             return 20
         return 10
 
-    def _calculate_repo_health(self, metrics: MetricSet) -> RepoHealthScore:
+    def _calculate_repo_health(self, snap: Mapping[str, Any]) -> RepoHealthScore:
         """Calculate Repo Health scores from metrics."""
 
         # Documentation score (0-3)
         doc_score = 0
-        if metrics.get_value(MetricNames.HAS_README, False):
+        if snap.get(MetricNames.HAS_README, False):
             doc_score = 1
-            if metrics.get_value(MetricNames.README_HAS_USAGE, False) and \
-               metrics.get_value(MetricNames.README_HAS_INSTALL, False):
+            if snap.get(MetricNames.README_HAS_USAGE, False) and \
+               snap.get(MetricNames.README_HAS_INSTALL, False):
                 doc_score = 2
-            if metrics.get_value(MetricNames.HAS_DOCS_FOLDER, False) and \
-               metrics.get_value(MetricNames.HAS_ARCHITECTURE_DOCS, False):
+            if snap.get(MetricNames.HAS_DOCS_FOLDER, False) and \
+               snap.get(MetricNames.HAS_ARCHITECTURE_DOCS, False):
                 doc_score = 3
 
         # Structure score (0-3)
-        struct_score = metrics.get_value(MetricNames.STRUCTURE_SCORE, 0)
+        struct_score = snap.get(MetricNames.STRUCTURE_SCORE, 0)
         struct_score = min(3, struct_score)
 
         # Runability score (0-3)
         run_score = 0
-        if metrics.get_value(MetricNames.HAS_DEPS_FILE, False):
+        if snap.get(MetricNames.HAS_DEPS_FILE, False):
             run_score = 1
-            if metrics.get_value(MetricNames.HAS_RUN_INSTRUCTIONS, False):
+            if snap.get(MetricNames.HAS_RUN_INSTRUCTIONS, False):
                 run_score = 2
-            if metrics.get_value(MetricNames.HAS_DOCKERFILE, False) and \
-               metrics.get_value(MetricNames.HAS_DOCKER_COMPOSE, False):
+            if snap.get(MetricNames.HAS_DOCKERFILE, False) and \
+               snap.get(MetricNames.HAS_DOCKER_COMPOSE, False):
                 run_score = 3
 
         # History score (0-3)
-        commits = metrics.get_value(MetricNames.COMMITS_TOTAL, 0)
-        authors = metrics.get_value(MetricNames.AUTHORS_COUNT, 1)
-        recent = metrics.get_value(MetricNames.COMMITS_RECENT, 0)
-
-        if commits <= 5:
-            history_score = 0
-        elif commits <= 30:
-            history_score = 1
-        elif commits <= 200:
-            history_score = 2 if not (authors >= 3 and recent >= 10) else 3
-        else:
+        commits = snap.get(MetricNames.COMMITS_TOTAL, 0)
+        authors = snap.get(MetricNames.AUTHORS_COUNT, 1)
+        recent = snap.get(MetricNames.COMMITS_RECENT, 0)
+
+        history_score = bisect_left(_COMMIT_THRESHOLDS, commits)
+        if history_score == 2 and authors >= 3 and recent >= 10:
             history_score = 3
 
         return RepoHealthScore(
@@ -275,12 +324,17 @@ class ScoringEngine:
             commit_history=history_score,
         )
 
-    def _calculate_tech_debt(self, metrics: MetricSet, static_metrics: Dict) -> TechDebtScore:
+    def _calculate_tech_debt(
+        self,
+        snap: Mapping[str, Any],
+        static_metrics: Dict,
+        coverage: Optional[float],
+    ) -> TechDebtScore:
         """Calculate Tech Debt scores from metrics."""
 
         # Architecture score (0-3)
         arch_score = 2  # Default
-        if metrics.get_value(MetricNames.HAS_SRC_DIR, False):
+        if snap.get(MetricNames.HAS_SRC_DIR, False):
             arch_score = 3
         if static_metrics.get("max_file_lines", 0) > 1000:
             arch_score = max(0, arch_score - 2)
@@ -296,9 +350,7 @@ class ScoringEngine:
             quality_score = 3
 
         # Testing score (0-3)
-        test_files = metrics.get_value(MetricNames.TEST_FILES_COUNT, 0)
-        total_files = metrics.get_value(MetricNames.FILES_TOTAL, 1)
-        coverage = self._estimate_coverage(metrics)
+        test_files = snap.get(MetricNames.TEST_FILES_COUNT, 0)
 
         if test_files == 0:
             test_score = 0
@@ -310,10 +362,10 @@ class ScoringEngine:
             test_score = 1
 
         # Infrastructure score (0-3)
-        has_ci = metrics.get_value(MetricNames.HAS_CI, False)
-        ci_has_tests = metrics.get_value(MetricNames.CI_HAS_TESTS, False)
-        has_docker = metrics.get_value(MetricNames.HAS_DOCKERFILE, False)
-        ci_has_deploy = metrics.get_value(MetricNames.CI_HAS_DEPLOY, False)
+        has_ci = snap.get(MetricNames.HAS_CI, False)
+        ci_has_tests = snap.get(MetricNames.CI_HAS_TESTS, False)
+        has_docker = snap.get(MetricNames.HAS_DOCKERFILE, False)
+        ci_has_deploy = snap.get(MetricNames.CI_HAS_DEPLOY, False)
 
         if not has_ci and not has_docker:
             infra_score = 0
@@ -325,7 +377,7 @@ class ScoringEngine:
             infra_score = 1
 
         # Security score (0-3) - based on actual security scan results
-        security_score = self._calculate_security_score(metrics)
+        security_score = self._calculate_security_score(snap)
 
         return TechDebtScore(
             architecture=arch_score,
@@ -335,7 +387,7 @@ class ScoringEngine:
             security_deps=security_score,
         )
 
-    def _calculate_security_score(self, metrics: MetricSet) -> int:
+    def _calculate_security_score(self, snap: Mapping[str, Any]) -> int:
         """
         Calculate security score based on actual scan results.
 
@@ -346,22 +398,19 @@ class ScoringEngine:
         - 0: High/Critical issues or many vulnerabilities
         """
         # Get security metrics
-        critical = metrics.get_value(MetricNames.SEMGREP_CRITICAL, 0)
-        high = metrics.get_value(MetricNames.SEMGREP_HIGH, 0)
-        medium = metrics.get_value(MetricNames.SEMGREP_MEDIUM, 0)
-        low = metrics.get_value(MetricNames.SEMGREP_LOW, 0)
-        vulnerabilities = metrics.get_value(MetricNames.DEPS_VULNERABILITIES, 0)
-        has_secrets = metrics.get_value(MetricNames.HAS_SECRETS_IN_CODE, False)
-
-        # Calculate score
-        if critical > 0 or has_secrets:
-            return 0
-        elif high > 0 or vulnerabilities > 5:
-            return 1
-        elif medium > 2 or vulnerabilities > 0:
-            return 2
-        else:
-            return 3
+        critical = snap.get(MetricNames.SEMGREP_CRITICAL, 0)
+        high = snap.get(MetricNames.SEMGREP_HIGH, 0)
+        medium = snap.get(MetricNames.SEMGREP_MEDIUM, 0)
+        vulnerabilities = snap.get(MetricNames.DEPS_VULNERABILITIES, 0)
+        has_secrets = snap.get(MetricNames.HAS_SECRETS_IN_CODE, False)
+
+        # Worst matching severity level (0 = clean ... 3 = critical) sets the score
+        severity = max(
+            3 * bool(critical > 0 or has_secrets),
+            2 * bool(high > 0 or vulnerabilities > 5),
+            bool(medium > 2 or vulnerabilities > 0),
+        )
+        return _SECURITY_SCORES[severity]
 
     def _determine_verdict(
         self,
@@ -370,18 +419,12 @@ class ScoringEngine:
         tech_debt: TechDebtScore,
     ) -> str:
         """Determine the final verdict."""
-        if product_level == ProductLevel.NEAR_PRODUCT:
-            return "Near-Product"
-        elif product_level == ProductLevel.PLATFORM_MODULE:
-            return "Platform Module Candidate"
-        elif product_level == ProductLevel.INTERNAL_TOOL:
-            return "Internal Tool"
-        elif product_level == ProductLevel.PROTOTYPE:
-            if repo_health.total >= 6 or tech_debt.total >= 6:
-                return "R&D Prototype"
-            return "Archive / Reference Only"
-        else:
-            return "Archive / Reference Only"
+        verdict = _VERDICTS.get(product_level)
+        if verdict is not None:
+            return verdict
+        if product_level == ProductLevel.PROTOTYPE and (repo_health.total >= 6 or tech_debt.total >= 6):
+            return "R&D Prototype"
+        return "Archive / Reference Only"
 
     def _add_scored_metrics(
         self,
@@ -391,23 +434,10 @@ class ScoringEngine:
         product_level: ProductLevel,
         complexity: Complexity,
     ) -> None:
-        """Add calculated scores as metrics."""
-        source = MetricSource.MANUAL  # Scored metrics
-
-        # Repo Health scores
-        metrics.add_gauge(MetricNames.SCORE_DOCUMENTATION, repo_health.documentation, source, MetricCategory.DOCUMENTATION)
-        metrics.add_gauge(MetricNames.SCORE_STRUCTURE, repo_health.structure, source, MetricCategory.STRUCTURE)
-        metrics.add_gauge(MetricNames.SCORE_RUNABILITY, repo_health.runability, source, MetricCategory.RUNABILITY)
-        metrics.add_gauge(MetricNames.SCORE_HISTORY, repo_health.commit_history, source, MetricCategory.HISTORY)
-        metrics.add_gauge(MetricNames.SCORE_REPO_HEALTH_TOTAL, repo_health.total, source, MetricCategory.DOCUMENTATION)
-
-        # Tech Debt scores
-        metrics.add_gauge(MetricNames.SCORE_ARCHITECTURE, tech_debt.architecture, source, MetricCategory.ARCHITECTURE)
-        metrics.add_gauge(MetricNames.SCORE_CODE_QUALITY, tech_debt.code_quality, source, MetricCategory.CODE_QUALITY)
-        metrics.add_gauge(MetricNames.SCORE_TESTING, tech_debt.testing, source, MetricCategory.TESTING)
-        metrics.add_gauge(MetricNames.SCORE_INFRASTRUCTURE, tech_debt.infrastructure, source, MetricCategory.INFRASTRUCTURE)
-        metrics.add_gauge(MetricNames.SCORE_SECURITY, tech_debt.security_deps, source, MetricCategory.SECURITY)
-        metrics.add_gauge(MetricNames.SCORE_TECH_DEBT_TOTAL, tech_debt.total, source, MetricCategory.ARCHITECTURE)
+        """Add calculated scores as metrics (replacing scores from an earlier run)."""
+        rows = [(name, get(repo_health), category) for name, get, category in _REPO_HEALTH_SCORES]
+        rows += [(name, get(tech_debt), category) for name, get, category in _TECH_DEBT_SCORES]
+        metrics.set_gauge_rows(MetricSource.MANUAL, rows)
 
 
 # Singleton instance
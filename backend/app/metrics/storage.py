@@ -12,19 +12,211 @@ Storage structure:
 - Documents: for full analysis reports
 - Cache: for fast lookups
 """
+import asyncio
+import copy
 import json
 import logging
+import os
 from abc import ABC, abstractmethod
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
 import sqlite3
+import threading
 from contextlib import contextmanager
 
-from .schema import MetricSet, Metric
+from .schema import (
+    MetricSet,
+    MetricColumns,
+    Metric,
+    MetricLabel,
+    MetricType,
+    MetricSource,
+    MetricCategory,
+    EMPTY_LABELS,
+    datetime_to_ns,
+    ns_to_datetime,
+    _TYPE_STR,
+    _SOURCE_STR,
+    _CATEGORY_STR,
+    _TYPE_BY_STR,
+    _SOURCE_BY_STR,
+    _CATEGORY_BY_STR,
+)
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to stdlib json
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+# Parser for stored JSON (bytes or str)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps_compact(obj: Any) -> bytes:
+    """Serialize JSON for storage: no indentation or padding, orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+# Per-day list of the metric names each analysis file holds (JSON backend)
+_MANIFEST = "_manifest.json"
+
+# Per-connection SQLite settings. WAL (set once in _init_db, persistent in
+# the file) makes NORMAL sync safe: commits no longer fsync the journal.
+_SQLITE_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+"""
+
+# PRAGMA user_version of the SQLite schema. The baseline schema (text
+# timestamps and columns) is 0 and is migrated straight to this version.
+_SQLITE_SCHEMA_VERSION = 4
+
+# Expands the labels JSON of the selected metrics rows into metric_labels
+_SQL_EXPAND_LABELS = """
+    INSERT OR IGNORE INTO metric_labels (metric_id, key, value)
+    SELECT m.id, j.key, j.value FROM metrics m, json_each(m.labels) j
+"""
+
+# Rolls the numeric values of the selected metrics rows up per (analysis, name)
+_SQL_SUMMARIZE = """
+    INSERT OR REPLACE INTO metric_summaries
+    (analysis_id, name_id, min, max, sum, count, first_ts, last_ts)
+    SELECT analysis_id, name_id, MIN(value), MAX(value), SUM(value), COUNT(value),
+           MIN(timestamp), MAX(timestamp)
+    FROM metrics
+    WHERE value IS NOT NULL {where}
+    GROUP BY analysis_id, name_id
+"""
+
+# v_metrics column order unpacked by the SQLite load loops
+_METRIC_COLUMNS = (
+    "name, value, value_text, metric_type, source, category, labels, unit, description, timestamp"
+)
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+# metrics_rollup bucket width (one hour, in nanoseconds)
+_ROLLUP_BUCKET_NS = 3600 * 10**9
+
+
+def _sql_ns(dt: datetime) -> int:
+    """Epoch nanoseconds for a query bound, clamped to SQLite's INTEGER range."""
+    return min(max(datetime_to_ns(dt), _INT64_MIN), _INT64_MAX)
+
+
+def _sql_statements(script: str) -> List[str]:
+    """Split a SQL script into statements, to run them inside one transaction."""
+    statements, pending = [], ""
+    for line in script.splitlines(keepends=True):
+        pending += line
+        if sqlite3.complete_statement(pending):
+            statements.append(pending.strip())
+            pending = ""
+    return statements
+
+
+def _write_atomic(path: Path, data: bytes, flush: bool = False) -> None:
+    """
+    Replace path's contents via a temp file and os.replace.
+
+    With flush=True the data and the directory entry are fsynced, so the
+    new file survives a crash; otherwise durability is left to the OS.
+    """
+    tmp_file = path.with_name(path.name + ".tmp")
+    with tmp_file.open("wb") as f:
+        f.write(data)
+        if flush:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+    if flush:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _rows_to_columns(rows: List[Any]) -> MetricColumns:
+    """Transpose v_metrics rows (in _METRIC_COLUMNS order) into MetricColumns."""
+    if not rows:
+        return MetricColumns()
+    names, values, value_texts, types, sources, categories, labels, units, descriptions, timestamps = (
+        list(column) for column in zip(*rows)
+    )
+    # Few distinct label sets per analysis: decode each JSON string once
+    # and share the (immutable) label tuple between rows
+    decoded = {
+        text: tuple(MetricLabel(k, v) for k, v in _json_loads(text).items()) if text else EMPTY_LABELS
+        for text in set(labels)
+    }
+    return MetricColumns(
+        names=names,
+        values=[text if value is None else value for value, text in zip(values, value_texts)],
+        metric_types=[_TYPE_BY_STR[t] for t in types],
+        sources=[_SOURCE_BY_STR[s] for s in sources],
+        categories=[_CATEGORY_BY_STR[c] for c in categories],
+        labels=[decoded[text] for text in labels],
+        timestamps_ns=timestamps,
+        units=units,
+        descriptions=descriptions,
+    )
+
+
+def _labels_json(labels: Sequence[MetricLabel]) -> str:
+    """Compact JSON object for the SQLite labels column."""
+    mapping = {l.key: l.value for l in labels}
+    if orjson is not None:
+        return orjson.dumps(mapping).decode()
+    return json.dumps(mapping, separators=(",", ":"))
+
+
+def _aggregate(count: int, low: Any, high: Any, total: Any) -> Dict[str, Any]:
+    """Aggregate result dict; every statistic is None when nothing matched."""
+    if not count:
+        return {"count": 0, "min": None, "max": None, "sum": None, "avg": None}
+    return {"count": count, "min": low, "max": high, "sum": total, "avg": total / count}
+
+
+@lru_cache(maxsize=256)
+def _read_metrics_file(path: Path, mtime_ns: int, size: int) -> Tuple[Dict[str, Any], Tuple[Metric, ...]]:
+    """
+    Parse a stored MetricSet file into (header fields, metrics).
+
+    Cached per (path, mtime, size), so repeat reads of an unchanged file
+    skip parsing; a rewrite changes the key. Results are shared between
+    callers and must not be mutated.
+    """
+    data = _json_loads(path.read_bytes())
+    # Metrics collected together share a timestamp string: parse each once
+    timestamps: Dict[str, int] = {}
+    metrics = []
+    for m in data.pop("metrics", ()):
+        ts = m["timestamp"]
+        ts_ns = timestamps.get(ts)
+        if ts_ns is None:
+            ts_ns = timestamps[ts] = datetime_to_ns(datetime.fromisoformat(ts))
+        metrics.append(Metric(
+            m["name"],
+            m["value"],
+            _TYPE_BY_STR[m["type"]],
+            _SOURCE_BY_STR[m["source"]],
+            _CATEGORY_BY_STR[m["category"]],
+            tuple(MetricLabel(k, v) for k, v in m["labels"].items()) if m.get("labels") else EMPTY_LABELS,
+            ts_ns,
+            m.get("unit"),
+            m.get("description"),
+        ))
+    return data, tuple(metrics)
+
 
 class StorageBackend(ABC):
     """Abstract storage backend."""
@@ -39,6 +231,11 @@ class StorageBackend(ABC):
         """Retrieve a MetricSet by analysis ID."""
         pass
 
+    async def get_metrics_columnar(self, analysis_id: str) -> Optional[MetricColumns]:
+        """Retrieve an analysis's metrics as columns (None if not found)."""
+        metrics = await self.get_metrics(analysis_id)
+        return MetricColumns.from_metrics(metrics.metrics) if metrics is not None else None
+
     @abstractmethod
     async def list_analyses(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """List all analyses (summary only)."""
@@ -55,6 +252,24 @@ class StorageBackend(ABC):
         """Query metrics by name and filters."""
         pass
 
+    @abstractmethod
+    async def compact(self, retention_days: int = 90) -> int:
+        """Drop analyses collected more than retention_days ago; return how many."""
+        pass
+
+    async def aggregate_metrics(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """count/min/max/sum/avg over a metric's numeric values in a time range."""
+        values = [
+            m.value for m in await self.query_metrics(metric_name, start_time, end_time)
+            if isinstance(m.value, (int, float))
+        ]
+        return _aggregate(len(values), min(values, default=None), max(values, default=None), sum(values))
+
 
 class JSONFileStorage(StorageBackend):
     """
@@ -63,107 +278,253 @@ class JSONFileStorage(StorageBackend):
     Structure:
         storage_dir/
         ├── metrics/
-        │   ├── {analysis_id}.json
-        │   └── ...
+        │   ├── YYYY/MM/DD/              (day of collected_at)
+        │   │   ├── {analysis_id}.json
+        │   │   └── _manifest.json       (analysis_id -> metric names)
+        │   └── {analysis_id}.json       (pre-partitioning layout, still read)
         ├── reports/
         │   ├── {analysis_id}_review.md
         │   └── ...
-        └── index.json
+        └── index.ndjson   (append-only, last line per analysis wins)
     """
 
     def __init__(self, storage_dir: Path):
         self.storage_dir = Path(storage_dir)
         self.metrics_dir = self.storage_dir / "metrics"
         self.reports_dir = self.storage_dir / "reports"
-        self.index_file = self.storage_dir / "index.json"
+        self.index_file = self.storage_dir / "index.ndjson"
 
         # Create directories
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
         self.reports_dir.mkdir(parents=True, exist_ok=True)
 
-        # Initialize index
+        # In-memory index (analysis_id -> entry, oldest first), kept in step
+        # with index.ndjson by reading only lines appended since last sync
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._index_pos = 0
+        self._index_lines = 0
+        self._index_ino: Optional[int] = None
+        # The index and manifests are shared mutable state, so all file I/O
+        # runs serialized on one thread instead of blocking the event loop
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json-storage")
+
+        # Initialize index. Without index.ndjson, a pre-NDJSON index.json is
+        # read into memory; the file is only written (migrated) on first save
         if not self.index_file.exists():
-            self._save_index([])
+            legacy_file = self.storage_dir / "index.json"
+            legacy = _json_loads(legacy_file.read_bytes()) if legacy_file.exists() else []
+            self._index = {entry["analysis_id"]: entry for entry in reversed(legacy)}
+        self._sync_index()
+
+    def _sync_index(self) -> None:
+        """Apply index lines appended since the last sync (full reload if the file was replaced)."""
+        try:
+            stat = self.index_file.stat()
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._index_ino or stat.st_size < self._index_pos:
+            self._index = {}
+            self._index_pos = self._index_lines = 0
+            self._index_ino = stat.st_ino
+        if stat.st_size == self._index_pos:
+            return
+
+        with self.index_file.open("rb") as f:
+            f.seek(self._index_pos)
+            chunk = f.read()
+        # Only consume complete lines; a partial last line is re-read next time
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if line:
+                entry = _json_loads(line)
+                self._index[entry["analysis_id"]] = entry
+                self._index_lines += 1
+        self._index_pos += end
+
+    def _append_index(self, entry: Dict[str, Any]) -> None:
+        """Record an index entry with a single appended line."""
+        self._sync_index()
+        if not self.index_file.exists():
+            # First write: create index.ndjson with any migrated entries
+            self._index[entry["analysis_id"]] = entry
+            self._compact_index()
+            return
+        line = (json.dumps(entry) + "\n").encode()
+        with self.index_file.open("ab") as f:
+            start = f.seek(0, 2)
+            f.write(line)
+        if start == self._index_pos:
+            self._index_pos += len(line)
+            self._index_lines += 1
+        self._index[entry["analysis_id"]] = entry
+
+        # Rewrite once superseded lines outnumber live entries
+        if self._index_lines > 2 * len(self._index) + 16:
+            self._compact_index()
+
+    def _compact_index(self) -> None:
+        """Rewrite index.ndjson with one line per analysis (atomic replace)."""
+        data = "".join(json.dumps(entry) + "\n" for entry in self._index.values()).encode()
+        _write_atomic(self.index_file, data)
+        self._index_ino = self.index_file.stat().st_ino
+        self._index_pos = len(data)
+        self._index_lines = len(self._index)
+
+    def _day_dir(self, collected_at: datetime) -> Path:
+        return self.metrics_dir / f"{collected_at:%Y/%m/%d}"
+
+    def _metrics_file(self, analysis_id: str) -> Optional[Path]:
+        """Locate an analysis' metrics file (day partition first, then the flat layout)."""
+        self._sync_index()
+        entry = self._index.get(analysis_id)
+        if entry:
+            path = self._day_dir(datetime.fromisoformat(entry["collected_at"])) / f"{analysis_id}.json"
+            if path.exists():
+                return path
+        legacy = self.metrics_dir / f"{analysis_id}.json"
+        return legacy if legacy.exists() else None
+
+    def _update_manifest(self, day_dir: Path, analysis_id: str, names: Optional[List[str]]) -> None:
+        """Set (or with names=None, drop) an analysis' metric names in a day manifest."""
+        manifest_file = day_dir / _MANIFEST
+        manifest = _json_loads(manifest_file.read_bytes()) if manifest_file.exists() else {}
+        if names is None:
+            manifest.pop(analysis_id, None)
+        else:
+            manifest[analysis_id] = names
+        _write_atomic(manifest_file, _json_dumps_compact(manifest))
+
+    def _day_dirs(self, start_time: Optional[datetime], end_time: Optional[datetime]) -> Iterator[Path]:
+        """Day partitions that can hold analyses collected in [start_time, end_time]."""
+        # One day of slack either side: partitions use collected_at's own timezone
+        lo = (start_time.date() - timedelta(days=1)) if start_time else date.min
+        hi = (end_time.date() + timedelta(days=1)) if end_time else date.max
+
+        def numbered(parent: Path) -> Iterator[Tuple[int, Path]]:
+            for child in parent.iterdir():
+                if child.is_dir() and child.name.isdigit():
+                    yield int(child.name), child
+
+        for year, year_dir in numbered(self.metrics_dir):
+            if not lo.year <= year <= hi.year:
+                continue
+            for month, month_dir in numbered(year_dir):
+                if not (lo.year, lo.month) <= (year, month) <= (hi.year, hi.month):
+                    continue
+                for day, day_dir in numbered(month_dir):
+                    if lo <= date(year, month, day) <= hi:
+                        yield day_dir
+
+    def _day_files(self, day_dir: Path, metric_name: str) -> List[Path]:
+        """Metrics files in a day partition whose manifest lists metric_name."""
+        manifest_file = day_dir / _MANIFEST
+        if not manifest_file.exists():
+            return [p for p in day_dir.glob("*.json") if p.name != _MANIFEST]
+        manifest = _json_loads(manifest_file.read_bytes())
+        files = (day_dir / f"{aid}.json" for aid, names in manifest.items() if metric_name in names)
+        return [p for p in files if p.exists()]
 
-    def _load_index(self) -> List[Dict[str, Any]]:
-        """Load analysis index."""
-        if self.index_file.exists():
-            return json.loads(self.index_file.read_text())
-        return []
+    # Async API: thin wrappers over the _*_sync methods below
 
-    def _save_index(self, index: List[Dict[str, Any]]) -> None:
-        """Save analysis index."""
-        self.index_file.write_text(json.dumps(index, indent=2))
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io, func, *args)
 
     async def save_metrics(self, metrics: MetricSet) -> None:
         """Save MetricSet to JSON file."""
-        # Save full metrics
-        metrics_file = self.metrics_dir / f"{metrics.analysis_id}.json"
-        metrics_file.write_text(metrics.to_json())
+        await self._run(self._save_metrics_sync, metrics)
+
+    async def get_metrics(self, analysis_id: str) -> Optional[MetricSet]:
+        """Load MetricSet from JSON file."""
+        return await self._run(self._get_metrics_sync, analysis_id)
+
+    async def list_analyses(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """List analyses from index (newest first)."""
+        return await self._run(self._list_analyses_sync, limit, offset)
 
-        # Update index
-        index = self._load_index()
-        index_entry = {
+    async def query_metrics(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> List[Metric]:
+        """Query metrics across all analyses."""
+        return await self._run(self._query_metrics_sync, metric_name, start_time, end_time, labels)
+
+    async def compact(self, retention_days: int = 90) -> int:
+        """Delete the metrics files and index entries of analyses older than retention_days."""
+        return await self._run(self._compact_sync, retention_days)
+
+    async def save_report(
+        self,
+        analysis_id: str,
+        report_type: str,
+        content: str,
+        digest: Optional[str] = None,
+        flush: bool = False,
+    ) -> Path:
+        """Save a generated report (and the digest of its inputs, if given)."""
+        return await self._run(self._save_report_sync, analysis_id, report_type, content, digest, flush)
+
+    async def load_report(self, analysis_id: str, report_type: str, digest: str) -> Optional[tuple]:
+        """Return (content, path) of a stored report rendered from inputs matching digest."""
+        return await self._run(self._load_report_sync, analysis_id, report_type, digest)
+
+    def _save_metrics_sync(self, metrics: MetricSet) -> None:
+        """Save MetricSet to JSON file."""
+        analysis_id = metrics.analysis_id
+        previous = self._metrics_file(analysis_id)
+
+        # Save full metrics under the day it was collected
+        day_dir = self._day_dir(metrics.collected_at)
+        day_dir.mkdir(parents=True, exist_ok=True)
+        metrics_file = day_dir / f"{analysis_id}.json"
+        # Compact: indentation is about a third of an indented to_json() file
+        metrics_file.write_bytes(_json_dumps_compact(metrics.to_dict()))
+        self._update_manifest(day_dir, analysis_id, sorted(set(metrics.to_flat_dict())))
+
+        # Re-saved with a different collected_at (or from the flat layout): drop the old copy
+        if previous is not None and previous != metrics_file:
+            previous.unlink(missing_ok=True)
+            if previous.parent != self.metrics_dir:
+                self._update_manifest(previous.parent, analysis_id, None)
+
+        # Update index (an existing analysis keeps its place in the listing)
+        self._append_index({
             "analysis_id": metrics.analysis_id,
             "repo_url": metrics.repo_url,
             "branch": metrics.branch,
             "collected_at": metrics.collected_at.isoformat(),
             "metrics_count": len(metrics.metrics),
-        }
-
-        # Update or append
-        updated = False
-        for i, entry in enumerate(index):
-            if entry["analysis_id"] == metrics.analysis_id:
-                index[i] = index_entry
-                updated = True
-                break
-        if not updated:
-            index.insert(0, index_entry)
-
-        self._save_index(index)
+        })
         logger.info(f"Saved metrics for {metrics.analysis_id} ({len(metrics.metrics)} metrics)")
 
-    async def get_metrics(self, analysis_id: str) -> Optional[MetricSet]:
+    def _get_metrics_sync(self, analysis_id: str) -> Optional[MetricSet]:
         """Load MetricSet from JSON file."""
-        metrics_file = self.metrics_dir / f"{analysis_id}.json"
-        if not metrics_file.exists():
+        metrics_file = self._metrics_file(analysis_id)
+        if metrics_file is None:
             return None
 
-        data = json.loads(metrics_file.read_text())
-
-        # Reconstruct MetricSet
-        from .schema import MetricType, MetricSource, MetricCategory, MetricLabel
-
-        metrics_list = []
-        for m in data.get("metrics", []):
-            metrics_list.append(Metric(
-                name=m["name"],
-                value=m["value"],
-                metric_type=MetricType(m["type"]),
-                source=MetricSource(m["source"]),
-                category=MetricCategory(m["category"]),
-                labels=[MetricLabel(k, v) for k, v in m.get("labels", {}).items()],
-                timestamp=datetime.fromisoformat(m["timestamp"]),
-                unit=m.get("unit"),
-                description=m.get("description"),
-            ))
+        stat = metrics_file.stat()
+        header, metrics = _read_metrics_file(metrics_file, stat.st_mtime_ns, stat.st_size)
 
+        # Fresh container per call; the cached Metric objects are immutable
         return MetricSet(
-            analysis_id=data["analysis_id"],
-            repo_url=data["repo_url"],
-            branch=data.get("branch"),
-            collected_at=datetime.fromisoformat(data["collected_at"]),
-            metrics=metrics_list,
-            metadata=data.get("metadata", {}),
+            analysis_id=header["analysis_id"],
+            repo_url=header["repo_url"],
+            branch=header.get("branch"),
+            collected_at=datetime.fromisoformat(header["collected_at"]),
+            metrics=list(metrics),
+            metadata=copy.deepcopy(header.get("metadata", {})),
         )
 
-    async def list_analyses(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-        """List analyses from index."""
-        index = self._load_index()
-        return index[offset:offset + limit]
+    def _list_analyses_sync(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """List analyses from index (newest first)."""
+        self._sync_index()
+        return list(islice(reversed(self._index.values()), offset, offset + limit))
 
-    async def query_metrics(
+    def _query_metrics_sync(
         self,
         metric_name: str,
         start_time: Optional[datetime] = None,
@@ -173,8 +534,16 @@ class JSONFileStorage(StorageBackend):
         """Query metrics across all analyses."""
         results = []
 
-        for metrics_file in self.metrics_dir.glob("*.json"):
-            data = json.loads(metrics_file.read_text())
+        # Flat-layout files, then only the day partitions the time range touches
+        files = list(self.metrics_dir.glob("*.json"))
+        for day_dir in self._day_dirs(start_time, end_time):
+            files.extend(self._day_files(day_dir, metric_name))
+
+        # Parsed timestamp strings, shared across files
+        timestamps: Dict[str, int] = {}
+        required = frozenset(labels.items()) if labels else frozenset()
+        for metrics_file in files:
+            data = _json_loads(metrics_file.read_bytes())
             collected_at = datetime.fromisoformat(data["collected_at"])
 
             # Time filter
@@ -187,33 +556,85 @@ class JSONFileStorage(StorageBackend):
                 if m["name"] != metric_name:
                     continue
 
-                # Labels filter
-                if labels:
-                    m_labels = m.get("labels", {})
-                    if not all(m_labels.get(k) == v for k, v in labels.items()):
-                        continue
+                # Labels filter: every required (key, value) pair present
+                if required and not m.get("labels", {}).items() >= required:
+                    continue
 
-                from .schema import MetricType, MetricSource, MetricCategory, MetricLabel
+                ts = m["timestamp"]
+                ts_ns = timestamps.get(ts)
+                if ts_ns is None:
+                    ts_ns = timestamps[ts] = datetime_to_ns(datetime.fromisoformat(ts))
+                m_labels = m.get("labels")
                 results.append(Metric(
-                    name=m["name"],
-                    value=m["value"],
-                    metric_type=MetricType(m["type"]),
-                    source=MetricSource(m["source"]),
-                    category=MetricCategory(m["category"]),
-                    labels=[MetricLabel(k, v) for k, v in m.get("labels", {}).items()],
-                    timestamp=datetime.fromisoformat(m["timestamp"]),
+                    m["name"],
+                    m["value"],
+                    _TYPE_BY_STR[m["type"]],
+                    _SOURCE_BY_STR[m["source"]],
+                    _CATEGORY_BY_STR[m["category"]],
+                    tuple(MetricLabel(k, v) for k, v in m_labels.items()) if m_labels else EMPTY_LABELS,
+                    ts_ns,
                 ))
 
-        return sorted(results, key=lambda m: m.timestamp, reverse=True)
-
-    async def save_report(self, analysis_id: str, report_type: str, content: str) -> Path:
-        """Save a generated report."""
-        filename = f"{analysis_id}_{report_type}.md"
-        report_file = self.reports_dir / filename
-        report_file.write_text(content)
+        return sorted(results, key=lambda m: m.timestamp_ns, reverse=True)
+
+    def _compact_sync(self, retention_days: int = 90) -> int:
+        """Delete the metrics files and index entries of analyses older than retention_days."""
+        cutoff = datetime_to_ns(datetime.now(timezone.utc) - timedelta(days=retention_days))
+        self._sync_index()
+        expired = [
+            analysis_id for analysis_id, entry in self._index.items()
+            if datetime_to_ns(datetime.fromisoformat(entry["collected_at"])) < cutoff
+        ]
+        for analysis_id in expired:
+            metrics_file = self._metrics_file(analysis_id)
+            if metrics_file is not None:
+                metrics_file.unlink(missing_ok=True)
+                if metrics_file.parent != self.metrics_dir:
+                    self._update_manifest(metrics_file.parent, analysis_id, None)
+            del self._index[analysis_id]
+
+        if expired:
+            self._compact_index()
+            logger.info(f"Retention removed {len(expired)} analyses older than {retention_days} days")
+        return len(expired)
+
+    def _report_path(self, analysis_id: str, report_type: str) -> Path:
+        return self.reports_dir / f"{analysis_id}_{report_type}.md"
+
+    def _save_report_sync(
+        self,
+        analysis_id: str,
+        report_type: str,
+        content: str,
+        digest: Optional[str] = None,
+        flush: bool = False,
+    ) -> Path:
+        """
+        Save a generated report (and the digest of its inputs, if given).
+
+        Files are published with an atomic rename, so readers never see a
+        partial report. flush=True also fsyncs them before returning.
+        """
+        report_file = self._report_path(analysis_id, report_type)
+        digest_file = report_file.with_suffix(".digest")
+        # Drop the old digest first so a crash mid-save can't pair it with new content
+        digest_file.unlink(missing_ok=True)
+        _write_atomic(report_file, content.encode(), flush)
+        if digest:
+            _write_atomic(digest_file, digest.encode(), flush)
         logger.info(f"Saved report: {report_file}")
         return report_file
 
+    def _load_report_sync(self, analysis_id: str, report_type: str, digest: str) -> Optional[tuple]:
+        """Return (content, path) of a stored report rendered from inputs matching digest."""
+        report_file = self._report_path(analysis_id, report_type)
+        digest_file = report_file.with_suffix(".digest")
+        if not report_file.exists() or not digest_file.exists():
+            return None
+        if digest_file.read_text() != digest:
+            return None
+        return report_file.read_text(), report_file
+
 
 class SQLiteStorage(StorageBackend):
     """
@@ -222,162 +643,437 @@ class SQLiteStorage(StorageBackend):
     Tables:
     - analyses: Analysis metadata
     - metrics: Individual metrics (time-series friendly)
+    - metric_names / metric_types / metric_sources / metric_categories:
+      lookup tables for the dictionary-encoded metric columns
     - reports: Generated reports
+
+    The v_metrics view joins metrics back to its text columns.
     """
 
     def __init__(self, db_path: Path):
         self.db_path = Path(db_path)
+        # Lookup ids are never reassigned, so these caches cannot go stale
+        self._name_ids: Dict[str, int] = {}
+        self._type_ids: Dict[MetricType, int] = {}
+        self._source_ids: Dict[MetricSource, int] = {}
+        self._category_ids: Dict[MetricCategory, int] = {}
+        # One thread for all writes, so saves queue up instead of contending
+        # for the database write lock
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        # Connection pool: one persistent connection per thread
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
         self._init_db()
 
     @contextmanager
     def _get_conn(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        Get this thread's database connection.
+
+        Each thread opens one connection on first use, applies the pragmas
+        once and keeps it; close_all() closes them. A failed operation rolls
+        back whatever transaction it left open, since the connection lives on.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_SQLITE_PRAGMAS)
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
         try:
             yield conn
-        finally:
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    def close_all(self) -> None:
+        """Close every pooled connection (shutdown hook); later calls reconnect."""
+        # Let queued and running writes (e.g. a retention pass whose task was
+        # cancelled) finish before their connection is closed underneath them
+        self._writer.submit(lambda: None).result()
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._local = threading.local()
+        for conn in conns:
             conn.close()
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
+        """
+        Initialize database schema, migrating a baseline database in place.
+
+        The whole migration runs in one transaction (no executescript, which
+        commits on its own), so a failure leaves the database as it was.
+        """
         with self._get_conn() as conn:
-            conn.executescript("""
-                CREATE TABLE IF NOT EXISTS analyses (
-                    analysis_id TEXT PRIMARY KEY,
-                    repo_url TEXT NOT NULL,
-                    branch TEXT,
-                    collected_at TIMESTAMP NOT NULL,
-                    metrics_count INTEGER DEFAULT 0,
-                    metadata JSON,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                CREATE TABLE IF NOT EXISTS metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    analysis_id TEXT NOT NULL,
-                    name TEXT NOT NULL,
-                    value REAL,
-                    value_text TEXT,
-                    metric_type TEXT NOT NULL,
-                    source TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    labels JSON,
-                    unit TEXT,
-                    description TEXT,
-                    timestamp TIMESTAMP NOT NULL,
-                    FOREIGN KEY (analysis_id) REFERENCES analyses(analysis_id)
-                );
-
-                CREATE INDEX IF NOT EXISTS idx_metrics_analysis ON metrics(analysis_id);
-                CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics(name);
-                CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics(timestamp);
-                CREATE INDEX IF NOT EXISTS idx_metrics_category ON metrics(category);
-
-                CREATE TABLE IF NOT EXISTS reports (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    analysis_id TEXT NOT NULL,
-                    report_type TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (analysis_id) REFERENCES analyses(analysis_id)
-                );
-            """)
-            conn.commit()
+            conn.execute("PRAGMA journal_mode=WAL")  # not allowed inside a transaction
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            migrate = version == 0 and ("metrics" in tables or "metrics_old" in tables)
+
+            conn.execute("BEGIN IMMEDIATE")
+            with conn:  # commits, or rolls back the whole migration on error
+                if migrate and "metrics_old" in tables:
+                    # Left by a migration that committed its renames before
+                    # failing: the baseline rows are still in metrics_old and
+                    # analyses_v0, next to an empty new schema
+                    conn.execute("DROP VIEW IF EXISTS v_metrics")
+                    for table in ("metric_labels", "metric_summaries", "metrics"):
+                        conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    if "analyses_v0" in tables:
+                        conn.execute("DROP TABLE IF EXISTS analyses")
+                elif migrate:
+                    # Move the baseline tables aside (without rewriting
+                    # references to them) and copy their rows back once the
+                    # new schema exists
+                    for index in ("idx_metrics_analysis", "idx_metrics_name",
+                                  "idx_metrics_timestamp", "idx_metrics_category"):
+                        conn.execute(f"DROP INDEX IF EXISTS {index}")
+                    conn.execute("PRAGMA legacy_alter_table=ON")
+                    try:
+                        conn.execute("ALTER TABLE metrics RENAME TO metrics_old")
+                        conn.execute("ALTER TABLE analyses RENAME TO analyses_v0")
+                    finally:
+                        conn.execute("PRAGMA legacy_alter_table=OFF")
+
+                # Timestamps are INTEGER nanoseconds since the epoch (UTC); metric
+                # name, type, source and category are ids into lookup tables
+                schema = """
+                    CREATE TABLE IF NOT EXISTS analyses (
+                        analysis_id TEXT PRIMARY KEY,
+                        repo_url TEXT NOT NULL,
+                        branch TEXT,
+                        collected_at INTEGER NOT NULL,
+                        metrics_count INTEGER DEFAULT 0,
+                        metadata JSON,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    );
+
+                    CREATE TABLE IF NOT EXISTS metric_names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+                    CREATE TABLE IF NOT EXISTS metric_types (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+                    CREATE TABLE IF NOT EXISTS metric_sources (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+                    CREATE TABLE IF NOT EXISTS metric_categories (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+
+                    CREATE TABLE IF NOT EXISTS metrics (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        analysis_id TEXT NOT NULL,
+                        name_id INTEGER NOT NULL REFERENCES metric_names(id),
+                        value REAL,
+                        value_text TEXT,
+                        type_id INTEGER NOT NULL REFERENCES metric_types(id),
+                        source_id INTEGER NOT NULL REFERENCES metric_sources(id),
+                        category_id INTEGER NOT NULL REFERENCES metric_categories(id),
+                        labels JSON,
+                        unit TEXT,
+                        description TEXT,
+                        timestamp INTEGER NOT NULL,
+                        FOREIGN KEY (analysis_id) REFERENCES analyses(analysis_id)
+                    );
+
+                    -- (analysis_id, timestamp) also serves analysis_id-only lookups
+                    CREATE INDEX IF NOT EXISTS idx_metrics_analysis_ts ON metrics(analysis_id, timestamp);
+                    CREATE INDEX IF NOT EXISTS idx_metrics_name_ts ON metrics(name_id, timestamp);
+                    CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics(timestamp);
+                    CREATE INDEX IF NOT EXISTS idx_metrics_category ON metrics(category_id);
+
+                    CREATE VIEW IF NOT EXISTS v_metrics AS
+                    SELECT m.id, m.analysis_id, n.name, m.value, m.value_text,
+                           t.name AS metric_type, s.name AS source, c.name AS category,
+                           m.labels, m.unit, m.description, m.timestamp
+                    FROM metrics m
+                    JOIN metric_names n ON n.id = m.name_id
+                    JOIN metric_types t ON t.id = m.type_id
+                    JOIN metric_sources s ON s.id = m.source_id
+                    JOIN metric_categories c ON c.id = m.category_id;
+
+                    -- Covers list_analyses: newest-first index scan, no sort or table lookups
+                    CREATE INDEX IF NOT EXISTS idx_analyses_ts
+                    ON analyses(collected_at DESC, analysis_id, repo_url, branch, metrics_count);
+
+                    -- One row per metric label; mirrors metrics.labels for filtering in SQL
+                    CREATE TABLE IF NOT EXISTS metric_labels (
+                        metric_id INTEGER NOT NULL REFERENCES metrics(id),
+                        key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        PRIMARY KEY (metric_id, key)
+                    ) WITHOUT ROWID;
+                    CREATE INDEX IF NOT EXISTS idx_labels_kv ON metric_labels(key, value);
+
+                    -- Numeric rollup per (analysis, metric name), rebuilt on every save
+                    CREATE TABLE IF NOT EXISTS metric_summaries (
+                        analysis_id TEXT NOT NULL,
+                        name_id INTEGER NOT NULL REFERENCES metric_names(id),
+                        min REAL,
+                        max REAL,
+                        sum REAL,
+                        count INTEGER NOT NULL,
+                        first_ts INTEGER NOT NULL,
+                        last_ts INTEGER NOT NULL,
+                        PRIMARY KEY (analysis_id, name_id)
+                    ) WITHOUT ROWID;
+                    CREATE INDEX IF NOT EXISTS idx_summaries_name ON metric_summaries(name_id, first_ts);
+
+                    -- Hourly rollup of numeric values from analyses removed by compact()
+                    CREATE TABLE IF NOT EXISTS metrics_rollup (
+                        name_id INTEGER NOT NULL REFERENCES metric_names(id),
+                        bucket INTEGER NOT NULL,
+                        count INTEGER NOT NULL,
+                        min REAL,
+                        max REAL,
+                        sum REAL,
+                        PRIMARY KEY (name_id, bucket)
+                    ) WITHOUT ROWID;
+
+                    CREATE TABLE IF NOT EXISTS reports (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        analysis_id TEXT NOT NULL,
+                        report_type TEXT NOT NULL,
+                        content TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (analysis_id) REFERENCES analyses(analysis_id)
+                    );
+                """
+                for statement in _sql_statements(schema):
+                    conn.execute(statement)
+
+                self._type_ids = self._seed_lookup(conn, "metric_types", _TYPE_STR)
+                self._source_ids = self._seed_lookup(conn, "metric_sources", _SOURCE_STR)
+                self._category_ids = self._seed_lookup(conn, "metric_categories", _CATEGORY_STR)
+                if migrate:
+                    self._copy_legacy_rows(conn)
+                    conn.execute(_SQL_EXPAND_LABELS)
+                    conn.execute(_SQL_SUMMARIZE.format(where=""))
+                self._name_ids = dict(conn.execute("SELECT name, id FROM metric_names").fetchall())
+                conn.execute(f"PRAGMA user_version = {_SQLITE_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _seed_lookup(conn: sqlite3.Connection, table: str, values: Dict[Any, str]) -> Dict[Any, int]:
+        """Make sure every enum value has a row in its lookup table; return enum -> id."""
+        conn.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", [(v,) for v in values.values()])
+        ids = dict(conn.execute(f"SELECT name, id FROM {table}").fetchall())
+        return {member: ids[value] for member, value in values.items()}
+
+    def _lookup_name_ids(self, conn: sqlite3.Connection, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Map metric names to ids, inserting unknown names.
+
+        New ids are only returned, not cached: the caller stores the map
+        once its transaction has committed.
+        """
+        missing = [(name,) for name in set(names) if name not in self._name_ids]
+        if not missing:
+            return self._name_ids
+        conn.executemany("INSERT OR IGNORE INTO metric_names (name) VALUES (?)", missing)
+        return dict(conn.execute("SELECT name, id FROM metric_names").fetchall())
+
+    def _copy_legacy_rows(self, conn: sqlite3.Connection) -> None:
+        """
+        Copy rows from the baseline schema, then drop the old tables.
+
+        The baseline stored ISO-8601 text timestamps and text
+        name/type/source/category columns.
+        """
+        def to_ns(text: str) -> int:
+            return datetime_to_ns(datetime.fromisoformat(text))
+
+        analyses = conn.execute("""
+            SELECT analysis_id, repo_url, branch, collected_at, metrics_count, metadata, created_at
+            FROM analyses_v0
+        """).fetchall()
+        conn.executemany("""
+            INSERT INTO analyses
+            (analysis_id, repo_url, branch, collected_at, metrics_count, metadata, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(*r[:3], to_ns(r[3]), *r[4:]) for r in analyses])
+
+        metrics = conn.execute("""
+            SELECT id, analysis_id, name, value, value_text, metric_type, source, category,
+                   labels, unit, description, timestamp
+            FROM metrics_old
+        """).fetchall()
+        name_ids = self._lookup_name_ids(conn, (r[2] for r in metrics))
+        conn.executemany("""
+            INSERT INTO metrics
+            (id, analysis_id, name_id, value, value_text, type_id, source_id, category_id,
+             labels, unit, description, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            r[0], r[1], name_ids[r[2]], r[3], r[4],
+            self._type_ids[_TYPE_BY_STR[r[5]]],
+            self._source_ids[_SOURCE_BY_STR[r[6]]],
+            self._category_ids[_CATEGORY_BY_STR[r[7]]],
+            r[8], r[9], r[10], to_ns(r[11]),
+        ) for r in metrics])
+
+        conn.execute("DROP TABLE metrics_old")
+        conn.execute("DROP TABLE analyses_v0")
+        logger.info(f"Migrated {len(metrics)} metrics from the baseline SQLite schema")
+
+    # Async API. Reads run on the default thread pool (WAL lets them overlap
+    # a write); writes are serialized on this storage's single writer thread.
 
     async def save_metrics(self, metrics: MetricSet) -> None:
-        """Save MetricSet to SQLite."""
-        with self._get_conn() as conn:
-            # Insert/update analysis
-            conn.execute("""
-                INSERT OR REPLACE INTO analyses
-                (analysis_id, repo_url, branch, collected_at, metrics_count, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                metrics.analysis_id,
-                metrics.repo_url,
-                metrics.branch,
-                metrics.collected_at.isoformat(),
-                len(metrics.metrics),
-                json.dumps(metrics.metadata),
-            ))
+        """Save MetricSet to SQLite (on the writer thread)."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self._save_metrics_sync, metrics)
+
+    async def get_metrics(self, analysis_id: str) -> Optional[MetricSet]:
+        """Load MetricSet from SQLite."""
+        return await asyncio.to_thread(self._get_metrics_sync, analysis_id)
+
+    async def get_metrics_columnar(self, analysis_id: str) -> Optional[MetricColumns]:
+        """Load an analysis's metrics as columns."""
+        return await asyncio.to_thread(self._get_metrics_columnar_sync, analysis_id)
 
-            # Delete old metrics for this analysis
-            conn.execute("DELETE FROM metrics WHERE analysis_id = ?", (metrics.analysis_id,))
+    async def list_analyses(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """List analyses."""
+        return await asyncio.to_thread(self._list_analyses_sync, limit, offset)
 
-            # Insert metrics
-            for m in metrics.metrics:
-                value_num = m.value if isinstance(m.value, (int, float)) else None
-                value_text = str(m.value) if not isinstance(m.value, (int, float)) else None
+    async def query_metrics(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> List[Metric]:
+        """Query metrics by name and filters."""
+        return await asyncio.to_thread(self._query_metrics_sync, metric_name, start_time, end_time, labels)
+
+    async def aggregate_metrics(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """count/min/max/sum/avg over a metric's numeric values in a time range."""
+        return await asyncio.to_thread(self._aggregate_metrics_sync, metric_name, start_time, end_time)
+
+    async def compact(self, retention_days: int = 90) -> int:
+        """Roll up and delete analyses older than retention_days (on the writer thread)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, self._compact_sync, retention_days)
+
+    async def query_rollup(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Hourly buckets kept for a metric after its raw rows were compacted away."""
+        return await asyncio.to_thread(self._query_rollup_sync, metric_name, start_time, end_time)
+
+    def _save_metrics_sync(self, metrics: MetricSet) -> None:
+        """Save MetricSet to SQLite."""
+        analysis_id = metrics.analysis_id
+        # enum -> lookup id maps hoisted out of the row loop
+        type_ids, source_ids, category_ids = self._type_ids, self._source_ids, self._category_ids
+
+        with self._get_conn() as conn:
+            # One write transaction for the upsert, delete and bulk insert
+            conn.execute("BEGIN IMMEDIATE")
+            with conn:  # commits, or rolls back on error
+                name_ids = self._lookup_name_ids(conn, (m.name for m in metrics.metrics))
+                rows = []
+                for m in metrics.metrics:
+                    value = m.value
+                    is_num = isinstance(value, (int, float))
+                    rows.append((
+                        analysis_id,
+                        name_ids[m.name],
+                        value if is_num else None,
+                        None if is_num else str(value),
+                        type_ids[m.metric_type],
+                        source_ids[m.source],
+                        category_ids[m.category],
+                        _labels_json(m.labels) if m.labels else "{}",
+                        m.unit,
+                        m.description,
+                        m.timestamp_ns,
+                    ))
 
                 conn.execute("""
-                    INSERT INTO metrics
-                    (analysis_id, name, value, value_text, metric_type, source, category, labels, unit, description, timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT OR REPLACE INTO analyses
+                    (analysis_id, repo_url, branch, collected_at, metrics_count, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?)
                 """, (
-                    metrics.analysis_id,
-                    m.name,
-                    value_num,
-                    value_text,
-                    m.metric_type.value,
-                    m.source.value,
-                    m.category.value,
-                    json.dumps({l.key: l.value for l in m.labels}),
-                    m.unit,
-                    m.description,
-                    m.timestamp.isoformat(),
+                    analysis_id,
+                    metrics.repo_url,
+                    metrics.branch,
+                    datetime_to_ns(metrics.collected_at),
+                    len(rows),
+                    json.dumps(metrics.metadata),
                 ))
 
-            conn.commit()
-            logger.info(f"Saved {len(metrics.metrics)} metrics to SQLite")
+                # Delete old metrics (and their labels and summaries) for this analysis
+                conn.execute("""
+                    DELETE FROM metric_labels
+                    WHERE metric_id IN (SELECT id FROM metrics WHERE analysis_id = ?)
+                """, (analysis_id,))
+                conn.execute("DELETE FROM metric_summaries WHERE analysis_id = ?", (analysis_id,))
+                conn.execute("DELETE FROM metrics WHERE analysis_id = ?", (analysis_id,))
 
-    async def get_metrics(self, analysis_id: str) -> Optional[MetricSet]:
+                conn.executemany("""
+                    INSERT INTO metrics
+                    (analysis_id, name_id, value, value_text, type_id, source_id, category_id,
+                     labels, unit, description, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                if any(m.labels for m in metrics.metrics):
+                    conn.execute(
+                        _SQL_EXPAND_LABELS + " WHERE m.analysis_id = ? AND m.labels != '{}'",
+                        (analysis_id,),
+                    )
+                conn.execute(_SQL_SUMMARIZE.format(where="AND analysis_id = ?"), (analysis_id,))
+
+            self._name_ids = name_ids
+            logger.info(f"Saved {len(rows)} metrics to SQLite")
+
+    def _get_metrics_sync(self, analysis_id: str) -> Optional[MetricSet]:
         """Load MetricSet from SQLite."""
         with self._get_conn() as conn:
             # Get analysis
             row = conn.execute(
-                "SELECT * FROM analyses WHERE analysis_id = ?",
+                "SELECT analysis_id, repo_url, branch, collected_at, metadata FROM analyses WHERE analysis_id = ?",
                 (analysis_id,)
             ).fetchone()
 
             if not row:
                 return None
 
-            # Get metrics
+            # Get metrics, in insertion order
             metrics_rows = conn.execute(
-                "SELECT * FROM metrics WHERE analysis_id = ?",
+                f"SELECT {_METRIC_COLUMNS} FROM v_metrics WHERE analysis_id = ? ORDER BY id",
                 (analysis_id,)
             ).fetchall()
 
-            from .schema import MetricType, MetricSource, MetricCategory, MetricLabel
-
-            metrics_list = []
-            for m in metrics_rows:
-                value = m["value"] if m["value"] is not None else m["value_text"]
-                labels_dict = json.loads(m["labels"]) if m["labels"] else {}
-
-                metrics_list.append(Metric(
-                    name=m["name"],
-                    value=value,
-                    metric_type=MetricType(m["metric_type"]),
-                    source=MetricSource(m["source"]),
-                    category=MetricCategory(m["category"]),
-                    labels=[MetricLabel(k, v) for k, v in labels_dict.items()],
-                    timestamp=datetime.fromisoformat(m["timestamp"]),
-                    unit=m["unit"],
-                    description=m["description"],
-                ))
+            # Built column-wise: one positional Metric(...) per row via map()
+            metrics_list = _rows_to_columns(metrics_rows).to_metric_list()
 
             return MetricSet(
                 analysis_id=row["analysis_id"],
                 repo_url=row["repo_url"],
                 branch=row["branch"],
-                collected_at=datetime.fromisoformat(row["collected_at"]),
+                collected_at=ns_to_datetime(row["collected_at"]),
                 metrics=metrics_list,
-                metadata=json.loads(row["metadata"]) if row["metadata"] else {},
+                metadata=_json_loads(row["metadata"]) if row["metadata"] else {},
             )
 
-    async def list_analyses(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    def _get_metrics_columnar_sync(self, analysis_id: str) -> Optional[MetricColumns]:
+        """Load an analysis's metrics straight into columns, without building Metric objects."""
+        with self._get_conn() as conn:
+            if conn.execute("SELECT 1 FROM analyses WHERE analysis_id = ?", (analysis_id,)).fetchone() is None:
+                return None
+            rows = conn.execute(
+                f"SELECT {_METRIC_COLUMNS} FROM v_metrics WHERE analysis_id = ? ORDER BY id",
+                (analysis_id,)
+            ).fetchall()
+
+        return _rows_to_columns(rows)
+
+    def _list_analyses_sync(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """List analyses."""
         with self._get_conn() as conn:
             rows = conn.execute("""
@@ -387,9 +1083,14 @@ class SQLiteStorage(StorageBackend):
                 LIMIT ? OFFSET ?
             """, (limit, offset)).fetchall()
 
-            return [dict(row) for row in rows]
+        analyses = []
+        for row in rows:
+            entry = dict(row)
+            entry["collected_at"] = ns_to_datetime(entry["collected_at"]).isoformat()
+            analyses.append(entry)
+        return analyses
 
-    async def query_metrics(
+    def _query_metrics_sync(
         self,
         metric_name: str,
         start_time: Optional[datetime] = None,
@@ -398,45 +1099,151 @@ class SQLiteStorage(StorageBackend):
     ) -> List[Metric]:
         """Query metrics by name and filters."""
         with self._get_conn() as conn:
-            query = "SELECT * FROM metrics WHERE name = ?"
-            params = [metric_name]
+            query = f"SELECT {_METRIC_COLUMNS} FROM v_metrics WHERE name = ?"
+            params: List[Any] = [metric_name]
 
             if start_time:
                 query += " AND timestamp >= ?"
-                params.append(start_time.isoformat())
+                params.append(_sql_ns(start_time))
 
             if end_time:
                 query += " AND timestamp <= ?"
-                params.append(end_time.isoformat())
+                params.append(_sql_ns(end_time))
+
+            for key, value in (labels or {}).items():
+                query += """ AND EXISTS (
+                    SELECT 1 FROM metric_labels ml
+                    WHERE ml.metric_id = v_metrics.id AND ml.key = ? AND ml.value = ?
+                )"""
+                params += (key, value)
 
             query += " ORDER BY timestamp DESC"
 
             rows = conn.execute(query, params).fetchall()
 
-            from .schema import MetricType, MetricSource, MetricCategory, MetricLabel
+        # Positional Metric(...) calls; each distinct labels string is decoded once
+        decoded: Dict[Optional[str], Tuple[MetricLabel, ...]] = {}
+        results = []
+        append = results.append
+        for name, value, value_text, metric_type, source, category, m_labels, _, _, ts in rows:
+            label_tuple = decoded.get(m_labels)
+            if label_tuple is None:
+                label_tuple = decoded[m_labels] = (
+                    tuple(MetricLabel(k, v) for k, v in _json_loads(m_labels).items()) if m_labels else EMPTY_LABELS
+                )
+            append(Metric(
+                name,
+                value if value is not None else value_text,
+                _TYPE_BY_STR[metric_type],
+                _SOURCE_BY_STR[source],
+                _CATEGORY_BY_STR[category],
+                label_tuple,
+                ts,
+            ))
 
-            results = []
-            for m in rows:
-                # Filter by labels if specified
-                if labels:
-                    m_labels = json.loads(m["labels"]) if m["labels"] else {}
-                    if not all(m_labels.get(k) == v for k, v in labels.items()):
-                        continue
+        return results
 
-                value = m["value"] if m["value"] is not None else m["value_text"]
-                labels_dict = json.loads(m["labels"]) if m["labels"] else {}
+    def _aggregate_metrics_sync(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        count/min/max/sum/avg over a metric's numeric values in a time range.
+
+        Analyses that lie entirely inside the range are read from
+        metric_summaries (one row each); only analyses straddling a bound
+        fall back to their raw metric rows.
+        """
+        lo = _sql_ns(start_time) if start_time else _INT64_MIN
+        hi = _sql_ns(end_time) if end_time else _INT64_MAX
+        with self._get_conn() as conn:
+            row = conn.execute("SELECT id FROM metric_names WHERE name = ?", (metric_name,)).fetchone()
+            if row is None:
+                return _aggregate(0, None, None, None)
+            name_id = row[0]
+
+            covered = conn.execute("""
+                SELECT SUM(count), MIN(min), MAX(max), SUM(sum)
+                FROM metric_summaries
+                WHERE name_id = ? AND first_ts >= ? AND last_ts <= ?
+            """, (name_id, lo, hi)).fetchone()
+            # CROSS JOIN pins the loop order and INDEXED BY the inner seek:
+            # straddling summaries first, then only their analyses' rows
+            partial = conn.execute("""
+                SELECT COUNT(m.value), MIN(m.value), MAX(m.value), SUM(m.value)
+                FROM metric_summaries s
+                CROSS JOIN metrics m INDEXED BY idx_metrics_analysis_ts ON m.analysis_id = s.analysis_id AND m.name_id = s.name_id
+                WHERE s.name_id = ? AND s.first_ts <= ? AND s.last_ts >= ?
+                  AND (s.first_ts < ? OR s.last_ts > ?)
+                  AND m.timestamp >= ? AND m.timestamp <= ?
+            """, (name_id, hi, lo, lo, hi, lo, hi)).fetchone()
+
+        parts = [p for p in (covered, partial) if p[0]]
+        return _aggregate(
+            sum(p[0] for p in parts),
+            min((p[1] for p in parts), default=None),
+            max((p[2] for p in parts), default=None),
+            sum(p[3] for p in parts),
+        )
 
-                results.append(Metric(
-                    name=m["name"],
-                    value=value,
-                    metric_type=MetricType(m["metric_type"]),
-                    source=MetricSource(m["source"]),
-                    category=MetricCategory(m["category"]),
-                    labels=[MetricLabel(k, v) for k, v in labels_dict.items()],
-                    timestamp=datetime.fromisoformat(m["timestamp"]),
-                ))
+    def _compact_sync(self, retention_days: int) -> int:
+        """Fold expired analyses' numeric values into metrics_rollup, then delete them."""
+        cutoff = datetime_to_ns(datetime.now(timezone.utc) - timedelta(days=retention_days))
+        expired = "SELECT analysis_id FROM analyses WHERE collected_at < ?"
+        with self._get_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            with conn:
+                conn.execute(f"""
+                    INSERT INTO metrics_rollup (name_id, bucket, count, min, max, sum)
+                    SELECT name_id, timestamp - timestamp % {_ROLLUP_BUCKET_NS} AS bucket,
+                           COUNT(value), MIN(value), MAX(value), SUM(value)
+                    FROM metrics
+                    WHERE value IS NOT NULL AND analysis_id IN ({expired})
+                    GROUP BY name_id, bucket
+                    ON CONFLICT (name_id, bucket) DO UPDATE SET
+                        count = count + excluded.count,
+                        min = MIN(min, excluded.min),
+                        max = MAX(max, excluded.max),
+                        sum = sum + excluded.sum
+                """, (cutoff,))
+                conn.execute(f"""
+                    DELETE FROM metric_labels WHERE metric_id IN (
+                        SELECT id FROM metrics WHERE analysis_id IN ({expired})
+                    )
+                """, (cutoff,))
+                conn.execute(f"DELETE FROM metric_summaries WHERE analysis_id IN ({expired})", (cutoff,))
+                conn.execute(f"DELETE FROM metrics WHERE analysis_id IN ({expired})", (cutoff,))
+                removed = conn.execute("DELETE FROM analyses WHERE collected_at < ?", (cutoff,)).rowcount
+
+        if removed:
+            logger.info(f"Retention rolled up and removed {removed} analyses older than {retention_days} days")
+        return removed
+
+    def _query_rollup_sync(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Hourly rollup buckets of a metric, oldest first."""
+        with self._get_conn() as conn:
+            rows = conn.execute("""
+                SELECT r.bucket, r.count, r.min, r.max, r.sum
+                FROM metrics_rollup r JOIN metric_names n ON n.id = r.name_id
+                WHERE n.name = ? AND r.bucket >= ? AND r.bucket <= ?
+                ORDER BY r.bucket
+            """, (
+                metric_name,
+                _sql_ns(start_time) if start_time else _INT64_MIN,
+                _sql_ns(end_time) if end_time else _INT64_MAX,
+            )).fetchall()
 
-            return results
+        return [
+            {"bucket": ns_to_datetime(bucket), **_aggregate(count, low, high, total)}
+            for bucket, count, low, high, total in rows
+        ]
 
 
 class MetricsStore:
@@ -472,6 +1279,10 @@ class MetricsStore:
         """Get metrics by analysis ID."""
         return await self.backend.get_metrics(analysis_id)
 
+    async def get_columnar(self, analysis_id: str) -> Optional[MetricColumns]:
+        """Get metrics by analysis ID as columns."""
+        return await self.backend.get_metrics_columnar(analysis_id)
+
     async def list(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """List all analyses."""
         return await self.backend.list_analyses(limit, offset)
@@ -486,12 +1297,52 @@ class MetricsStore:
         """Query metrics."""
         return await self.backend.query_metrics(metric_name, start_time, end_time, labels)
 
-    async def save_report(self, analysis_id: str, report_type: str, content: str) -> Optional[Path]:
+    async def aggregate(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Aggregate a metric's numeric values (count/min/max/sum/avg)."""
+        return await self.backend.aggregate_metrics(metric_name, start_time, end_time)
+
+    async def save_report(
+        self,
+        analysis_id: str,
+        report_type: str,
+        content: str,
+        digest: Optional[str] = None,
+        flush: bool = False,
+    ) -> Optional[Path]:
         """Save a report (only for JSON backend)."""
         if isinstance(self.backend, JSONFileStorage):
-            return await self.backend.save_report(analysis_id, report_type, content)
+            return await self.backend.save_report(analysis_id, report_type, content, digest, flush)
         return None
 
+    async def load_report(self, analysis_id: str, report_type: str, digest: str) -> Optional[tuple]:
+        """Load a previously rendered report with a matching digest (JSON backend only)."""
+        if isinstance(self.backend, JSONFileStorage):
+            return await self.backend.load_report(analysis_id, report_type, digest)
+        return None
+
+    async def compact(self, retention_days: int) -> int:
+        """Drop analyses older than retention_days; return how many were removed."""
+        return await self.backend.compact(retention_days)
+
+    async def run_retention(self, retention_days: int, interval: float = 3600) -> None:
+        """Run compact() every interval seconds until cancelled."""
+        while True:
+            try:
+                await self.compact(retention_days)
+            except Exception as e:
+                logger.error(f"Metrics retention pass failed: {e}")
+            await asyncio.sleep(interval)
+
+    def close(self) -> None:
+        """Release pooled database connections (SQLite backend only)."""
+        if isinstance(self.backend, SQLiteStorage):
+            self.backend.close_all()
+
 
 # Default store instance
 metrics_store = MetricsStore(
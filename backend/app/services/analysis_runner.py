@@ -8,9 +8,11 @@ This module is the bridge between:
 - Unified metrics pipeline (new Datadog-style architecture)
 - Database persistence (SQLAlchemy models)
 """
+import asyncio
 import logging
+from contextlib import suppress
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Set
 from uuid import UUID
 
 from app.core.database import get_session
@@ -19,6 +21,7 @@ from app.core.models.repository import AnalysisRepo, TaskRepo
 
 from app.analyzers.repo_fetcher import repo_fetcher, RepoFetchError
 from app.metrics.pipeline import AnalysisPipeline, PipelineConfig, PipelineResult
+from app.metrics.schema import MetricNames
 from app.services.notification_service import notification_service
 from app.api.routes.progress import (
     progress_manager, AnalysisStage, DEFAULT_COLLECTORS
@@ -36,7 +39,11 @@ class AnalysisRunner:
     """
 
     def __init__(self):
-        self._pipeline = None
+        # Pipelines hold only their config and metrics store, so one per
+        # region mode is shared across runs
+        self._pipelines: Dict[str, AnalysisPipeline] = {}
+        # Notifications still in flight (held so they aren't garbage-collected)
+        self._pending: Set[asyncio.Task] = set()
 
     async def _send_notifications(
         self,
@@ -48,10 +55,10 @@ class AnalysisRunner:
         """Send notifications after analysis completes."""
         try:
             # Get security metrics
-            critical = metrics_dict.get("repo.security.semgrep_critical", 0)
-            high = metrics_dict.get("repo.security.semgrep_high", 0)
-            vulns = metrics_dict.get("repo.security.deps_vulnerabilities", 0)
-            has_secrets = metrics_dict.get("repo.security.has_secrets", False)
+            critical = metrics_dict.get(MetricNames.SEMGREP_CRITICAL, 0)
+            high = metrics_dict.get(MetricNames.SEMGREP_HIGH, 0)
+            vulns = metrics_dict.get(MetricNames.DEPS_VULNERABILITIES, 0)
+            has_secrets = metrics_dict.get(MetricNames.HAS_SECRETS_IN_CODE, False)
 
             # Send security alert if critical issues found
             if critical > 0 or (vulns > 5) or has_secrets:
@@ -82,15 +89,30 @@ class AnalysisRunner:
             # Don't fail the analysis if notifications fail
             logger.warning(f"[{analysis_id}] Notification failed: {e}")
 
-    def _get_pipeline(self, region_mode: str = "EU_UA") -> AnalysisPipeline:
-        """Get or create pipeline with config."""
-        config = PipelineConfig(
-            region_mode=region_mode,
-            generate_reports=True,
-            report_types=["review", "summary"],
-            storage_backend="json",
-        )
-        return AnalysisPipeline(config)
+    async def _set_status(
+        self,
+        analysis_uuid: UUID,
+        status: AnalysisStatus,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """Update analysis status in its own short transaction."""
+        async with get_session() as session:
+            await AnalysisRepo(session).update_status(analysis_uuid, status, error_message=error_message)
+
+    async def _warmup_pipeline(self, region_mode: str = "EU_UA") -> AnalysisPipeline:
+        """Get or create pipeline with config (built on a worker thread the first time)."""
+        pipeline = self._pipelines.get(region_mode)
+        if pipeline is None:
+            config = PipelineConfig(
+                region_mode=region_mode,
+                generate_reports=True,
+                report_types=["review", "summary"],
+                storage_backend="json",
+            )
+            # Opening a dedicated metrics store reads its index from disk
+            built = await asyncio.to_thread(AnalysisPipeline, config)
+            pipeline = self._pipelines.setdefault(region_mode, built)
+        return pipeline
 
     async def run(
         self,
@@ -122,88 +144,79 @@ class AnalysisRunner:
         # Initialize progress tracking
         await progress_manager.init_progress(analysis_id, DEFAULT_COLLECTORS)
 
-        async with get_session() as session:
-            analysis_repo = AnalysisRepo(session)
-            task_repo = TaskRepo(session)
-
-            try:
-                # Update status to running
-                await analysis_repo.update_status(analysis_uuid, AnalysisStatus.running)
-                await session.commit()
+        # Pipeline setup overlaps the status update and repository fetch
+        warmup = asyncio.create_task(self._warmup_pipeline(region_mode))
 
-                # 1. Get repository path (clone if remote, use directly if local)
+        try:
+            # Update status to running
+            await self._set_status(analysis_uuid, AnalysisStatus.running)
+
+            # 1. Get repository path (clone if remote, use directly if local)
+            if source_type == "local":
+                logger.info(f"[{analysis_id}] Using local path: {repo_url}")
+                local_path = Path(repo_url)
+                should_cleanup = False
+            elif source_type == "gdrive":
+                logger.info(f"[{analysis_id}] Downloading from Google Drive: {repo_url}")
                 await progress_manager.update_stage(
                     analysis_id, AnalysisStage.FETCHING,
-                    "Fetching repository...", 0
+                    "Downloading from Google Drive...", 30
                 )
-
-                if source_type == "local":
-                    logger.info(f"[{analysis_id}] Using local path: {repo_url}")
-                    local_path = Path(repo_url)
-                    should_cleanup = False
-                elif source_type == "gdrive":
-                    logger.info(f"[{analysis_id}] Downloading from Google Drive: {repo_url}")
-                    await progress_manager.update_stage(
-                        analysis_id, AnalysisStage.FETCHING,
-                        "Downloading from Google Drive...", 30
-                    )
-                    from app.adapters.gdrive_adapter import gdrive_adapter
-                    local_path = await gdrive_adapter.download_folder_to_local(repo_url)
-                    should_cleanup = True
-                    logger.info(f"[{analysis_id}] Downloaded to {local_path}")
-                else:
-                    logger.info(f"[{analysis_id}] Cloning repository...")
-                    await progress_manager.update_stage(
-                        analysis_id, AnalysisStage.FETCHING,
-                        "Cloning repository...", 30
-                    )
-                    local_path = await repo_fetcher.fetch(repo_url, branch)
-                    should_cleanup = True
-                    logger.info(f"[{analysis_id}] Cloned to {local_path}")
-
+                from app.adapters.gdrive_adapter import gdrive_adapter
+                local_path = await gdrive_adapter.download_folder_to_local(repo_url)
+                should_cleanup = True
+                logger.info(f"[{analysis_id}] Downloaded to {local_path}")
+            else:
+                logger.info(f"[{analysis_id}] Cloning repository...")
                 await progress_manager.update_stage(
                     analysis_id, AnalysisStage.FETCHING,
-                    "Repository ready", 100
-                )
-
-                # 2. Run unified pipeline
-                logger.info(f"[{analysis_id}] Running unified analysis pipeline...")
-                await progress_manager.update_stage(
-                    analysis_id, AnalysisStage.COLLECTING,
-                    "Running code analysis...", 0
+                    "Cloning repository...", 30
                 )
+                local_path = await repo_fetcher.fetch(repo_url, branch)
+                should_cleanup = True
+                logger.info(f"[{analysis_id}] Cloned to {local_path}")
+
+            # 2. Run unified pipeline (one broadcast for the stage change)
+            logger.info(f"[{analysis_id}] Running unified analysis pipeline...")
+            await progress_manager.update_stage_batch(analysis_id, [
+                (AnalysisStage.FETCHING, "Repository ready", 100),
+                (AnalysisStage.COLLECTING, "Running code analysis...", 0),
+            ])
+
+            pipeline = await warmup
+            result: PipelineResult = await pipeline.run(
+                repo_path=str(local_path),
+                repo_url=repo_url,
+                branch=branch,
+                analysis_id=analysis_id[:8],  # Use short ID for metrics
+            )
 
-                pipeline = self._get_pipeline(region_mode)
-                result: PipelineResult = await pipeline.run(
-                    repo_path=str(local_path),
-                    repo_url=repo_url,
-                    branch=branch,
-                    analysis_id=analysis_id[:8],  # Use short ID for metrics
-                )
-
-                if result.status == "failed":
-                    await progress_manager.set_error(analysis_id, result.errors[0] if result.errors else "Unknown error")
-                    raise Exception(f"Pipeline failed: {', '.join(result.errors)}")
-
-                # Extract scoring result
-                sr = result.scoring_result
-                logger.info(f"[{analysis_id}] Pipeline complete: {sr.verdict}")
-                logger.info(f"[{analysis_id}] Repo Health: {sr.repo_health.total}/12")
-                logger.info(f"[{analysis_id}] Tech Debt: {sr.tech_debt.total}/15")
-                logger.info(f"[{analysis_id}] Product Level: {sr.product_level.value}")
-                logger.info(f"[{analysis_id}] Complexity: {sr.complexity.value}")
-
-                # 3. Save results to DB (for API compatibility)
-                logger.info(f"[{analysis_id}] Saving results to database...")
-                await progress_manager.update_stage(
-                    analysis_id, AnalysisStage.STORING,
-                    "Saving results...", 0
-                )
+            if result.status == "failed":
+                await progress_manager.set_error(analysis_id, result.errors[0] if result.errors else "Unknown error")
+                raise Exception(f"Pipeline failed: {', '.join(result.errors)}")
+
+            # Extract scoring result
+            sr = result.scoring_result
+            logger.info(f"[{analysis_id}] Pipeline complete: {sr.verdict}")
+            logger.info(f"[{analysis_id}] Repo Health: {sr.repo_health.total}/12")
+            logger.info(f"[{analysis_id}] Tech Debt: {sr.tech_debt.total}/15")
+            logger.info(f"[{analysis_id}] Product Level: {sr.product_level.value}")
+            logger.info(f"[{analysis_id}] Complexity: {sr.complexity.value}")
+
+            # 3. Save results to DB (for API compatibility)
+            logger.info(f"[{analysis_id}] Saving results to database...")
+            await progress_manager.update_stage(
+                analysis_id, AnalysisStage.STORING,
+                "Saving results...", 0
+            )
 
-                # Get structure and static data from metrics
-                structure_data = result.metrics.to_flat_dict() if result.metrics else {}
-                static_metrics = result.metrics.to_flat_dict() if result.metrics else {}
+            # Structure and static data are the same flat metrics dict;
+            # build it once (plain JSON columns, nothing mutates it)
+            structure_data = static_metrics = result.metrics.to_flat_dict() if result.metrics else {}
 
+            # Results and the completed status commit together
+            async with get_session() as session:
+                analysis_repo = AnalysisRepo(session)
                 await analysis_repo.save_metrics(
                     analysis_id=analysis_uuid,
                     repo_health=sr.repo_health.to_dict(),
@@ -219,79 +232,84 @@ class AnalysisRunner:
 
                 # Save tasks
                 task_dicts = [t.to_dict() for t in sr.tasks]
-                await task_repo.create_many(analysis_uuid, task_dicts)
+                await TaskRepo(session).create_many(analysis_uuid, task_dicts)
 
                 # Update status to completed
                 await analysis_repo.update_status(analysis_uuid, AnalysisStatus.completed)
-                await session.commit()
 
-                logger.info(f"Analysis {analysis_id} completed successfully")
-                logger.info(f"Reports saved to: {', '.join(str(p) for p in result.report_files)}")
+            logger.info(f"Analysis {analysis_id} completed successfully")
+            logger.info(f"Reports saved to: {', '.join(str(p) for p in result.report_files)}")
 
-                # Mark progress as complete
-                await progress_manager.complete(analysis_id)
+            # Mark progress as complete
+            await progress_manager.complete(analysis_id)
 
-                # Send notifications
-                await self._send_notifications(
-                    analysis_id=analysis_id,
-                    repo_url=repo_url,
-                    sr=sr,
-                    metrics_dict=structure_data,
-                )
+            # Send notifications in the background; they log their own failures
+            task = asyncio.create_task(self._send_notifications(
+                analysis_id=analysis_id,
+                repo_url=repo_url,
+                sr=sr,
+                metrics_dict=structure_data,
+            ))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+            # Return results
+            return {
+                "analysis_id": analysis_id,
+                "status": "completed",
+                "repo_url": repo_url,
+                "branch": branch,
+                "repo_health": sr.repo_health.to_dict(),
+                "tech_debt": sr.tech_debt.to_dict(),
+                "product_level": sr.product_level.value,
+                "complexity": sr.complexity.value,
+                "cost_estimates": sr.forward_estimate.to_dict(),
+                "historical_estimate": sr.historical_estimate.to_dict(),
+                "tasks_count": len(sr.tasks),
+                "metrics_count": result.metrics_count,
+                "reports": list(result.reports.keys()),
+                "duration_seconds": result.duration_seconds,
+            }
+
+        except RepoFetchError as e:
+            logger.error(f"[{analysis_id}] Failed to clone repository: {e}")
+            await progress_manager.set_error(analysis_id, f"Failed to clone repository: {e}")
+            await self._set_status(
+                analysis_uuid,
+                AnalysisStatus.failed,
+                error_message=f"Failed to clone repository: {e}",
+            )
+            raise
 
-                # Return results
-                return {
-                    "analysis_id": analysis_id,
-                    "status": "completed",
-                    "repo_url": repo_url,
-                    "branch": branch,
-                    "repo_health": sr.repo_health.to_dict(),
-                    "tech_debt": sr.tech_debt.to_dict(),
-                    "product_level": sr.product_level.value,
-                    "complexity": sr.complexity.value,
-                    "cost_estimates": sr.forward_estimate.to_dict(),
-                    "historical_estimate": sr.historical_estimate.to_dict(),
-                    "tasks_count": len(sr.tasks),
-                    "metrics_count": result.metrics_count,
-                    "reports": list(result.reports.keys()),
-                    "duration_seconds": result.duration_seconds,
-                }
-
-            except RepoFetchError as e:
-                logger.error(f"[{analysis_id}] Failed to clone repository: {e}")
-                await progress_manager.set_error(analysis_id, f"Failed to clone repository: {e}")
-                await analysis_repo.update_status(
-                    analysis_uuid,
-                    AnalysisStatus.failed,
-                    error_message=f"Failed to clone repository: {e}",
-                )
-                await session.commit()
-                raise
-
-            except Exception as e:
-                # Check if it's a Google Drive error
-                error_msg = str(e)
-                if "GoogleDriveError" in type(e).__name__ or "Google Drive" in error_msg:
-                    logger.error(f"[{analysis_id}] Failed to download from Google Drive: {e}")
-                    error_msg = f"Failed to download from Google Drive: {e}"
-                else:
-                    logger.error(f"[{analysis_id}] Analysis failed: {e}", exc_info=True)
-                await progress_manager.set_error(analysis_id, error_msg)
-                await analysis_repo.update_status(
-                    analysis_uuid,
-                    AnalysisStatus.failed,
-                    error_message=error_msg,
-                )
-                await session.commit()
-                raise
-
-            finally:
-                # Cleanup cloned repository (only if we cloned it)
-                if local_path and should_cleanup:
-                    try:
-                        repo_fetcher.cleanup(local_path)
-                    except Exception as e:
-                        logger.warning(f"[{analysis_id}] Failed to cleanup: {e}")
+        except Exception as e:
+            # Check if it's a Google Drive error
+            error_msg = str(e)
+            if "GoogleDriveError" in type(e).__name__ or "Google Drive" in error_msg:
+                logger.error(f"[{analysis_id}] Failed to download from Google Drive: {e}")
+                error_msg = f"Failed to download from Google Drive: {e}"
+            else:
+                logger.error(f"[{analysis_id}] Analysis failed: {e}", exc_info=True)
+            await progress_manager.set_error(analysis_id, error_msg)
+            await self._set_status(
+                analysis_uuid,
+                AnalysisStatus.failed,
+                error_message=error_msg,
+            )
+            raise
+
+        finally:
+            # Cancel and reap the warmup, so it has finished by the time run()
+            # returns and an error of its own never escapes unretrieved
+            warmup.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await warmup
+
+            # Cleanup cloned repository (only if we cloned it)
+            if local_path and should_cleanup:
+                try:
+                    repo_fetcher.cleanup(local_path)
+                except Exception as e:
+                    logger.warning(f"[{analysis_id}] Failed to cleanup: {e}")
 
 
 # Singleton instance
@@ -3,22 +3,39 @@ Calibration service for improving estimation accuracy.
 
 Collects feedback, adjusts thresholds, and tracks accuracy over time.
 """
+import asyncio
 import json
 import logging
+import math
+import os
+import random
+import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from statistics import mean, stdev
+from typing import Deque, Dict, Any, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+COMPLEXITIES = ("S", "M", "L", "XL")
+
+# Samples kept in memory: the most recent ones in full, plus a uniform
+# reservoir of older ones so long-run statistics still see old projects
+RECENT_SAMPLES = 1000
+HISTORICAL_SAMPLES = 500
+
 
 @dataclass
 class CalibrationSample:
     """A single calibration data point."""
     analysis_id: str
-    timestamp: datetime
+    timestamp: str  # ISO 8601, as stored; parsed on demand by timestamp_dt
 
     # Predicted values
     predicted_hours: float
@@ -37,6 +54,106 @@ class CalibrationSample:
     cost_error_pct: Optional[float] = None
     level_correct: Optional[bool] = None
 
+    @property
+    def timestamp_dt(self) -> datetime:
+        return datetime.fromisoformat(self.timestamp)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "analysis_id": self.analysis_id,
+            "timestamp": self.timestamp,
+            "predicted_hours": self.predicted_hours,
+            "predicted_cost_eu": self.predicted_cost_eu,
+            "predicted_cost_ua": self.predicted_cost_ua,
+            "predicted_level": self.predicted_level,
+            "predicted_complexity": self.predicted_complexity,
+            "actual_hours": self.actual_hours,
+            "actual_cost": self.actual_cost,
+            "actual_level": self.actual_level,
+            "hours_error_pct": self.hours_error_pct,
+            "cost_error_pct": self.cost_error_pct,
+            "level_correct": self.level_correct,
+        }
+
+    def apply_feedback(
+        self,
+        actual_hours: Optional[float],
+        actual_cost: Optional[float],
+        actual_level: Optional[str],
+    ):
+        """Record actuals and the resulting errors."""
+        if actual_hours is not None:
+            self.actual_hours = actual_hours
+            if self.predicted_hours > 0:
+                self.hours_error_pct = (
+                    (self.predicted_hours - actual_hours) / actual_hours * 100
+                )
+
+        if actual_cost is not None:
+            self.actual_cost = actual_cost
+            avg_predicted = (self.predicted_cost_eu + self.predicted_cost_ua) / 2
+            if avg_predicted > 0:
+                self.cost_error_pct = (
+                    (avg_predicted - actual_cost) / actual_cost * 100
+                )
+
+        if actual_level is not None:
+            self.actual_level = actual_level
+            self.level_correct = (self.predicted_level == actual_level)
+
+    @classmethod
+    def from_dict(cls, s: Dict[str, Any]) -> "CalibrationSample":
+        return cls(
+            analysis_id=s["analysis_id"],
+            timestamp=s["timestamp"],
+            predicted_hours=s["predicted_hours"],
+            predicted_cost_eu=s["predicted_cost_eu"],
+            predicted_cost_ua=s["predicted_cost_ua"],
+            predicted_level=s["predicted_level"],
+            predicted_complexity=s["predicted_complexity"],
+            actual_hours=s.get("actual_hours"),
+            actual_cost=s.get("actual_cost"),
+            actual_level=s.get("actual_level"),
+            hours_error_pct=s.get("hours_error_pct"),
+            cost_error_pct=s.get("cost_error_pct"),
+            level_correct=s.get("level_correct"),
+        )
+
+
+@dataclass
+class _RunningStats:
+    """Running count/mean/M2 (Welford) that values can be added to or removed from."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, x: float, sign: int = 1):
+        if sign > 0:
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        elif self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        else:
+            self.count -= 1
+            delta = x - self.mean
+            self.mean -= delta / self.count
+            self.m2 -= delta * (x - self.mean)
+
+    def stdev(self) -> float:
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize calibration data; orjson writes CalibrationSample dataclasses natively."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, default=CalibrationSample.to_dict).encode()
+
 
 @dataclass
 class CalibrationStats:
@@ -97,9 +214,38 @@ class CalibrationService:
     Target: reduce ±30-50% to ±15-25%
     """
 
-    def __init__(self, data_path: Optional[Path] = None):
+    def __init__(
+        self,
+        data_path: Optional[Path] = None,
+        max_recent: int = RECENT_SAMPLES,
+        max_historical: int = HISTORICAL_SAMPLES,
+    ):
         self.data_path = data_path or Path("calibration_data.json")
-        self.samples: List[CalibrationSample] = []
+        # Predictions and feedback since the last snapshot, one JSON record per line
+        self.log_path = self.data_path.with_suffix(".jsonl")
+        # Samples dropped from memory, final state, one JSON object per line
+        self.archive_path = self.data_path.with_suffix(".archive.jsonl")
+        self.samples: Deque[CalibrationSample] = deque(maxlen=max_recent)
+        # Reservoir (Algorithm R) over every sample that has left self.samples
+        self.historical: List[CalibrationSample] = []
+        self.max_historical = max_historical
+        self._retired = 0  # samples ever offered to the reservoir
+        self._rng = random.Random()
+        self._archived: List[CalibrationSample] = []  # dropped since the last compaction
+        self._by_id: Dict[str, CalibrationSample] = {}  # analysis_id -> latest sample
+        # Guards samples, statistics and files; re-entrant since feedback can trigger compact()
+        self._lock = threading.RLock()
+        self._log_lines = 0
+
+        # Feedback statistics, kept current as samples and feedback arrive
+        self._with_hours = 0
+        self._feedback_count = 0
+        self._ratios = {c: _RunningStats() for c in (*COMPLEXITIES, "ALL")}  # actual / predicted hours
+        self._hours_errors = _RunningStats()  # |hours_error_pct|
+        self._hours_signed = _RunningStats()
+        self._cost_errors = _RunningStats()  # |cost_error_pct|
+        self._cost_signed = _RunningStats()
+        self._level = _RunningStats()  # level_correct as 0/1
         self._load_data()
 
         # Calibration adjustments (learned from feedback)
@@ -113,58 +259,175 @@ class CalibrationService:
             },
             "tech_debt_adjustments": {},  # Per-debt-level corrections
         }
+        self._refresh_multipliers()
+
+    def _refresh_multipliers(self):
+        """Fold the overall and per-complexity adjustments into one factor per complexity."""
+        hours_multiplier = self.adjustments["hours_multiplier"]
+        self._multipliers = {
+            complexity: hours_multiplier * adj
+            for complexity, adj in self.adjustments["complexity_adjustments"].items()
+        }
 
     def _load_data(self):
-        """Load existing calibration data."""
+        """Load the calibration snapshot, then replay the log written since."""
         if self.data_path.exists():
             try:
-                with open(self.data_path) as f:
-                    data = json.load(f)
-                    # Reconstruct samples from JSON
-                    for s in data.get("samples", []):
-                        self.samples.append(CalibrationSample(
-                            analysis_id=s["analysis_id"],
-                            timestamp=datetime.fromisoformat(s["timestamp"]),
-                            predicted_hours=s["predicted_hours"],
-                            predicted_cost_eu=s["predicted_cost_eu"],
-                            predicted_cost_ua=s["predicted_cost_ua"],
-                            predicted_level=s["predicted_level"],
-                            predicted_complexity=s["predicted_complexity"],
-                            actual_hours=s.get("actual_hours"),
-                            actual_cost=s.get("actual_cost"),
-                            actual_level=s.get("actual_level"),
-                            hours_error_pct=s.get("hours_error_pct"),
-                            cost_error_pct=s.get("cost_error_pct"),
-                            level_correct=s.get("level_correct"),
-                        ))
+                data = _json_loads(self.data_path.read_bytes())
+                # Reconstruct samples from JSON
+                for s in data.get("historical", []):
+                    sample = CalibrationSample.from_dict(s)
+                    self.historical.append(sample)
+                    self._by_id[sample.analysis_id] = sample
+                    self._tally(sample)
+                self._retired = data.get("retired", len(self.historical))
+                for s in data.get("samples", []):
+                    self._add_sample(CalibrationSample.from_dict(s))
             except Exception as e:
                 logger.warning(f"Failed to load calibration data: {e}")
 
-    def _save_data(self):
-        """Persist calibration data."""
-        data = {
-            "samples": [
-                {
-                    "analysis_id": s.analysis_id,
-                    "timestamp": s.timestamp.isoformat(),
-                    "predicted_hours": s.predicted_hours,
-                    "predicted_cost_eu": s.predicted_cost_eu,
-                    "predicted_cost_ua": s.predicted_cost_ua,
-                    "predicted_level": s.predicted_level,
-                    "predicted_complexity": s.predicted_complexity,
-                    "actual_hours": s.actual_hours,
-                    "actual_cost": s.actual_cost,
-                    "actual_level": s.actual_level,
-                    "hours_error_pct": s.hours_error_pct,
-                    "cost_error_pct": s.cost_error_pct,
-                    "level_correct": s.level_correct,
-                }
-                for s in self.samples
-            ],
-            "adjustments": self.adjustments,
-        }
-        with open(self.data_path, "w") as f:
-            json.dump(data, f, indent=2)
+        if self.log_path.exists():
+            try:
+                with open(self.log_path, "rb") as f:
+                    for line in f:
+                        # A partial last line is a write cut short; drop it
+                        if not line.endswith(b"\n"):
+                            break
+                        self._replay(_json_loads(line))
+                        self._log_lines += 1
+            except Exception as e:
+                logger.warning(f"Failed to replay calibration log: {e}")
+
+    def _replay(self, record: Dict[str, Any]):
+        """Apply one logged prediction or feedback record."""
+        if record["type"] == "prediction":
+            sample = CalibrationSample.from_dict(record)
+            existing = self._by_id.get(sample.analysis_id)
+            # Already in the snapshot if compaction stopped before clearing the log
+            if existing is None or existing.timestamp != sample.timestamp:
+                self._add_sample(sample)
+        elif record["type"] == "feedback":
+            target = self._by_id.get(record["analysis_id"])
+            if target:
+                self._apply_feedback(
+                    target, record.get("actual_hours"), record.get("actual_cost"), record.get("actual_level"),
+                )
+
+    def _add_sample(self, sample: CalibrationSample):
+        """Append a sample and index it by analysis ID (a newer prediction wins)."""
+        if sample.analysis_id in self._by_id:
+            logger.warning(f"Replacing earlier prediction for analysis {sample.analysis_id}")
+        if len(self.samples) == self.samples.maxlen:
+            self._retire(self.samples[0])
+        self.samples.append(sample)
+        self._by_id[sample.analysis_id] = sample
+        self._tally(sample)
+
+    def _retire(self, sample: CalibrationSample):
+        """Offer a sample leaving the recent window to the reservoir; drop whichever loses."""
+        self._retired += 1
+        if len(self.historical) < self.max_historical:
+            self.historical.append(sample)
+            return
+
+        # Algorithm R: keep the new sample with probability max_historical / retired
+        j = self._rng.randrange(self._retired)
+        if j < self.max_historical:
+            sample, self.historical[j] = self.historical[j], sample
+
+        self._tally(sample, -1)
+        self._archived.append(sample)
+        if self._by_id.get(sample.analysis_id) is sample:
+            del self._by_id[sample.analysis_id]
+
+    def _tally(self, s: CalibrationSample, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) a sample's feedback in the running statistics."""
+        if s.actual_hours is not None:
+            self._with_hours += sign
+            if s.predicted_hours > 0:
+                ratio = s.actual_hours / s.predicted_hours
+                self._ratios["ALL"].update(ratio, sign)
+                if s.predicted_complexity in self._ratios:
+                    self._ratios[s.predicted_complexity].update(ratio, sign)
+
+        if s.actual_hours is None and s.actual_level is None:
+            return
+        self._feedback_count += sign
+        if s.hours_error_pct is not None:
+            self._hours_errors.update(abs(s.hours_error_pct), sign)
+            self._hours_signed.update(s.hours_error_pct, sign)
+        if s.cost_error_pct is not None:
+            self._cost_errors.update(abs(s.cost_error_pct), sign)
+            self._cost_signed.update(s.cost_error_pct, sign)
+        if s.level_correct is not None:
+            self._level.update(float(s.level_correct), sign)
+
+    def _append_log(self, *records: Dict[str, Any]):
+        """Persist records as appended lines, in a single write."""
+        with open(self.log_path, "ab") as f:
+            f.write(b"".join(_json_dumps(record) + b"\n" for record in records))
+        self._log_lines += len(records)
+
+        # Fold the log into the snapshot once it outgrows the sample list
+        if self._log_lines > len(self.samples) + len(self.historical) + 64:
+            self.compact()
+
+    def compact(self):
+        """Archive dropped samples, write the rest and the adjustments to the snapshot and empty the log."""
+        with self._lock:
+            if self._archived:
+                with open(self.archive_path, "ab") as f:
+                    f.write(b"".join(_json_dumps(sample) + b"\n" for sample in self._archived))
+                self._archived.clear()
+
+            data = {
+                "samples": list(self.samples),
+                "historical": self.historical,
+                "retired": self._retired,
+                "adjustments": self.adjustments,
+            }
+            tmp_path = self.data_path.with_name(self.data_path.name + ".tmp")
+            tmp_path.write_bytes(_json_dumps(data, indent=True))
+            os.replace(tmp_path, self.data_path)
+            self.log_path.unlink(missing_ok=True)
+            self._log_lines = 0
+
+    def snapshot_full(self) -> List[CalibrationSample]:
+        """
+        Every sample ever recorded, read back from disk for audit exports.
+
+        Archived samples come first, then the snapshot, with the log
+        replayed on top; unlike self.samples nothing is windowed or sampled.
+        """
+        with self._lock:
+            full: Dict[tuple, CalibrationSample] = {}
+            latest: Dict[str, tuple] = {}  # analysis_id -> key of its newest prediction
+
+            def add(sample: CalibrationSample):
+                key = (sample.analysis_id, sample.timestamp)
+                full[key] = sample  # an archived copy may repeat if compaction was cut short
+                latest[sample.analysis_id] = key
+
+            if self.archive_path.exists():
+                for line in self.archive_path.read_bytes().splitlines():
+                    add(CalibrationSample.from_dict(_json_loads(line)))
+            if self.data_path.exists():
+                data = _json_loads(self.data_path.read_bytes())
+                for s in (*data.get("historical", []), *data.get("samples", [])):
+                    add(CalibrationSample.from_dict(s))
+            if self.log_path.exists():
+                for line in self.log_path.read_bytes().splitlines(keepends=True):
+                    if not line.endswith(b"\n"):
+                        break
+                    record = _json_loads(line)
+                    if record["type"] == "prediction":
+                        if (record["analysis_id"], record["timestamp"]) not in full:
+                            add(CalibrationSample.from_dict(record))
+                    elif record["analysis_id"] in latest:
+                        full[latest[record["analysis_id"]]].apply_feedback(
+                            record.get("actual_hours"), record.get("actual_cost"), record.get("actual_level"),
+                        )
+            return list(full.values())
 
     def record_prediction(
         self,
@@ -174,19 +437,48 @@ class CalibrationService:
         predicted_cost_ua: float,
         predicted_level: str,
         predicted_complexity: str,
+        timestamp: Optional[datetime] = None,
     ):
-        """Record a new prediction for later calibration."""
-        sample = CalibrationSample(
-            analysis_id=analysis_id,
-            timestamp=datetime.now(timezone.utc),
-            predicted_hours=predicted_hours,
-            predicted_cost_eu=predicted_cost_eu,
-            predicted_cost_ua=predicted_cost_ua,
-            predicted_level=predicted_level,
-            predicted_complexity=predicted_complexity,
-        )
-        self.samples.append(sample)
-        self._save_data()
+        """Record a new prediction for later calibration (made now unless timestamp is given)."""
+        with self._lock:
+            sample = CalibrationSample(
+                analysis_id=analysis_id,
+                timestamp=(timestamp or datetime.now(timezone.utc)).isoformat(),
+                predicted_hours=predicted_hours,
+                predicted_cost_eu=predicted_cost_eu,
+                predicted_cost_ua=predicted_cost_ua,
+                predicted_level=predicted_level,
+                predicted_complexity=predicted_complexity,
+            )
+            self._add_sample(sample)
+            self._append_log({"type": "prediction", **sample.to_dict()})
+
+    def record_predictions_bulk(self, rows: List[Dict[str, Any]]):
+        """
+        Record many predictions at once, e.g. when importing history.
+
+        Each row takes record_prediction's keyword arguments. Rows without
+        a timestamp share one taken at the start, and all of them are
+        logged with a single write.
+        """
+        with self._lock:
+            now = datetime.now(timezone.utc).isoformat()
+            records = []
+            for row in rows:
+                timestamp = row.get("timestamp")
+                sample = CalibrationSample(
+                    analysis_id=row["analysis_id"],
+                    timestamp=timestamp.isoformat() if timestamp else now,
+                    predicted_hours=row["predicted_hours"],
+                    predicted_cost_eu=row["predicted_cost_eu"],
+                    predicted_cost_ua=row["predicted_cost_ua"],
+                    predicted_level=row["predicted_level"],
+                    predicted_complexity=row["predicted_complexity"],
+                )
+                self._add_sample(sample)
+                records.append({"type": "prediction", **sample.to_dict()})
+            if records:
+                self._append_log(*records)
 
     def add_feedback(
         self,
@@ -200,59 +492,89 @@ class CalibrationService:
 
         Call this after a project is completed to improve future estimates.
         """
-        # Find the sample
-        sample = next((s for s in self.samples if s.analysis_id == analysis_id), None)
-        if not sample:
-            logger.warning(f"No prediction found for analysis {analysis_id}")
-            return
+        with self._lock:
+            # Find the sample
+            sample = self._by_id.get(analysis_id)
+            if not sample:
+                logger.warning(f"No prediction found for analysis {analysis_id}")
+                return
+
+            self._apply_feedback(sample, actual_hours, actual_cost, actual_level)
+            self._append_log({
+                "type": "feedback",
+                "analysis_id": analysis_id,
+                "actual_hours": actual_hours,
+                "actual_cost": actual_cost,
+                "actual_level": actual_level,
+            })
+            self._recalculate_adjustments()
+
+    # Async API: the same calls on a worker thread, so file writes (and an
+    # occasional compaction) don't block the event loop
+
+    async def record_prediction_async(
+        self,
+        analysis_id: str,
+        predicted_hours: float,
+        predicted_cost_eu: float,
+        predicted_cost_ua: float,
+        predicted_level: str,
+        predicted_complexity: str,
+        timestamp: Optional[datetime] = None,
+    ):
+        """record_prediction() without blocking the event loop."""
+        await asyncio.to_thread(
+            self.record_prediction,
+            analysis_id,
+            predicted_hours,
+            predicted_cost_eu,
+            predicted_cost_ua,
+            predicted_level,
+            predicted_complexity,
+            timestamp,
+        )
 
-        # Update with actuals
-        if actual_hours is not None:
-            sample.actual_hours = actual_hours
-            if sample.predicted_hours > 0:
-                sample.hours_error_pct = (
-                    (sample.predicted_hours - actual_hours) / actual_hours * 100
-                )
+    async def record_predictions_bulk_async(self, rows: List[Dict[str, Any]]):
+        """record_predictions_bulk() without blocking the event loop."""
+        await asyncio.to_thread(self.record_predictions_bulk, rows)
 
-        if actual_cost is not None:
-            sample.actual_cost = actual_cost
-            avg_predicted = (sample.predicted_cost_eu + sample.predicted_cost_ua) / 2
-            if avg_predicted > 0:
-                sample.cost_error_pct = (
-                    (avg_predicted - actual_cost) / actual_cost * 100
-                )
-
-        if actual_level is not None:
-            sample.actual_level = actual_level
-            sample.level_correct = (sample.predicted_level == actual_level)
+    async def add_feedback_async(
+        self,
+        analysis_id: str,
+        actual_hours: Optional[float] = None,
+        actual_cost: Optional[float] = None,
+        actual_level: Optional[str] = None,
+    ):
+        """add_feedback() without blocking the event loop."""
+        await asyncio.to_thread(self.add_feedback, analysis_id, actual_hours, actual_cost, actual_level)
 
-        self._save_data()
-        self._recalculate_adjustments()
+    def _apply_feedback(
+        self,
+        sample: CalibrationSample,
+        actual_hours: Optional[float],
+        actual_cost: Optional[float],
+        actual_level: Optional[str],
+    ):
+        """Update a sample with actuals, keeping the running statistics in step."""
+        self._tally(sample, -1)
+        sample.apply_feedback(actual_hours, actual_cost, actual_level)
+        self._tally(sample)
 
     def _recalculate_adjustments(self):
         """Recalculate calibration adjustments based on all feedback."""
-        samples_with_hours = [s for s in self.samples if s.actual_hours is not None]
-
-        if len(samples_with_hours) < 3:
+        if self._with_hours < 3:
             return  # Need at least 3 samples
 
         # Calculate overall hours adjustment
-        ratios = [s.actual_hours / s.predicted_hours for s in samples_with_hours
-                  if s.predicted_hours > 0]
-        if ratios:
-            self.adjustments["hours_multiplier"] = mean(ratios)
+        if self._ratios["ALL"].count:
+            self.adjustments["hours_multiplier"] = self._ratios["ALL"].mean
 
         # Calculate per-complexity adjustments
-        for complexity in ["S", "M", "L", "XL"]:
-            complexity_samples = [
-                s for s in samples_with_hours
-                if s.predicted_complexity == complexity and s.predicted_hours > 0
-            ]
-            if len(complexity_samples) >= 2:
-                ratios = [s.actual_hours / s.predicted_hours for s in complexity_samples]
-                self.adjustments["complexity_adjustments"][complexity] = mean(ratios)
-
-        self._save_data()
+        for complexity in COMPLEXITIES:
+            if self._ratios[complexity].count >= 2:
+                self.adjustments["complexity_adjustments"][complexity] = self._ratios[complexity].mean
+
+        self._refresh_multipliers()
         logger.info(f"Recalculated adjustments: {self.adjustments}")
 
     def get_calibrated_hours(
@@ -261,79 +583,35 @@ class CalibrationService:
         complexity: str,
     ) -> float:
         """Apply calibration adjustments to raw hour estimate."""
-        # Apply general multiplier
-        adjusted = raw_hours * self.adjustments["hours_multiplier"]
-
-        # Apply complexity-specific adjustment
-        complexity_adj = self.adjustments["complexity_adjustments"].get(complexity, 1.0)
-        adjusted *= complexity_adj
-
-        return adjusted
+        # General multiplier times the complexity-specific one (1.0 if unknown)
+        multiplier = self._multipliers.get(complexity)
+        if multiplier is None:
+            multiplier = self.adjustments["hours_multiplier"]
+        return raw_hours * multiplier
 
     def get_stats(self) -> Optional[CalibrationStats]:
         """Get current calibration statistics."""
-        samples_with_feedback = [
-            s for s in self.samples
-            if s.actual_hours is not None or s.actual_level is not None
-        ]
-
-        if not samples_with_feedback:
-            return None
-
-        # Hours MAPE
-        hours_errors = [
-            abs(s.hours_error_pct)
-            for s in samples_with_feedback
-            if s.hours_error_pct is not None
-        ]
-        hours_mape = mean(hours_errors) if hours_errors else 50.0
-
-        # Hours bias
-        hours_signed = [
-            s.hours_error_pct
-            for s in samples_with_feedback
-            if s.hours_error_pct is not None
-        ]
-        hours_bias = mean(hours_signed) if hours_signed else 0.0
-
-        # Cost MAPE
-        cost_errors = [
-            abs(s.cost_error_pct)
-            for s in samples_with_feedback
-            if s.cost_error_pct is not None
-        ]
-        cost_mape = mean(cost_errors) if cost_errors else 50.0
-        cost_bias = mean([
-            s.cost_error_pct for s in samples_with_feedback
-            if s.cost_error_pct is not None
-        ]) if cost_errors else 0.0
-
-        # Level accuracy
-        level_results = [
-            s.level_correct
-            for s in samples_with_feedback
-            if s.level_correct is not None
-        ]
-        level_accuracy = (
-            sum(level_results) / len(level_results)
-            if level_results else 0.0
-        )
+        with self._lock:
+            if not self._feedback_count:
+                return None
 
-        # Confidence interval (simplified: 1.96 * std for 95% CI)
-        if len(hours_errors) >= 2:
-            confidence_interval = 1.96 * stdev(hours_errors)
-        else:
-            confidence_interval = 50.0
-
-        return CalibrationStats(
-            sample_count=len(samples_with_feedback),
-            hours_mape=hours_mape,
-            hours_bias=hours_bias,
-            cost_mape=cost_mape,
-            cost_bias=cost_bias,
-            level_accuracy=level_accuracy,
-            confidence_interval=confidence_interval,
-        )
+            hours, cost = self._hours_errors, self._cost_errors
+
+            # Confidence interval (simplified: 1.96 * std for 95% CI)
+            if hours.count >= 2:
+                confidence_interval = 1.96 * hours.stdev()
+            else:
+                confidence_interval = 50.0
+
+            return CalibrationStats(
+                sample_count=self._feedback_count,
+                hours_mape=hours.mean if hours.count else 50.0,
+                hours_bias=self._hours_signed.mean if hours.count else 0.0,
+                cost_mape=cost.mean if cost.count else 50.0,
+                cost_bias=self._cost_signed.mean if cost.count else 0.0,
+                level_accuracy=self._level.mean if self._level.count else 0.0,
+                confidence_interval=confidence_interval,
+            )
 
 
 # Singleton instance
@@ -361,6 +639,9 @@ calibration_service.add_feedback(
     actual_level="Internal Tool",  # Level was correct
 )
 
+# From async code (e.g. request handlers), use the *_async variants:
+await calibration_service.add_feedback_async("abc-123", actual_hours=210)
+
 # Future estimates automatically use calibrated values:
 raw_estimate = 175
 calibrated = calibration_service.get_calibrated_hours(raw_estimate, "M")
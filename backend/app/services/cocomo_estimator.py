@@ -15,11 +15,25 @@ References:
 import logging
 import math
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Multiplier ladders by tech debt score, one entry per score 0-15 (out-of-range scores are clamped)
+_COMPLEXITY_BY_DEBT = (1.30,) * 6 + (1.15,) * 4 + (1.0,) * 3 + (0.90,) * 3   # <=5, <=9, <=12, above
+_RELIABILITY_BY_DEBT = (1.15,) * 6 + (1.05,) * 4 + (1.0,) * 3 + (0.95,) * 3
+_SCALE_BY_DEBT = (22,) * 5 + (18,) * 3 + (14,) * 4 + (10,) * 4               # <5, <8, <12, above
+
+# Analyst, programmer and application experience multiplier by team experience
+_EXPERIENCE_FACTORS = {"low": 1.15, "nominal": 1.0, "high": 0.85}
+
+
+def _debt_index(tech_debt_score: int) -> int:
+    return min(max(tech_debt_score, 0), 15)
+
 
 class ProjectType(str, Enum):
     """COCOMO II project types with calibrated exponents."""
@@ -28,7 +42,7 @@ class ProjectType(str, Enum):
     EMBEDDED = "embedded"         # Large teams, strict requirements, complex integration
 
 
-@dataclass
+@dataclass(slots=True)
 class EffortMultipliers:
     """
     COCOMO II Effort Multipliers (scale factors).
@@ -82,9 +96,9 @@ class EffortMultipliers:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class CocomoEstimate:
-    """COCOMO II estimation result."""
+    """COCOMO II estimation result (shared between callers, so immutable)."""
     # Core estimates
     effort_person_months: float
     duration_months: float
@@ -103,8 +117,8 @@ class CocomoEstimate:
     cost_eu_min: float
     cost_eu_max: float
 
-    # Breakdown
-    hours_breakdown: Dict[str, float] = field(default_factory=dict)
+    # Breakdown (read-only, since estimates are shared)
+    hours_breakdown: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
 
     # Metadata
     kloc: float = 0.0
@@ -113,6 +127,11 @@ class CocomoEstimate:
     confidence_level: str = "±20%"
     methodology: str = "COCOMO II"
 
+    def cost_range(self, region: str) -> Tuple[float, float, float]:
+        """(typical, min, max) cost in any region of CocomoEstimator.RATES."""
+        typical, minimum, maximum = CocomoEstimator.RATE_RANGES[region]
+        return self.hours_typical * typical, self.hours_min * minimum, self.hours_max * maximum
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "methodology": self.methodology,
@@ -244,6 +263,12 @@ class CocomoEstimator:
         },
     }
 
+    # (typical, min, max) hourly rate per region, as used for cost ranges
+    RATE_RANGES = {
+        region: (rates["typical"], rates["min"], rates["max"])
+        for region, rates in RATES.items()
+    }
+
     # Hours per person-month (industry standard)
     HOURS_PER_PM = 160  # Productive hours (standard month)
 
@@ -258,6 +283,7 @@ class CocomoEstimator:
         "testing": 0.20,         # QA, testing
         "documentation": 0.08,   # Technical docs
     }
+    ACTIVITY_ITEMS = tuple(ACTIVITY_RATIOS.items())  # (activity, ratio) pairs for the breakdown
 
     def __init__(self):
         pass
@@ -287,12 +313,40 @@ class CocomoEstimator:
         Returns:
             CocomoEstimate with hours and cost projections
         """
+        # Positional, so keyword and positional calls share cache entries
+        estimate = _memoized_estimate(
+            loc, tech_debt_score, test_coverage_percent, has_ci,
+            has_documentation, team_experience, project_type,
+        )
+
+        # Skip building the message when INFO is off (e.g. production)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"[COCOMO] {estimate.kloc:.1f} KLOC × {estimate.effort_multiplier:.2f} EAF = "
+                f"{estimate.effort_person_months:.1f} PM = {estimate.hours_typical:.0f} hrs = "
+                f"${estimate.cost_ua_typical:,.0f}"
+            )
+
+        return estimate
+
+    @classmethod
+    def _estimate(
+        cls,
+        loc: int,
+        tech_debt_score: int,
+        test_coverage_percent: Optional[float],
+        has_ci: bool,
+        has_documentation: bool,
+        team_experience: str,
+        project_type: ProjectType,
+    ) -> CocomoEstimate:
+        """The estimate() computation; depends only on the arguments."""
         kloc = loc / 1000.0
         if kloc < 0.1:
             kloc = 0.1  # Minimum 100 LOC
 
         # Calculate effort multipliers based on project characteristics
-        multipliers = self._calculate_multipliers(
+        multipliers = cls._calculate_multipliers(
             tech_debt_score=tech_debt_score,
             test_coverage=test_coverage_percent,
             has_ci=has_ci,
@@ -301,11 +355,12 @@ class CocomoEstimator:
         )
 
         # COCOMO II formula
-        constants = self.MODERN_CONSTANTS
-        exponent = constants["b"] + 0.01 * self._calculate_scale_factor(tech_debt_score)
+        eaf = multipliers.total
+        constants = cls.MODERN_CONSTANTS
+        exponent = constants["b"] + 0.01 * cls._calculate_scale_factor(tech_debt_score)
 
         # Base effort in person-months
-        effort_pm = constants["a"] * (kloc ** exponent) * multipliers.total
+        effort_pm = constants["a"] * (kloc ** exponent) * eaf
 
         # Duration in months (schedule compression considered)
         duration_exp = constants["d"] + 0.2 * (exponent - constants["e_base"])
@@ -315,33 +370,20 @@ class CocomoEstimator:
         team_size = effort_pm / max(duration_months, 1)
 
         # Convert to hours
-        hours_typical = effort_pm * self.HOURS_PER_PM
-        cf = self.CONFIDENCE_FACTOR
+        hours_typical = effort_pm * cls.HOURS_PER_PM
+        cf = cls.CONFIDENCE_FACTOR
         hours_min = hours_typical * (1 - cf)   # -20% (optimistic)
         hours_max = hours_typical * (1 + cf)   # +20% (pessimistic)
 
         # Calculate hours breakdown
-        breakdown = {
+        breakdown = MappingProxyType({
             activity: hours_typical * ratio
-            for activity, ratio in self.ACTIVITY_RATIOS.items()
-        }
+            for activity, ratio in cls.ACTIVITY_ITEMS
+        })
 
-        # Cost calculations (using same confidence factor for consistency)
-        def calc_cost(hours: float, region: str) -> Dict[str, float]:
-            rates = self.RATES[region]
-            return {
-                "typical": hours * rates["typical"],
-                "min": hours * (1 - cf) * rates["min"],
-                "max": hours * (1 + cf) * rates["max"],
-            }
-
-        ua_cost = calc_cost(hours_typical, "ua")
-        eu_cost = calc_cost(hours_typical, "eu")
-
-        logger.info(
-            f"[COCOMO] {kloc:.1f} KLOC × {multipliers.total:.2f} EAF = "
-            f"{effort_pm:.1f} PM = {hours_typical:.0f} hrs = ${ua_cost['typical']:,.0f}"
-        )
+        # Cost calculations (min/max hours carry the same confidence factor)
+        ua_typical, ua_min, ua_max = cls.RATE_RANGES["ua"]
+        eu_typical, eu_min, eu_max = cls.RATE_RANGES["eu"]
 
         return CocomoEstimate(
             effort_person_months=effort_pm,
@@ -350,20 +392,20 @@ class CocomoEstimator:
             hours_typical=hours_typical,
             hours_min=hours_min,
             hours_max=hours_max,
-            cost_ua_typical=ua_cost["typical"],
-            cost_ua_min=ua_cost["min"],
-            cost_ua_max=ua_cost["max"],
-            cost_eu_typical=eu_cost["typical"],
-            cost_eu_min=eu_cost["min"],
-            cost_eu_max=eu_cost["max"],
+            cost_ua_typical=hours_typical * ua_typical,
+            cost_ua_min=hours_min * ua_min,
+            cost_ua_max=hours_max * ua_max,
+            cost_eu_typical=hours_typical * eu_typical,
+            cost_eu_min=hours_min * eu_min,
+            cost_eu_max=hours_max * eu_max,
             hours_breakdown=breakdown,
             kloc=kloc,
             project_type=project_type.value,
-            effort_multiplier=multipliers.total,
+            effort_multiplier=eaf,
         )
 
+    @staticmethod
     def _calculate_multipliers(
-        self,
         tech_debt_score: int,
         test_coverage: Optional[float],
         has_ci: bool,
@@ -374,18 +416,10 @@ class CocomoEstimator:
         m = EffortMultipliers()
 
         # Tech debt affects complexity and reliability requirements
-        if tech_debt_score <= 5:
-            m.complexity = 1.30  # High debt = complex to work with
-            m.reliability = 1.15
-        elif tech_debt_score <= 9:
-            m.complexity = 1.15
-            m.reliability = 1.05
-        elif tech_debt_score <= 12:
-            m.complexity = 1.0
-            m.reliability = 1.0
-        else:
-            m.complexity = 0.90  # Low debt = easier
-            m.reliability = 0.95
+        # (high debt = complex to work with, low debt = easier)
+        debt = _debt_index(tech_debt_score)
+        m.complexity = _COMPLEXITY_BY_DEBT[debt]
+        m.reliability = _RELIABILITY_BY_DEBT[debt]
 
         # Test coverage affects QA effort
         if test_coverage is None:
@@ -410,19 +444,15 @@ class CocomoEstimator:
             m.documentation = 1.10  # Need to document
 
         # Team experience
-        experience_factors = {
-            "low": {"analyst": 1.15, "programmer": 1.15, "app_exp": 1.15},
-            "nominal": {"analyst": 1.0, "programmer": 1.0, "app_exp": 1.0},
-            "high": {"analyst": 0.85, "programmer": 0.85, "app_exp": 0.85},
-        }
-        exp = experience_factors.get(team_experience, experience_factors["nominal"])
-        m.analyst_capability = exp["analyst"]
-        m.programmer_capability = exp["programmer"]
-        m.application_experience = exp["app_exp"]
+        exp = _EXPERIENCE_FACTORS.get(team_experience, 1.0)
+        m.analyst_capability = exp
+        m.programmer_capability = exp
+        m.application_experience = exp
 
         return m
 
-    def _calculate_scale_factor(self, tech_debt_score: int) -> float:
+    @staticmethod
+    def _calculate_scale_factor(tech_debt_score: int) -> float:
         """
         Calculate scale factor based on project characteristics.
 
@@ -435,15 +465,9 @@ class CocomoEstimator:
 
         Returns a value 0-25 that affects the exponent.
         """
-        # Simplified: use tech debt as proxy for overall maturity
-        if tech_debt_score >= 12:
-            return 10  # Mature, well-structured project
-        elif tech_debt_score >= 8:
-            return 14  # Average
-        elif tech_debt_score >= 5:
-            return 18  # Some issues
-        else:
-            return 22  # Significant technical challenges
+        # Simplified: use tech debt as proxy for overall maturity, from 22
+        # (significant technical challenges) down to 10 (mature, well-structured)
+        return _SCALE_BY_DEBT[_debt_index(tech_debt_score)]
 
     def estimate_from_metrics(
         self,
@@ -482,6 +506,23 @@ class CocomoEstimator:
         )
 
 
+@lru_cache(maxsize=1024)
+def _memoized_estimate(
+    loc: int,
+    tech_debt_score: int,
+    test_coverage_percent: Optional[float],
+    has_ci: bool,
+    has_documentation: bool,
+    team_experience: str,
+    project_type: ProjectType,
+) -> CocomoEstimate:
+    """Memoized CocomoEstimator._estimate, keyed on the arguments."""
+    return CocomoEstimator._estimate(
+        loc, tech_debt_score, test_coverage_percent, has_ci,
+        has_documentation, team_experience, project_type,
+    )
+
+
 @dataclass
 class CostComparison:
     """Result of comparing actual cost with COCOMO estimate."""
@@ -548,6 +589,20 @@ class CostComparator:
         "significant_deviation": 60,  # >40% deviation
     }
 
+    # (above estimate, deviation bucket) -> (verdict, description template);
+    # buckets: 0 = within range, 1 = moderate, 2 = significant
+    VERDICTS = {
+        (True, 0): ("within_range", "Cost is within acceptable range (+{deviation:.1f}% above estimate)"),
+        (False, 0): ("within_range", "Cost is within acceptable range ({deviation:.1f}% below estimate)"),
+        (True, 1): ("overpaid", "Moderately overpaid: +{deviation:.1f}% above typical estimate"),
+        (True, 2): ("significantly_overpaid", "Significantly overpaid: +{deviation:.1f}% above typical estimate"),
+        (False, 1): ("underpaid", "Good deal: {abs_deviation:.1f}% below typical estimate"),
+        (False, 2): (
+            "significantly_underpaid",
+            "Excellent deal: {abs_deviation:.1f}% below typical estimate (verify quality)",
+        ),
+    }
+
     def compare(
         self,
         estimate: CocomoEstimate,
@@ -587,38 +642,26 @@ class CostComparator:
         if actual_hours:
             hours_deviation = ((actual_hours - estimate.hours_typical) / estimate.hours_typical) * 100
 
+        benchmark = CocomoEstimator.RATES.get(region, CocomoEstimator.RATES["ua"])
+
         # Calculate actual rate
         actual_rate = None
         rate_deviation = None
         if actual_hours and actual_hours > 0:
             actual_rate = actual_cost / actual_hours
-            benchmark_rate = CocomoEstimator.RATES.get(region, CocomoEstimator.RATES["ua"])["typical"]
+            benchmark_rate = benchmark["typical"]
             rate_deviation = ((actual_rate - benchmark_rate) / benchmark_rate) * 100
 
         # Determine verdict
         abs_deviation = abs(cost_deviation)
         if abs_deviation <= self.THRESHOLDS["within_range"]:
-            verdict = "within_range"
-            if cost_deviation > 0:
-                verdict_desc = f"Cost is within acceptable range (+{cost_deviation:.1f}% above estimate)"
-            else:
-                verdict_desc = f"Cost is within acceptable range ({cost_deviation:.1f}% below estimate)"
-        elif cost_deviation > 0:
-            if abs_deviation <= self.THRESHOLDS["moderate_deviation"]:
-                verdict = "overpaid"
-                verdict_desc = f"Moderately overpaid: +{cost_deviation:.1f}% above typical estimate"
-            else:
-                verdict = "significantly_overpaid"
-                verdict_desc = f"Significantly overpaid: +{cost_deviation:.1f}% above typical estimate"
+            bucket = 0
+        elif abs_deviation <= self.THRESHOLDS["moderate_deviation"]:
+            bucket = 1
         else:
-            if abs_deviation <= self.THRESHOLDS["moderate_deviation"]:
-                verdict = "underpaid"
-                verdict_desc = f"Good deal: {abs(cost_deviation):.1f}% below typical estimate"
-            else:
-                verdict = "significantly_underpaid"
-                verdict_desc = f"Excellent deal: {abs(cost_deviation):.1f}% below typical estimate (verify quality)"
-
-        benchmark = CocomoEstimator.RATES.get(region, CocomoEstimator.RATES["ua"])
+            bucket = 2
+        verdict, template = self.VERDICTS[(cost_deviation > 0, bucket)]
+        verdict_desc = template.format(deviation=cost_deviation, abs_deviation=abs_deviation)
 
         return CostComparison(
             actual_cost=actual_cost,
@@ -673,7 +716,7 @@ class CostComparator:
         for region in ["ua", "eu", "us", "de", "pl"]:
             rates = CocomoEstimator.RATES.get(region)
             if rates:
-                region_cost = estimate.hours_typical * rates["typical"]
+                region_cost, _, _ = estimate.cost_range(region)
                 deviation = ((actual_cost - region_cost) / region_cost) * 100
                 result["comparisons"][region] = {
                     "estimated_cost": round(region_cost, 2),
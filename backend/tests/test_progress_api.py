@@ -92,6 +92,23 @@ class TestProgressManager:
         assert progress.stage_progress == 50
         assert progress.overall_progress > 0
 
+    @pytest.mark.asyncio
+    async def test_update_stage_batch(self, manager):
+        """Batched stage updates end in the last state with a single broadcast."""
+        analysis_id = "test-analysis-batch"
+        await manager.init_progress(analysis_id, ["collector1"])
+
+        with patch.object(manager, "_broadcast", new_callable=AsyncMock) as broadcast:
+            progress = await manager.update_stage_batch(analysis_id, [
+                (AnalysisStage.FETCHING, "Repository ready", 100),
+                (AnalysisStage.COLLECTING, "Running code analysis...", 0),
+            ])
+
+        assert broadcast.await_count == 1
+        assert progress.stage == AnalysisStage.COLLECTING
+        assert progress.current_step == "Running code analysis..."
+        assert progress.overall_progress == calculate_overall_progress(AnalysisStage.COLLECTING, 0)
+
     @pytest.mark.asyncio
     async def test_update_collector(self, manager):
         """Test updating collector status."""
@@ -0,0 +1,138 @@
+"""
+Tests for the unified analysis pipeline.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.metrics import pipeline as pipeline_module
+from app.metrics.pipeline import AnalysisPipeline, PipelineConfig, PipelineResult
+from app.metrics.schema import (
+    MetricSet,
+    MetricSource,
+    MetricCategory,
+    MetricNames,
+)
+from app.metrics.storage import MetricsStore
+
+
+def make_metric_set(analysis_id: str, collected_at: Optional[datetime] = None) -> MetricSet:
+    metrics = MetricSet(
+        analysis_id=analysis_id,
+        repo_url="https://example.com/repo",
+        branch="main",
+        collected_at=collected_at or datetime.now(timezone.utc),
+    )
+    metrics.add_info(MetricNames.HAS_README, True, MetricSource.STATIC, MetricCategory.DOCUMENTATION)
+    metrics.add_gauge(MetricNames.COMMITS_TOTAL, 120, MetricSource.GIT, MetricCategory.HISTORY)
+    metrics.add_gauge(MetricNames.FILES_TOTAL, 40, MetricSource.STATIC, MetricCategory.SIZE)
+    return metrics
+
+
+class TestPipelineStore:
+    """Test cases for where pipeline runs store their metrics."""
+
+    async def test_default_pipeline_writes_to_the_retained_store(self, tmp_path, monkeypatch):
+        """Retention on the shared store compacts what a default pipeline run saved."""
+        shared = MetricsStore(backend="json", path=tmp_path)
+        old = datetime.now(timezone.utc) - timedelta(days=120)
+
+        async def collect_all(repo_path, analysis_id, repo_url, branch=None):
+            return make_metric_set(analysis_id, collected_at=old)
+
+        monkeypatch.setattr(pipeline_module, "metrics_store", shared)
+        monkeypatch.setattr(pipeline_module.metrics_aggregator, "collect_all", collect_all)
+
+        pipeline = AnalysisPipeline(PipelineConfig(generate_reports=False))
+        assert pipeline.store is shared
+
+        await pipeline.run(str(tmp_path), analysis_id="old")
+        assert await shared.get("old") is not None
+
+        assert await shared.compact(90) == 1
+        assert await shared.get("old") is None
+
+    def test_configured_path_gets_its_own_store(self, tmp_path):
+        pipeline = AnalysisPipeline(PipelineConfig(storage_path=tmp_path))
+
+        assert pipeline.store is not pipeline_module.metrics_store
+        assert pipeline.store.path == tmp_path
+
+
+class TestReportReplay:
+    """Test cases for reusing stored reports across runs."""
+
+    async def test_second_run_reuses_the_stored_report(self, tmp_path, monkeypatch):
+        async def collect_all(repo_path, analysis_id, repo_url, branch=None):
+            return make_metric_set(analysis_id)
+
+        rendered = []
+        build_summary = pipeline_module.report_builder.build_repo_summary
+
+        def counting_build_summary(report):
+            rendered.append(report.analysis_id)
+            return build_summary(report)
+
+        monkeypatch.setattr(pipeline_module.metrics_aggregator, "collect_all", collect_all)
+        monkeypatch.setattr(pipeline_module.report_builder, "build_repo_summary", counting_build_summary)
+
+        pipeline = AnalysisPipeline(PipelineConfig(report_types=["summary"], storage_path=tmp_path))
+        first = await pipeline.run(str(tmp_path), repo_url="https://example.com/repo",
+                                   branch="main", analysis_id="a1")
+        second = await pipeline.run(str(tmp_path), repo_url="https://example.com/repo",
+                                    branch="main", analysis_id="a1")
+
+        assert first.status == second.status == "completed"
+        assert first.metrics.collected_at != second.metrics.collected_at
+        assert rendered == ["a1"]
+        assert second.reports["summary"] == first.reports["summary"]
+        assert second.report_files == first.report_files
+
+    async def test_changed_metrics_render_again(self, tmp_path, monkeypatch):
+        extra = iter([40, 41])
+
+        async def collect_all(repo_path, analysis_id, repo_url, branch=None):
+            metrics = make_metric_set(analysis_id)
+            metrics.add_gauge("repo.size.extra", next(extra), MetricSource.STATIC, MetricCategory.SIZE)
+            return metrics
+
+        rendered = []
+        build_summary = pipeline_module.report_builder.build_repo_summary
+
+        def counting_build_summary(report):
+            rendered.append(report.analysis_id)
+            return build_summary(report)
+
+        monkeypatch.setattr(pipeline_module.metrics_aggregator, "collect_all", collect_all)
+        monkeypatch.setattr(pipeline_module.report_builder, "build_repo_summary", counting_build_summary)
+
+        pipeline = AnalysisPipeline(PipelineConfig(report_types=["summary"], storage_path=tmp_path))
+        await pipeline.run(str(tmp_path), analysis_id="a1")
+        await pipeline.run(str(tmp_path), analysis_id="a1")
+
+        assert rendered == ["a1", "a1"]
+
+
+class TestPipelineResult:
+    """Test cases for PipelineResult."""
+
+    def test_summary_is_a_method_rendered_once(self):
+        result = PipelineResult(
+            analysis_id="a1",
+            repo_url="https://example.com/repo",
+            branch=None,
+            status="failed",
+            started_at=datetime.now(timezone.utc),
+            finished_at=datetime.now(timezone.utc),
+            duration_seconds=0.0,
+            metrics=None,
+            metrics_count=0,
+            scoring_result=None,
+            reports={},
+            report_files=[],
+            errors=["clone failed"],
+        )
+
+        text = result.summary()
+
+        assert text == "Analysis a1 failed: clone failed"
+        assert result.summary() is text
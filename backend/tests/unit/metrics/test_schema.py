@@ -0,0 +1,287 @@
+"""
+Tests for the unified metrics schema.
+"""
+import json
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.metrics.schema import (
+    MetricSet,
+    MetricColumns,
+    MetricSpec,
+    MetricType,
+    MetricSource,
+    MetricCategory,
+    MetricLabel,
+    Metric,
+    datetime_to_ns,
+    ns_to_datetime,
+)
+
+
+def make_metric_set() -> MetricSet:
+    return MetricSet(
+        analysis_id="test",
+        repo_url="https://example.com/repo",
+        branch="main",
+        collected_at=datetime.now(timezone.utc),
+    )
+
+
+class TestMetricSet:
+    """Test cases for MetricSet."""
+
+    def test_add_many_appends_in_order(self):
+        """add_many should behave like repeated add_* calls."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1, MetricSource.STATIC, MetricCategory.SIZE)
+
+        metrics.add_many([
+            MetricSpec("repo.b", 2, MetricType.GAUGE, MetricSource.CI, MetricCategory.INFRASTRUCTURE,
+                       description="b"),
+            MetricSpec("repo.c", True, MetricType.INFO, MetricSource.CI, MetricCategory.INFRASTRUCTURE),
+        ])
+
+        assert [m.name for m in metrics.metrics] == ["repo.a", "repo.b", "repo.c"]
+        assert metrics.get("repo.b").description == "b"
+        assert metrics.get("repo.c").metric_type == MetricType.INFO
+        assert metrics.get("repo.c").labels == ()
+        assert metrics.to_flat_dict() == {"repo.a": 1, "repo.b": 2, "repo.c": True}
+
+    def test_set_gauge_rows_replaces_in_place(self):
+        """Known names are replaced at their position; new names are appended."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1, MetricSource.MANUAL, MetricCategory.SIZE)
+        metrics.add_gauge("repo.b", 2, MetricSource.MANUAL, MetricCategory.SIZE)
+
+        metrics.set_gauge_rows(MetricSource.MANUAL, [
+            ("repo.a", 10, MetricCategory.SIZE),
+            ("repo.c", 3, MetricCategory.SIZE),
+        ])
+
+        a, b, c = metrics.metrics
+        assert (a.name, a.value, b.value, c.name) == ("repo.a", 10, 2, "repo.c")
+        assert metrics.get_value("repo.a") == 10
+        assert metrics.filter_by_category(MetricCategory.SIZE) == [a, b, c]
+        assert metrics.filter_by_source(MetricSource.MANUAL) == [a, b, c]
+
+    def test_set_gauge_rows_on_frozen_set(self):
+        """Unchanged values are a no-op on a frozen set; changes raise."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1, MetricSource.MANUAL, MetricCategory.SIZE)
+        metrics.freeze()
+
+        metrics.set_gauge_rows(MetricSource.MANUAL, [("repo.a", 1, MetricCategory.SIZE)])
+        with pytest.raises(RuntimeError):
+            metrics.set_gauge_rows(MetricSource.MANUAL, [("repo.a", 2, MetricCategory.SIZE)])
+        assert metrics.get_value("repo.a") == 1
+
+    def test_add_many_indexes_like_add(self):
+        """add_many keeps the name index and the category/source buckets in step."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1, MetricSource.STATIC, MetricCategory.SIZE)
+
+        metrics.add_many([
+            MetricSpec("repo.a", 9, MetricType.GAUGE, MetricSource.CI, MetricCategory.SIZE),
+            MetricSpec("repo.b", 2, MetricType.GAUGE, MetricSource.CI, MetricCategory.INFRASTRUCTURE),
+        ])
+
+        first, dup, b = metrics.metrics
+        assert metrics.get_value("repo.a") == 1
+        assert metrics.get("repo.b") is b
+        assert dup.timestamp_ns == b.timestamp_ns
+        assert metrics.filter_by_category(MetricCategory.SIZE) == [first, dup]
+        assert metrics.filter_by_source(MetricSource.CI) == [dup, b]
+
+    def test_add_many_rejects_frozen_set(self):
+        """add_many raises like add() once the set is frozen."""
+        metrics = make_metric_set()
+        metrics.freeze()
+
+        with pytest.raises(RuntimeError):
+            metrics.add_many([
+                MetricSpec("repo.a", 1, MetricType.GAUGE, MetricSource.CI, MetricCategory.SIZE),
+            ])
+
+    def test_add_gauges_bulk(self):
+        """Bulk gauges share source, category, unit and timestamp."""
+        metrics = make_metric_set()
+        metrics.add_gauges_bulk(
+            MetricSource.MANUAL,
+            MetricCategory.TESTING,
+            [("repo.a", 1), ("repo.b", 2.5)],
+            unit="points",
+        )
+
+        a, b = metrics.metrics
+        assert (a.name, a.value, b.name, b.value) == ("repo.a", 1, "repo.b", 2.5)
+        assert a.metric_type == b.metric_type == MetricType.GAUGE
+        assert a.source == MetricSource.MANUAL and a.category == MetricCategory.TESTING
+        assert a.unit == b.unit == "points"
+        assert a.timestamp_ns == b.timestamp_ns
+        assert metrics.filter_by_category(MetricCategory.TESTING) == [a, b]
+
+    def test_add_gauge_rows_per_row_category(self):
+        """Gauge rows share a source but keep their own category."""
+        metrics = make_metric_set()
+        metrics.add_gauge_rows(MetricSource.MANUAL, [
+            ("repo.a", 1, MetricCategory.TESTING),
+            ("repo.b", 2, MetricCategory.SECURITY),
+        ])
+
+        a, b = metrics.metrics
+        assert a.category == MetricCategory.TESTING and b.category == MetricCategory.SECURITY
+        assert a.timestamp_ns == b.timestamp_ns
+        assert metrics.filter_by_source(MetricSource.MANUAL) == [a, b]
+
+        metrics.freeze()
+        with pytest.raises(RuntimeError):
+            metrics.add_gauge_rows(MetricSource.MANUAL, [("repo.c", 3, MetricCategory.TESTING)])
+
+    def test_get_uses_first_metric_with_name(self):
+        """get/get_value return the first metric added under a name."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1, MetricSource.STATIC, MetricCategory.SIZE)
+        metrics.add_gauge("repo.a", 2, MetricSource.STATIC, MetricCategory.SIZE)
+
+        assert metrics.get_value("repo.a") == 1
+        assert metrics.get_value("repo.missing", 42) == 42
+        assert metrics.get("repo.missing") is None
+
+    def test_value_map_matches_get_value(self):
+        """value_map keeps the first value per name, like get_value."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1, MetricSource.STATIC, MetricCategory.SIZE)
+        metrics.add_gauge("repo.b", 3, MetricSource.STATIC, MetricCategory.SIZE)
+        metrics.add_gauge("repo.a", 2, MetricSource.STATIC, MetricCategory.SIZE)
+
+        assert metrics.value_map() == {"repo.a": 1, "repo.b": 3}
+
+    def test_get_works_for_preloaded_metrics(self):
+        """Metrics passed to the constructor are indexed too."""
+        source = make_metric_set()
+        source.add_info("repo.flag", True, MetricSource.STATIC, MetricCategory.STRUCTURE)
+
+        metrics = MetricSet(
+            analysis_id="copy",
+            repo_url=source.repo_url,
+            branch=None,
+            collected_at=source.collected_at,
+            metrics=list(source.metrics),
+        )
+
+        assert metrics.get_value("repo.flag") is True
+
+    def test_to_json_round_trips_to_dict(self):
+        """to_json output parses back to to_dict()."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1.5, MetricSource.STATIC, MetricCategory.SIZE, unit="lines")
+        metrics.add_info("repo.b", "ünïcode", MetricSource.GIT, MetricCategory.HISTORY)
+
+        assert json.loads(metrics.to_json()) == metrics.to_dict()
+
+    def test_iter_records_matches_metric_to_dict(self):
+        """Fused record export matches Metric.to_dict for every metric."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.loc", 10, MetricSource.STATIC, MetricCategory.SIZE,
+                          labels=[MetricLabel("language", "python")])
+        metrics.add_many([
+            MetricSpec("repo.b", 2, MetricType.GAUGE, MetricSource.CI, MetricCategory.INFRASTRUCTURE),
+            MetricSpec("repo.c", False, MetricType.INFO, MetricSource.CI, MetricCategory.INFRASTRUCTURE),
+        ])
+
+        assert list(metrics.iter_records()) == [m.to_dict() for m in metrics.metrics]
+
+    def test_filters_return_metrics_in_insertion_order(self):
+        """filter_by_category/filter_by_source return matching metrics in order."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1, MetricSource.STATIC, MetricCategory.SIZE)
+        metrics.add_info("repo.b", True, MetricSource.GIT, MetricCategory.HISTORY)
+        metrics.add_gauge("repo.c", 3, MetricSource.GIT, MetricCategory.SIZE)
+
+        assert [m.name for m in metrics.filter_by_category(MetricCategory.SIZE)] == ["repo.a", "repo.c"]
+        assert [m.name for m in metrics.filter_by_source(MetricSource.GIT)] == ["repo.b", "repo.c"]
+        assert metrics.filter_by_category(MetricCategory.SECURITY) == []
+
+        # Callers get their own list
+        metrics.filter_by_source(MetricSource.GIT).clear()
+        assert len(metrics.filter_by_source(MetricSource.GIT)) == 2
+
+    def test_freeze_rejects_further_adds(self):
+        """A frozen MetricSet keeps its data but refuses new metrics."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.a", 1, MetricSource.STATIC, MetricCategory.SIZE)
+
+        metrics.freeze()
+
+        assert metrics.frozen
+        assert isinstance(metrics.metrics, tuple)
+        assert metrics.get_value("repo.a") == 1
+        with pytest.raises(RuntimeError):
+            metrics.add_gauge("repo.b", 2, MetricSource.STATIC, MetricCategory.SIZE)
+
+
+class TestMetricColumns:
+    """Test cases for the column-oriented metric view."""
+
+    def test_round_trips_metrics(self):
+        """from_metrics/to_metric_list preserve every field and the order."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.loc", 10, MetricSource.STATIC, MetricCategory.SIZE, unit="lines",
+                          labels=[MetricLabel("language", "python")])
+        metrics.add_info("repo.flag", "yes", MetricSource.GIT, MetricCategory.HISTORY, description="d")
+
+        columns = MetricColumns.from_metrics(metrics.metrics)
+
+        assert len(columns) == 2
+        assert columns.names == ["repo.loc", "repo.flag"]
+        assert columns.values == [10, "yes"]
+        assert columns.sources == [MetricSource.STATIC, MetricSource.GIT]
+        assert columns.to_metric_list() == list(metrics.metrics)
+
+
+class TestMetricExport:
+    """Test cases for single-metric export formats."""
+
+    def test_to_prometheus(self):
+        """Prometheus line includes labels only when present."""
+        metrics = make_metric_set()
+        metrics.add_gauge("repo_loc", 10, MetricSource.STATIC, MetricCategory.SIZE,
+                          labels=[MetricLabel("language", "python"), MetricLabel("kind", "src")])
+        metrics.add_gauge("repo_files", 3, MetricSource.STATIC, MetricCategory.SIZE)
+
+        assert metrics.get("repo_loc").to_prometheus() == 'repo_loc{language="python",kind="src"} 10'
+        assert metrics.get("repo_files").to_prometheus() == "repo_files 3"
+
+    def test_timestamp_conversions(self):
+        """Nanosecond timestamps convert to aware datetimes and back."""
+        dt = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        metric = Metric(
+            name="repo.a",
+            value=1,
+            metric_type=MetricType.GAUGE,
+            source=MetricSource.STATIC,
+            category=MetricCategory.SIZE,
+            timestamp_ns=datetime_to_ns(dt),
+        )
+
+        assert metric.timestamp == dt
+        assert ns_to_datetime(datetime_to_ns(dt.replace(tzinfo=None))) == dt
+        assert metric.to_dict()["timestamp"] == "2024-05-01T12:30:15.123456+00:00"
+        assert metric.to_datadog()["points"] == [[int(dt.timestamp()), 1]]
+
+    def test_datetime_to_ns_offsets_and_pre_epoch(self):
+        """Offsets are normalized to UTC and pre-epoch datetimes go negative."""
+        plus_two = timezone(timedelta(hours=2))
+
+        assert datetime_to_ns(datetime(2024, 1, 1, 2, tzinfo=plus_two)) == 1704067200 * 10**9
+        assert datetime_to_ns(datetime(1969, 12, 31, 23, 59, 59, 999999, tzinfo=timezone.utc)) == -1000
+
+    def test_to_datadog_tags(self):
+        """Datadog tags use the key:value form of MetricLabel.__str__."""
+        metrics = make_metric_set()
+        labels = [MetricLabel("language", "python"), MetricLabel("kind", "src")]
+        metrics.add_gauge("repo.loc", 10, MetricSource.STATIC, MetricCategory.SIZE, labels=labels)
+
+        assert metrics.get("repo.loc").to_datadog()["tags"] == [str(l) for l in labels]
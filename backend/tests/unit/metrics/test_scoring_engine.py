@@ -0,0 +1,169 @@
+"""
+Tests for the metrics scoring engine.
+"""
+from datetime import datetime, timezone
+
+from app.metrics.schema import (
+    MetricSet,
+    MetricSource,
+    MetricCategory,
+    MetricNames,
+)
+from app.metrics.scoring_engine import ScoringEngine
+from app.core.scoring.repo_health import RepoHealthScore
+from app.core.scoring.tech_debt import TechDebtScore
+from app.core.scoring.product_level import ProductLevel
+
+
+def make_metric_set() -> MetricSet:
+    metrics = MetricSet(
+        analysis_id="test",
+        repo_url="https://example.com/repo",
+        branch="main",
+        collected_at=datetime.now(timezone.utc),
+    )
+    metrics.add_info(MetricNames.HAS_README, True, MetricSource.STATIC, MetricCategory.DOCUMENTATION)
+    metrics.add_info(MetricNames.HAS_DEPS_FILE, True, MetricSource.STATIC, MetricCategory.RUNABILITY)
+    metrics.add_info(MetricNames.HAS_SRC_DIR, True, MetricSource.STATIC, MetricCategory.STRUCTURE)
+    metrics.add_info(MetricNames.HAS_CI, True, MetricSource.CI, MetricCategory.INFRASTRUCTURE)
+    metrics.add_gauge(MetricNames.COMMITS_TOTAL, 120, MetricSource.GIT, MetricCategory.HISTORY)
+    metrics.add_gauge(MetricNames.FILES_TOTAL, 40, MetricSource.STATIC, MetricCategory.SIZE)
+    metrics.add_gauge(MetricNames.TEST_FILES_COUNT, 5, MetricSource.STATIC, MetricCategory.TESTING)
+    return metrics
+
+
+class TestMetricConversion:
+    """Test cases for MetricSet -> legacy dict conversion."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = ScoringEngine()
+
+    def test_structure_data_reads_metrics_and_defaults(self):
+        """Present metrics are copied, missing ones fall back to defaults."""
+        data = self.engine._metrics_to_structure_data(make_metric_set().value_map())
+
+        assert data["has_changelog"] is False
+        assert data["commits_total"] == 120
+        assert data["authors_count"] == 1
+        assert data["has_version_file"] is False
+
+    def test_static_metrics_include_default_estimates(self):
+        """Static metrics carry both collected values and fixed estimates."""
+        snap = make_metric_set().value_map()
+        data = self.engine._metrics_to_static_metrics(snap, self.engine._estimate_coverage(snap))
+
+        assert data["files_count"] == 40
+        assert data["test_files_count"] == 5
+        assert data["has_clear_layers"] is True
+        assert data["max_file_lines"] == 500
+        assert data["duplication_percent"] == 5
+        assert data["test_coverage"] == 40
+
+
+class TestSecurityScore:
+    """Test cases for the security score."""
+
+    def test_worst_severity_wins(self):
+        """The most severe finding decides the score."""
+        score = ScoringEngine()._calculate_security_score
+
+        assert score({}) == 3
+        assert score({MetricNames.DEPS_VULNERABILITIES: 1}) == 2
+        assert score({MetricNames.SEMGREP_MEDIUM: 3, MetricNames.SEMGREP_HIGH: 1}) == 1
+        assert score({MetricNames.DEPS_VULNERABILITIES: 6, MetricNames.HAS_SECRETS_IN_CODE: True}) == 0
+
+
+class TestVerdict:
+    """Test cases for verdict selection."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = ScoringEngine()
+        self.weak_health = RepoHealthScore(documentation=1, structure=1, runability=1, commit_history=1)
+        self.weak_debt = TechDebtScore(
+            architecture=1, code_quality=1, testing=1, infrastructure=1, security_deps=1,
+        )
+
+    def test_level_only_verdicts(self):
+        """Product-ready levels map straight to a verdict."""
+        verdict = self.engine._determine_verdict
+        assert verdict(ProductLevel.NEAR_PRODUCT, self.weak_health, self.weak_debt) == "Near-Product"
+        assert verdict(ProductLevel.INTERNAL_TOOL, self.weak_health, self.weak_debt) == "Internal Tool"
+
+    def test_prototype_depends_on_scores(self):
+        """Prototypes are R&D only when health or debt scores reach 6."""
+        strong_debt = TechDebtScore(
+            architecture=2, code_quality=2, testing=2, infrastructure=1, security_deps=1,
+        )
+        verdict = self.engine._determine_verdict
+        assert verdict(ProductLevel.PROTOTYPE, self.weak_health, self.weak_debt) == "Archive / Reference Only"
+        assert verdict(ProductLevel.PROTOTYPE, self.weak_health, strong_debt) == "R&D Prototype"
+        assert verdict(ProductLevel.RND_SPIKE, self.weak_health, strong_debt) == "Archive / Reference Only"
+
+
+class TestScoredMetrics:
+    """Test cases for scores written back to the MetricSet."""
+
+    def test_scores_added_with_categories(self):
+        """Every repo health and tech debt score is added as a MANUAL gauge."""
+        metrics = make_metric_set()
+        result = ScoringEngine().calculate_scores(metrics)
+
+        assert metrics.get_value(MetricNames.SCORE_HISTORY) == result.repo_health.commit_history
+        assert metrics.get_value(MetricNames.SCORE_REPO_HEALTH_TOTAL) == result.repo_health.total
+        assert metrics.get_value(MetricNames.SCORE_SECURITY) == result.tech_debt.security_deps
+        assert metrics.get_value(MetricNames.SCORE_TECH_DEBT_TOTAL) == result.tech_debt.total
+        assert metrics.get(MetricNames.SCORE_TESTING).category == MetricCategory.TESTING
+        assert len(metrics.filter_by_source(MetricSource.MANUAL)) == 11
+
+
+class TestScoringResult:
+    """Test cases for ScoringResult."""
+
+    def test_to_dict_returns_a_fresh_dict(self):
+        """Editing one to_dict result does not leak into later calls."""
+        result = ScoringEngine().calculate_scores(make_metric_set())
+
+        first = result.to_dict()
+        first["extra"] = True
+        first["repo_health"]["total"] = -1
+
+        second = result.to_dict()
+        assert "extra" not in second
+        assert second["verdict"] == result.verdict
+        assert second["repo_health"] == result.repo_health.to_dict()
+
+
+class TestRescoring:
+    """Test cases for scoring a MetricSet that already holds scores."""
+
+    def test_rescoring_does_not_duplicate_scores(self):
+        """Scores are written once, and a frozen scored MetricSet can be rescored."""
+        engine = ScoringEngine()
+        metrics = make_metric_set()
+        first = engine.calculate_scores(metrics)
+        count = len(metrics.metrics)
+        metrics.freeze()
+
+        again = engine.calculate_scores(metrics)
+
+        assert len(metrics.metrics) == count
+        assert again.tech_debt.total == first.tech_debt.total
+
+    def test_rescoring_replaces_stored_scores(self):
+        """After inputs change, the stored scores match the new result."""
+        engine = ScoringEngine()
+        metrics = make_metric_set()
+        first = engine.calculate_scores(metrics)
+        count = len(metrics.metrics)
+
+        metrics.add_info(MetricNames.HAS_DOCKERFILE, True, MetricSource.STATIC, MetricCategory.INFRASTRUCTURE)
+        metrics.add_info(MetricNames.CI_HAS_TESTS, True, MetricSource.CI, MetricCategory.INFRASTRUCTURE)
+        again = engine.calculate_scores(metrics)
+
+        assert again.tech_debt.infrastructure != first.tech_debt.infrastructure
+        assert len(metrics.metrics) == count + 2
+        assert metrics.get_value(MetricNames.SCORE_INFRASTRUCTURE) == again.tech_debt.infrastructure
+        assert metrics.get_value(MetricNames.SCORE_TECH_DEBT_TOTAL) == again.tech_debt.total
+        assert len(metrics.filter_by_source(MetricSource.MANUAL)) == 11
@@ -0,0 +1,671 @@
+"""
+Tests for metrics storage backends.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.metrics.schema import (
+    Metric,
+    MetricSet,
+    MetricType,
+    MetricSource,
+    MetricCategory,
+    MetricLabel,
+    datetime_to_ns,
+)
+from app.metrics.storage import JSONFileStorage, SQLiteStorage
+
+
+def make_metric_set(analysis_id: str = "test") -> MetricSet:
+    metrics = MetricSet(
+        analysis_id=analysis_id,
+        repo_url="https://example.com/repo",
+        branch="main",
+        collected_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    )
+    metrics.add_gauge("repo.loc.total", 1200, MetricSource.STATIC, MetricCategory.SIZE, unit="lines")
+    metrics.add_info("repo.health.has_readme", "yes", MetricSource.STATIC, MetricCategory.DOCUMENTATION)
+    metrics.add_gauge(
+        "repo.lang.files", 7, MetricSource.STATIC, MetricCategory.SIZE,
+        labels=[MetricLabel("lang", "py")],
+    )
+    return metrics
+
+
+def make_series(analysis_id: str, day: int, values) -> MetricSet:
+    """One analysis holding repo.loc.total points an hour apart on 2024-01-<day>."""
+    start = datetime(2024, 1, day, tzinfo=timezone.utc)
+    return MetricSet(
+        analysis_id=analysis_id,
+        repo_url="https://example.com/repo",
+        branch="main",
+        collected_at=start,
+        metrics=[
+            Metric("repo.loc.total", value, MetricType.GAUGE, MetricSource.STATIC, MetricCategory.SIZE,
+                   timestamp_ns=datetime_to_ns(start + timedelta(hours=i)))
+            for i, value in enumerate(values)
+        ],
+    )
+
+
+def make_baseline_db(db_path, metric_type: str = "gauge") -> None:
+    """A database in the baseline (user_version 0) schema with one analysis."""
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(f"""
+            CREATE TABLE analyses (
+                analysis_id TEXT PRIMARY KEY, repo_url TEXT NOT NULL, branch TEXT,
+                collected_at TIMESTAMP NOT NULL, metrics_count INTEGER DEFAULT 0,
+                metadata JSON, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, analysis_id TEXT NOT NULL,
+                name TEXT NOT NULL, value REAL, value_text TEXT, metric_type TEXT NOT NULL,
+                source TEXT NOT NULL, category TEXT NOT NULL, labels JSON, unit TEXT,
+                description TEXT, timestamp TIMESTAMP NOT NULL,
+                FOREIGN KEY (analysis_id) REFERENCES analyses(analysis_id)
+            );
+            CREATE INDEX idx_metrics_analysis ON metrics(analysis_id);
+            CREATE INDEX idx_metrics_name ON metrics(name);
+            CREATE INDEX idx_metrics_timestamp ON metrics(timestamp);
+            CREATE INDEX idx_metrics_category ON metrics(category);
+            CREATE TABLE reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, analysis_id TEXT NOT NULL,
+                report_type TEXT NOT NULL, content TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (analysis_id) REFERENCES analyses(analysis_id)
+            );
+            INSERT INTO analyses (analysis_id, repo_url, collected_at, metrics_count)
+            VALUES ('old', 'https://example.com/repo', '2024-01-02T03:04:05+00:00', 1);
+            INSERT INTO metrics
+            (analysis_id, name, value, metric_type, source, category, labels, timestamp)
+            VALUES ('old', 'repo.loc.total', 10, '{metric_type}', 'git', 'history', '{{"lang": "py"}}',
+                    '2024-01-02T03:04:05.123456+00:00');
+        """)
+
+
+def table_names(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+class TestJSONFileIndex:
+    """Test cases for the JSON backend's append-only index."""
+
+    async def test_listing_is_newest_first_and_updates_in_place(self, tmp_path):
+        """Re-saving an analysis updates its entry without moving it."""
+        storage = JSONFileStorage(tmp_path)
+        for analysis_id in ("a", "b", "c"):
+            await storage.save_metrics(make_metric_set(analysis_id))
+        await storage.save_metrics(make_metric_set("b"))
+
+        listed = await storage.list_analyses()
+
+        assert [e["analysis_id"] for e in listed] == ["c", "b", "a"]
+        assert [e["analysis_id"] for e in await storage.list_analyses(limit=1, offset=1)] == ["b"]
+        assert len(storage.index_file.read_text().splitlines()) == 4
+
+    async def test_other_instance_sees_appends(self, tmp_path):
+        """A second storage on the same directory picks up new entries."""
+        reader = JSONFileStorage(tmp_path)
+        writer = JSONFileStorage(tmp_path)
+        await writer.save_metrics(make_metric_set("a"))
+
+        assert [e["analysis_id"] for e in await reader.list_analyses()] == ["a"]
+
+    async def test_index_is_compacted(self, tmp_path):
+        """Superseded lines are dropped once they outnumber live entries."""
+        storage = JSONFileStorage(tmp_path)
+        for _ in range(40):
+            await storage.save_metrics(make_metric_set("a"))
+
+        assert len(storage.index_file.read_text().splitlines()) < 40
+        assert [e["analysis_id"] for e in await JSONFileStorage(tmp_path).list_analyses()] == ["a"]
+
+    async def test_legacy_index_is_migrated(self, tmp_path):
+        """An old index.json list is read as is and carried over in order on the first save."""
+        legacy = [{"analysis_id": "new"}, {"analysis_id": "old"}]
+        (tmp_path / "index.json").write_text(json.dumps(legacy))
+
+        storage = JSONFileStorage(tmp_path)
+
+        assert await storage.list_analyses() == legacy
+        assert not storage.index_file.exists()
+
+        await storage.save_metrics(make_metric_set("a"))
+        reloaded = JSONFileStorage(tmp_path)
+        assert [e["analysis_id"] for e in await reloaded.list_analyses()] == ["a", "new", "old"]
+
+
+class TestJSONFilePartitions:
+    """Test cases for day-partitioned JSON metric files."""
+
+    async def test_files_are_partitioned_by_collection_day(self, tmp_path):
+        """Metrics land under metrics/YYYY/MM/DD with a name manifest."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_metrics(make_metric_set())
+
+        day_dir = tmp_path / "metrics" / "2024" / "01" / "02"
+        manifest = json.loads((day_dir / "_manifest.json").read_text())
+
+        assert (day_dir / "test.json").exists()
+        assert "repo.loc.total" in manifest["test"]
+        assert (await storage.get_metrics("test")).get_value("repo.loc.total") == 1200
+
+    async def test_failed_manifest_write_keeps_the_old_manifest(self, tmp_path, monkeypatch):
+        """The day manifest is replaced atomically, never left truncated."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_metrics(make_metric_set("a"))
+        manifest_file = tmp_path / "metrics" / "2024" / "01" / "02" / "_manifest.json"
+        before = manifest_file.read_bytes()
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("app.metrics.storage.os.replace", fail_replace)
+        with pytest.raises(OSError):
+            await storage.save_metrics(make_metric_set("b"))
+
+        assert manifest_file.read_bytes() == before
+
+    async def test_files_are_written_compact(self, tmp_path):
+        """Metric files hold the to_dict() document without indentation."""
+        storage = JSONFileStorage(tmp_path)
+        metrics = make_metric_set()
+        await storage.save_metrics(metrics)
+
+        raw = (tmp_path / "metrics" / "2024" / "01" / "02" / "test.json").read_text()
+
+        assert "\n" not in raw and len(raw) < len(metrics.to_json())
+        assert json.loads(raw) == metrics.to_dict()
+
+    async def test_query_prunes_by_time_range(self, tmp_path):
+        """Only analyses collected inside the range are returned."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_metrics(make_metric_set("early"))
+        later = make_metric_set("late")
+        later.collected_at = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        await storage.save_metrics(later)
+
+        found = await storage.query_metrics(
+            "repo.loc.total", start_time=datetime(2024, 2, 1, tzinfo=timezone.utc),
+        )
+
+        assert len(found) == 1
+
+    async def test_query_filters_labels(self, tmp_path):
+        """Every requested label must match; extra labels on the metric are fine."""
+        storage = JSONFileStorage(tmp_path)
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.lang.files", 2, MetricSource.STATIC, MetricCategory.SIZE,
+                          labels=[MetricLabel("lang", "go"), MetricLabel("kind", "src")])
+        await storage.save_metrics(metrics)
+
+        query = storage.query_metrics
+
+        assert [m.value for m in await query("repo.lang.files", labels={"kind": "src", "lang": "go"})] == [2]
+        assert len(await query("repo.lang.files", labels={"lang": "py"})) == 1
+        assert await query("repo.lang.files", labels={"lang": "py", "kind": "src"}) == []
+        assert len(await query("repo.lang.files")) == 2
+
+    async def test_flat_layout_still_read_and_moved_on_resave(self, tmp_path):
+        """Files from the old flat layout load, and move into a partition when re-saved."""
+        storage = JSONFileStorage(tmp_path)
+        metrics = make_metric_set()
+        legacy_file = tmp_path / "metrics" / "test.json"
+        legacy_file.write_text(metrics.to_json())
+
+        assert (await storage.get_metrics("test")).get_value("repo.loc.total") == 1200
+        assert len(await storage.query_metrics("repo.loc.total")) == 1
+
+        await storage.save_metrics(metrics)
+
+        assert not legacy_file.exists()
+        assert len(await storage.query_metrics("repo.loc.total")) == 1
+
+
+class TestJSONFileColumnar:
+    """Test cases for the default columnar load."""
+
+    async def test_columns_follow_get_metrics(self, tmp_path):
+        """The JSON backend transposes its loaded MetricSet."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_metrics(make_metric_set())
+
+        columns = await storage.get_metrics_columnar("test")
+
+        assert columns.to_metric_list() == (await storage.get_metrics("test")).metrics
+        assert await storage.get_metrics_columnar("missing") is None
+
+
+class TestJSONFileAggregate:
+    """Test cases for the default aggregate path."""
+
+    async def test_aggregates_queried_values(self, tmp_path):
+        """Without summaries, aggregates are computed from query_metrics."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_metrics(make_series("a", 2, [1, 5, 3]))
+
+        assert await storage.aggregate_metrics("repo.loc.total") == {
+            "count": 3, "min": 1, "max": 5, "sum": 9, "avg": 3,
+        }
+        assert (await storage.aggregate_metrics("repo.missing"))["avg"] is None
+
+
+class TestJSONFileRetention:
+    """Test cases for JSON backend retention."""
+
+    async def test_compact_removes_old_analyses(self, tmp_path):
+        """Analyses collected before the cutoff lose their file, manifest and index entry."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_metrics(make_metric_set("old"))
+        recent = make_metric_set("new")
+        recent.collected_at = datetime.now(timezone.utc)
+        await storage.save_metrics(recent)
+
+        assert await storage.compact(retention_days=30) == 1
+
+        day_dir = tmp_path / "metrics" / "2024" / "01" / "02"
+        assert not (day_dir / "old.json").exists()
+        assert json.loads((day_dir / "_manifest.json").read_text()) == {}
+        assert [e["analysis_id"] for e in await JSONFileStorage(tmp_path).list_analyses()] == ["new"]
+        assert await storage.compact(retention_days=30) == 0
+
+
+class TestJSONFileReadCache:
+    """Test cases for cached JSON metric file parsing."""
+
+    async def test_repeat_reads_share_parsed_metrics(self, tmp_path):
+        """An unchanged file is parsed once; each call still gets its own MetricSet."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_metrics(make_metric_set())
+
+        first = await storage.get_metrics("test")
+        first.add_gauge("repo.extra", 1, MetricSource.MANUAL, MetricCategory.SIZE)
+        first.metadata["touched"] = True
+        second = await storage.get_metrics("test")
+
+        assert second is not first
+        assert second.metrics[0] is first.metrics[0]
+        assert second.get("repo.extra") is None
+        assert second.metadata == {}
+
+    async def test_rewrite_invalidates(self, tmp_path):
+        """Saving again is visible on the next read."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_metrics(make_metric_set())
+        await storage.get_metrics("test")
+
+        updated = make_metric_set()
+        updated.add_gauge("repo.extra", 2, MetricSource.MANUAL, MetricCategory.SIZE)
+        await storage.save_metrics(updated)
+
+        assert (await storage.get_metrics("test")).get_value("repo.extra") == 2
+
+
+class TestJSONFileThreading:
+    """Test cases for JSON file I/O off the event loop."""
+
+    async def test_io_runs_on_storage_thread(self, tmp_path, monkeypatch):
+        """Saves and reads both run on the storage's I/O thread."""
+        storage = JSONFileStorage(tmp_path)
+        threads = {}
+        for name in ("_save_metrics_sync", "_get_metrics_sync"):
+            def spy(*args, _name=name, _original=getattr(storage, name)):
+                threads[_name] = threading.current_thread()
+                return _original(*args)
+            monkeypatch.setattr(storage, name, spy)
+
+        await storage.save_metrics(make_metric_set())
+        await storage.get_metrics("test")
+
+        assert threads["_save_metrics_sync"].name.startswith("json-storage")
+        assert threads["_get_metrics_sync"] is threads["_save_metrics_sync"]
+
+    async def test_concurrent_saves_all_indexed(self, tmp_path):
+        """Saves issued together all reach the index."""
+        storage = JSONFileStorage(tmp_path)
+        await asyncio.gather(*(storage.save_metrics(make_metric_set(f"a{i}")) for i in range(10)))
+
+        assert len(await storage.list_analyses()) == 10
+
+
+class TestJSONFileReports:
+    """Test cases for JSON report files."""
+
+    async def test_save_replaces_atomically(self, tmp_path):
+        """Resaving swaps in the new content and leaves no temp files."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_report("test", "summary", "old", digest="d1")
+        path = await storage.save_report("test", "summary", "new", digest="d2", flush=True)
+
+        assert path.read_text() == "new"
+        assert await storage.load_report("test", "summary", "d2") == ("new", path)
+        assert not list(path.parent.glob("*.tmp"))
+
+    async def test_resave_without_digest_drops_old_one(self, tmp_path):
+        """A stale digest never vouches for newer content."""
+        storage = JSONFileStorage(tmp_path)
+        await storage.save_report("test", "summary", "old", digest="d1")
+        await storage.save_report("test", "summary", "new")
+
+        assert await storage.load_report("test", "summary", "d1") is None
+
+
+class TestSQLiteStorage:
+    """Test cases for SQLiteStorage."""
+
+    def test_database_uses_wal(self, tmp_path):
+        """The database file is switched to WAL journaling."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+
+        with sqlite3.connect(storage.db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    async def test_io_runs_off_the_event_loop(self, tmp_path, monkeypatch):
+        """Saves run on the writer thread and reads on worker threads."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        threads = {}
+        for name in ("_save_metrics_sync", "_get_metrics_sync"):
+            def spy(*args, _name=name, _original=getattr(storage, name)):
+                threads[_name] = threading.current_thread()
+                return _original(*args)
+            monkeypatch.setattr(storage, name, spy)
+
+        await storage.save_metrics(make_metric_set())
+        await storage.get_metrics("test")
+
+        assert threads["_save_metrics_sync"].name.startswith("sqlite-writer")
+        assert threads["_get_metrics_sync"] is not threading.main_thread()
+
+    async def test_concurrent_saves_are_serialized(self, tmp_path):
+        """Saves issued together all land without lock errors."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+
+        await asyncio.gather(*(storage.save_metrics(make_metric_set(f"a{i}")) for i in range(8)))
+
+        assert len(await storage.list_analyses()) == 8
+
+    def test_connection_is_reused_per_thread(self, tmp_path):
+        """A thread gets the same connection back; close_all drops the pool."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        with storage._get_conn() as first, storage._get_conn() as second:
+            assert first is second
+
+        storage.close_all()
+
+        with storage._get_conn() as third:
+            assert third is not first
+            assert third.execute("SELECT COUNT(*) FROM analyses").fetchone()[0] == 0
+
+    def test_close_all_waits_for_running_writes(self, tmp_path):
+        """Closing the pool first drains the writer thread."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        started, release, done = threading.Event(), threading.Event(), []
+
+        def slow_write():
+            with storage._get_conn() as conn:
+                started.set()
+                release.wait(5)
+                done.append(conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0])
+
+        storage._writer.submit(slow_write)
+        started.wait(5)
+        threading.Timer(0.05, release.set).start()
+        storage.close_all()
+
+        assert done == [0]
+
+    def test_failed_operation_rolls_back(self, tmp_path):
+        """An error inside _get_conn leaves no open transaction on the pooled connection."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        with pytest.raises(ValueError):
+            with storage._get_conn() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                raise ValueError("boom")
+
+        with storage._get_conn() as conn:
+            assert not conn.in_transaction
+
+    async def test_round_trip(self, tmp_path):
+        """Saved metrics load back with values, labels and units."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_metric_set())
+
+        loaded = await storage.get_metrics("test")
+
+        assert loaded.get_value("repo.loc.total") == 1200
+        assert loaded.get_value("repo.health.has_readme") == "yes"
+        assert list(loaded.get("repo.lang.files").labels) == [MetricLabel("lang", "py")]
+        assert loaded.get("repo.loc.total").unit == "lines"
+
+    async def test_labels_column_is_compact_json(self, tmp_path):
+        """Unlabeled rows store "{}"; labels round-trip, including non-ASCII values."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        metrics = make_metric_set()
+        metrics.add_gauge("repo.owner", 1, MetricSource.GIT, MetricCategory.HISTORY,
+                          labels=[MetricLabel("name", "Jürgen")])
+        await storage.save_metrics(metrics)
+
+        with sqlite3.connect(storage.db_path) as conn:
+            stored = [r[0] for r in conn.execute("SELECT labels FROM metrics ORDER BY id")]
+        loaded = await storage.get_metrics("test")
+
+        assert stored[:3] == ["{}", "{}", '{"lang":"py"}']
+        assert list(loaded.get("repo.owner").labels) == [MetricLabel("name", "Jürgen")]
+        assert len(await storage.query_metrics("repo.owner", labels={"name": "Jürgen"})) == 1
+
+    async def test_resave_replaces_metrics(self, tmp_path):
+        """Saving an analysis again replaces its metrics instead of appending."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_metric_set())
+        await storage.save_metrics(make_metric_set())
+
+        loaded = await storage.get_metrics("test")
+        analyses = await storage.list_analyses()
+
+        assert len(loaded.metrics) == 3
+        assert [a["metrics_count"] for a in analyses] == [3]
+
+    async def test_columnar_load_matches_get_metrics(self, tmp_path):
+        """Columns loaded straight from SQLite describe the same metrics as get_metrics."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_metric_set())
+
+        loaded = await storage.get_metrics("test")
+        columns = await storage.get_metrics_columnar("test")
+
+        assert columns.names == [m.name for m in loaded.metrics]
+        assert columns.values == [1200, "yes", 7]
+        assert columns.labels == [(), (), (MetricLabel("lang", "py"),)]
+        assert [m.to_dict() for m in columns.to_metric_list()] == [m.to_dict() for m in loaded.metrics]
+        assert await storage.get_metrics_columnar("missing") is None
+
+    async def test_list_analyses_reads_covering_index(self, tmp_path):
+        """Listing is newest first and served by an index scan without a sort."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        for day, analysis_id in ((2, "a"), (4, "c"), (3, "b")):
+            await storage.save_metrics(make_series(analysis_id, day, [1]))
+
+        listed = await storage.list_analyses(limit=2)
+
+        assert [a["analysis_id"] for a in listed] == ["c", "b"]
+        with sqlite3.connect(storage.db_path) as conn:
+            plan = conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT analysis_id, repo_url, branch, collected_at, metrics_count
+                FROM analyses ORDER BY collected_at DESC LIMIT 2
+            """).fetchall()
+        assert [step[-1] for step in plan] == ["SCAN analyses USING COVERING INDEX idx_analyses_ts"]
+
+    async def test_load_keeps_insertion_order(self, tmp_path):
+        """Metrics load in the order they were added, not by timestamp."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        metrics = make_metric_set()
+        first = metrics.metrics[0]
+        metrics.metrics[0] = replace(first, timestamp_ns=first.timestamp_ns + 10**9)
+        await storage.save_metrics(metrics)
+
+        loaded = await storage.get_metrics("test")
+
+        assert [m.name for m in loaded.metrics] == [m.name for m in metrics.metrics]
+        with sqlite3.connect(storage.db_path) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM metrics WHERE analysis_id = ?", ("test",)
+            ).fetchall()
+        assert "idx_metrics_analysis_ts" in plan[0][-1]
+
+    async def test_time_range_query_uses_integer_timestamps(self, tmp_path):
+        """Range filters compare epoch-nanosecond integers."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_metric_set())
+        ts = (await storage.get_metrics("test")).get("repo.loc.total").timestamp
+
+        window = {"start_time": ts, "end_time": ts + timedelta(microseconds=1)}
+
+        assert len(await storage.query_metrics("repo.loc.total", **window)) == 1
+        assert await storage.query_metrics("repo.loc.total", start_time=datetime(2999, 1, 1)) == []
+
+    async def test_migrates_baseline_schema(self, tmp_path):
+        """A database from the baseline text schema is converted on open."""
+        db_path = tmp_path / "metrics.db"
+        make_baseline_db(db_path)
+
+        storage = SQLiteStorage(db_path)
+        loaded = await storage.get_metrics("old")
+        metric = loaded.get("repo.loc.total")
+
+        assert loaded.collected_at == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        assert metric.timestamp.microsecond == 123456
+        assert (metric.value, metric.source, metric.category) == (10, MetricSource.GIT, MetricCategory.HISTORY)
+        assert len(await storage.query_metrics("repo.loc.total", labels={"lang": "py"})) == 1
+        assert (await storage.aggregate_metrics("repo.loc.total"))["sum"] == 10
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 4
+            assert table_names(conn) >= {"metrics", "analyses", "reports"}
+            assert not table_names(conn) & {"metrics_old", "analyses_v0"}
+
+    async def test_failed_migration_leaves_database_untouched(self, tmp_path):
+        """The migration is one transaction: a failure rolls every step back."""
+        db_path = tmp_path / "metrics.db"
+        make_baseline_db(db_path, metric_type="unknown")
+
+        with pytest.raises(KeyError):
+            SQLiteStorage(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+            assert "metrics_old" not in table_names(conn)
+            assert "name" in [row[1] for row in conn.execute("PRAGMA table_info(metrics)")]
+            conn.execute("UPDATE metrics SET metric_type = 'gauge'")
+
+        assert (await SQLiteStorage(db_path).get_metrics("old")).get_value("repo.loc.total") == 10
+
+    async def test_resumes_an_interrupted_migration(self, tmp_path):
+        """Baseline rows left in metrics_old/analyses_v0 beside an empty new schema are copied over."""
+        db_path = tmp_path / "metrics.db"
+        SQLiteStorage(db_path).close_all()
+        baseline_path = tmp_path / "baseline.db"
+        make_baseline_db(baseline_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("ATTACH DATABASE ? AS baseline", (str(baseline_path),))
+            conn.execute("CREATE TABLE metrics_old AS SELECT * FROM baseline.metrics")
+            conn.execute("CREATE TABLE analyses_v0 AS SELECT * FROM baseline.analyses")
+            conn.execute("PRAGMA user_version = 0")
+
+        storage = SQLiteStorage(db_path)
+
+        assert (await storage.get_metrics("old")).get_value("repo.loc.total") == 10
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 4
+            assert not table_names(conn) & {"metrics_old", "analyses_v0"}
+
+    async def test_columns_are_dictionary_encoded(self, tmp_path):
+        """Metric names and enums are stored once in lookup tables and joined back in v_metrics."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_metric_set("a"))
+        await storage.save_metrics(make_metric_set("b"))
+
+        with sqlite3.connect(storage.db_path) as conn:
+            names = conn.execute("SELECT COUNT(*) FROM metric_names").fetchone()[0]
+            row = conn.execute(
+                "SELECT name, metric_type, source, category FROM v_metrics WHERE analysis_id = 'b' ORDER BY id"
+            ).fetchone()
+
+        assert names == 3
+        assert row == ("repo.loc.total", "gauge", "static", "size")
+        assert len(await SQLiteStorage(storage.db_path).query_metrics("repo.loc.total")) == 2
+
+    async def test_label_filter_runs_in_sql(self, tmp_path):
+        """Label filters match through metric_labels, which follows re-saves."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_metric_set("a"))
+        other = make_metric_set("b")
+        other.add_gauge("repo.lang.files", 3, MetricSource.STATIC, MetricCategory.SIZE,
+                        labels=[MetricLabel("lang", "go")])
+        await storage.save_metrics(other)
+        await storage.save_metrics(make_metric_set("a"))
+
+        go = await storage.query_metrics("repo.lang.files", labels={"lang": "go"})
+        py = await storage.query_metrics("repo.lang.files", labels={"lang": "py"})
+
+        assert [m.value for m in go] == [3]
+        assert len(py) == 2
+        assert await storage.query_metrics("repo.lang.files", labels={"lang": "py", "kind": "src"}) == []
+        with sqlite3.connect(storage.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM metric_labels").fetchone()[0] == 3
+
+    async def test_aggregate_uses_summaries_and_raw_rows(self, tmp_path):
+        """Covered analyses come from summaries, straddling ones from their rows."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_series("a", 2, [1, 5, 3]))
+        await storage.save_metrics(make_series("b", 3, [10, 20]))
+
+        everything = await storage.aggregate_metrics("repo.loc.total")
+        # a fully inside, b cut after its first point
+        cut = await storage.aggregate_metrics(
+            "repo.loc.total",
+            start_time=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            end_time=datetime(2024, 1, 3, 0, 30, tzinfo=timezone.utc),
+        )
+
+        assert everything == {"count": 5, "min": 1, "max": 20, "sum": 39, "avg": 7.8}
+        assert cut == {"count": 4, "min": 1, "max": 10, "sum": 19, "avg": 4.75}
+        with sqlite3.connect(storage.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM metric_summaries").fetchone()[0] == 2
+
+    async def test_resave_rebuilds_summary(self, tmp_path):
+        """Saving an analysis again replaces its summary row."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_series("a", 2, [1, 5, 3]))
+        await storage.save_metrics(make_series("a", 2, [4]))
+
+        assert await storage.aggregate_metrics("repo.loc.total") == {
+            "count": 1, "min": 4, "max": 4, "sum": 4, "avg": 4,
+        }
+
+    async def test_compact_rolls_up_then_deletes(self, tmp_path):
+        """Expired analyses are folded into hourly buckets and removed everywhere."""
+        storage = SQLiteStorage(tmp_path / "metrics.db")
+        await storage.save_metrics(make_series("a", 2, [1, 5, 3]))
+        await storage.save_metrics(make_series("b", 2, [7]))
+        recent = make_metric_set("recent")
+        recent.collected_at = datetime.now(timezone.utc)
+        await storage.save_metrics(recent)
+
+        assert await storage.compact(retention_days=30) == 2
+
+        assert [a["analysis_id"] for a in await storage.list_analyses()] == ["recent"]
+        assert await storage.get_metrics("a") is None
+        buckets = await storage.query_rollup("repo.loc.total")
+        assert [(b["bucket"].hour, b["count"], b["min"], b["max"], b["sum"]) for b in buckets] == [
+            (0, 2, 1, 7, 8), (1, 1, 5, 5, 5), (2, 1, 3, 3, 3),
+        ]
+        with sqlite3.connect(storage.db_path) as conn:
+            summaries = conn.execute("SELECT DISTINCT analysis_id FROM metric_summaries").fetchall()
+            assert summaries == [("recent",)]
+            assert conn.execute("SELECT COUNT(*) FROM metric_labels").fetchone()[0] == 1
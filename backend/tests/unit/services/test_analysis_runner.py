@@ -0,0 +1,79 @@
+"""
+Tests for the analysis runner.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.analyzers.repo_fetcher import RepoFetchError
+from app.metrics.schema import MetricNames
+from app.services import analysis_runner as runner_module
+from app.services.analysis_runner import AnalysisRunner
+
+
+def make_scoring_result() -> SimpleNamespace:
+    return SimpleNamespace(
+        repo_health=SimpleNamespace(total=8),
+        tech_debt=SimpleNamespace(total=10, security_deps=1),
+        product_level=SimpleNamespace(value="Internal Tool"),
+    )
+
+
+class TestAnalysisRunner:
+    """Test cases for AnalysisRunner."""
+
+    async def test_pipeline_reused_per_region_mode(self, tmp_path, monkeypatch):
+        """Each region mode gets one pipeline, shared by later runs."""
+        monkeypatch.chdir(tmp_path)
+        runner = AnalysisRunner()
+
+        eu = await runner._warmup_pipeline("EU_UA")
+
+        assert await runner._warmup_pipeline("EU_UA") is eu
+        us = await runner._warmup_pipeline("US")
+        assert us is not eu
+        assert us.config.region_mode == "US"
+
+    async def test_security_alert_only_for_security_findings(self, monkeypatch):
+        """Critical findings trigger a security alert; completion is always notified."""
+        service = SimpleNamespace(notify_security_alert=AsyncMock(), notify_analysis_complete=AsyncMock())
+        monkeypatch.setattr(runner_module, "notification_service", service)
+        runner = AnalysisRunner()
+
+        await runner._send_notifications("a1", "https://example.com/repo", make_scoring_result(), {})
+        assert service.notify_security_alert.await_count == 0
+
+        metrics = {MetricNames.SEMGREP_CRITICAL: 2, MetricNames.SEMGREP_HIGH: 1}
+        await runner._send_notifications("a2", "https://example.com/repo", make_scoring_result(), metrics)
+
+        alert = service.notify_security_alert.await_args.kwargs
+        assert (alert["critical_count"], alert["high_count"], alert["has_secrets"]) == (2, 1, False)
+        assert service.notify_analysis_complete.await_count == 2
+
+    async def test_warmup_is_finished_when_fetch_fails(self, monkeypatch):
+        """A warmup still running when the fetch fails is cancelled and awaited before run() raises."""
+        progress = SimpleNamespace(init_progress=AsyncMock(), update_stage=AsyncMock(), set_error=AsyncMock())
+        monkeypatch.setattr(runner_module, "progress_manager", progress)
+        events = []
+
+        async def fetch(repo_url, branch=None):
+            await asyncio.sleep(0)  # let the warmup task start
+            raise RepoFetchError("clone failed")
+
+        async def warmup(region_mode="EU_UA"):
+            try:
+                await asyncio.sleep(10)
+            finally:
+                events.append("warmup closed")
+
+        monkeypatch.setattr(runner_module.repo_fetcher, "fetch", fetch)
+        runner = AnalysisRunner()
+        monkeypatch.setattr(runner, "_set_status", AsyncMock())
+        monkeypatch.setattr(runner, "_warmup_pipeline", warmup)
+
+        with pytest.raises(RepoFetchError):
+            await runner.run("00000000-0000-0000-0000-000000000001", "https://example.com/repo")
+
+        assert events == ["warmup closed"]
@@ -0,0 +1,271 @@
+"""
+Tests for Calibration service.
+"""
+import json
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services import calibration
+from app.services.calibration import CalibrationService
+
+
+def record(service: CalibrationService, analysis_id: str, hours: float = 100, complexity: str = "M"):
+    service.record_prediction(
+        analysis_id=analysis_id,
+        predicted_hours=hours,
+        predicted_cost_eu=hours * 60,
+        predicted_cost_ua=hours * 30,
+        predicted_level="Internal Tool",
+        predicted_complexity=complexity,
+    )
+
+
+class TestCalibrationService:
+    """Test cases for CalibrationService."""
+
+    def test_feedback_updates_recorded_sample(self, tmp_path):
+        """Feedback is matched to its prediction by analysis ID."""
+        service = CalibrationService(tmp_path / "calibration.json")
+        record(service, "a")
+        record(service, "b", hours=200)
+
+        service.add_feedback("b", actual_hours=100, actual_level="Prototype")
+
+        sample = service.samples[1]
+        assert sample.actual_hours == 100
+        assert sample.hours_error_pct == 100.0
+        assert sample.level_correct is False
+        assert service.samples[0].actual_hours is None
+
+    def test_feedback_for_unknown_analysis_is_ignored(self, tmp_path):
+        """Unknown analysis IDs leave the samples untouched."""
+        service = CalibrationService(tmp_path / "calibration.json")
+        record(service, "a")
+
+        service.add_feedback("missing", actual_hours=10)
+
+        assert service.samples[0].actual_hours is None
+
+    def test_reload_restores_lookup(self, tmp_path):
+        """Samples loaded from disk can receive feedback."""
+        path = tmp_path / "calibration.json"
+        record(CalibrationService(path), "a")
+
+        service = CalibrationService(path)
+        service.add_feedback("a", actual_hours=50)
+
+        assert service.samples[0].hours_error_pct == 100.0
+
+    def test_adjustments_learned_from_feedback(self, tmp_path):
+        """Multipliers are mean actual/predicted ratios, per complexity from 2 samples."""
+        service = CalibrationService(tmp_path / "calibration.json")
+        for analysis_id, complexity, actual in (("a", "M", 120), ("b", "M", 140), ("c", "L", 200)):
+            record(service, analysis_id, complexity=complexity)
+            service.add_feedback(analysis_id, actual_hours=actual)
+
+        assert service.adjustments["hours_multiplier"] == pytest.approx(460 / 300)
+        assert service.adjustments["complexity_adjustments"]["M"] == pytest.approx(1.3)
+        assert service.adjustments["complexity_adjustments"]["L"] == 1.0
+        assert service.get_calibrated_hours(100, "M") == pytest.approx(100 * 460 / 300 * 1.3)
+        assert service.get_calibrated_hours(100, "XXL") == pytest.approx(100 * 460 / 300)
+
+    def test_stats(self, tmp_path):
+        """Stats cover only samples with hours or level feedback."""
+        service = CalibrationService(tmp_path / "calibration.json")
+        assert service.get_stats() is None
+
+        for analysis_id in "abc":
+            record(service, analysis_id)
+        service.add_feedback("a", actual_hours=50, actual_cost=4500)
+        service.add_feedback("b", actual_hours=200, actual_level="Internal Tool")
+        service.add_feedback("c", actual_cost=1000)
+
+        stats = service.get_stats()
+        assert stats.sample_count == 2
+        assert stats.hours_mape == pytest.approx(75.0)
+        assert stats.hours_bias == pytest.approx(25.0)
+        assert stats.cost_mape == pytest.approx(0.0)
+        assert stats.level_accuracy == 1.0
+        assert stats.confidence_interval == pytest.approx(1.96 * 35.355339, rel=1e-6)
+
+    def test_repeated_feedback_replaces_earlier_actuals(self, tmp_path):
+        """Running statistics drop a sample's old actuals when feedback is resubmitted."""
+        service = CalibrationService(tmp_path / "calibration.json")
+        for analysis_id in "abc":
+            record(service, analysis_id)
+            service.add_feedback(analysis_id, actual_hours=50)
+        service.add_feedback("c", actual_hours=200)
+
+        stats = service.get_stats()
+        assert stats.sample_count == 3
+        assert stats.hours_mape == pytest.approx((100 + 100 + 50) / 3)
+        assert stats.hours_bias == pytest.approx((100 + 100 - 50) / 3)
+        assert service.adjustments["hours_multiplier"] == pytest.approx((0.5 + 0.5 + 2) / 3)
+
+
+class TestCalibrationPersistence:
+    """Test cases for the calibration snapshot and log."""
+
+    def test_each_call_appends_one_log_line(self, tmp_path):
+        """Predictions and feedback are logged, not rewritten into the snapshot."""
+        path = tmp_path / "calibration.json"
+        service = CalibrationService(path)
+        record(service, "a")
+        service.add_feedback("a", actual_hours=50)
+
+        assert not path.exists()
+        lines = [json.loads(line) for line in service.log_path.read_text().splitlines()]
+        assert [line["type"] for line in lines] == ["prediction", "feedback"]
+
+    def test_timestamps_kept_as_stored(self, tmp_path):
+        """Timestamps round-trip as ISO strings and parse on demand."""
+        path = tmp_path / "calibration.json"
+        service = CalibrationService(path)
+        record(service, "a")
+
+        sample = CalibrationService(path).samples[0]
+        assert sample.timestamp == service.samples[0].timestamp
+        assert sample.timestamp_dt.isoformat() == sample.timestamp
+        assert sample.timestamp_dt.tzinfo is not None
+
+    def test_bulk_record_logs_in_one_write(self, tmp_path):
+        """Bulk rows share a timestamp unless given one and reload like single records."""
+        path = tmp_path / "calibration.json"
+        service = CalibrationService(path)
+        then = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            {"analysis_id": analysis_id, "predicted_hours": 10, "predicted_cost_eu": 600, "predicted_cost_ua": 300,
+             "predicted_level": "Prototype", "predicted_complexity": "S"}
+            for analysis_id in "abc"
+        ]
+        rows[2]["timestamp"] = then
+
+        service.record_predictions_bulk(rows)
+
+        a, b, c = CalibrationService(path).samples
+        assert a.timestamp == b.timestamp != c.timestamp
+        assert c.timestamp_dt == then
+        assert len(service.log_path.read_text().splitlines()) == 3
+
+    def test_compact_folds_log_into_snapshot(self, tmp_path):
+        """After compaction the snapshot alone restores every sample."""
+        path = tmp_path / "calibration.json"
+        service = CalibrationService(path)
+        record(service, "a")
+        service.add_feedback("a", actual_hours=50)
+        service.compact()
+        record(service, "b")
+
+        reloaded = CalibrationService(path)
+        assert [s.analysis_id for s in reloaded.samples] == ["a", "b"]
+        assert reloaded.samples[0].hours_error_pct == 100.0
+        assert len(service.log_path.read_text().splitlines()) == 1
+
+    def test_log_compacts_itself(self, tmp_path):
+        """A log much longer than the sample list is folded automatically."""
+        service = CalibrationService(tmp_path / "calibration.json")
+        record(service, "a")
+        for _ in range(70):
+            service.add_feedback("a", actual_hours=50)
+
+        assert len(service.log_path.read_text().splitlines()) < 70
+        assert CalibrationService(service.data_path).samples[0].actual_hours == 50
+
+    def test_replay_skips_torn_line_and_snapshotted_predictions(self, tmp_path):
+        """A partial last line is dropped and predictions already snapshotted aren't duplicated."""
+        path = tmp_path / "calibration.json"
+        service = CalibrationService(path)
+        record(service, "a")
+        log = service.log_path.read_text()
+        service.compact()
+        # Crash between writing the snapshot and clearing the log
+        service.log_path.write_text(log + '{"type": "feedback", "analysis_id"')
+
+        reloaded = CalibrationService(path)
+        assert len(reloaded.samples) == 1
+        assert reloaded.samples[0].actual_hours is None
+
+    def test_snapshot_same_without_orjson(self, tmp_path, monkeypatch):
+        """The stdlib json fallback writes an equivalent snapshot."""
+        service = CalibrationService(tmp_path / "calibration.json")
+        record(service, "a")
+        service.compact()
+        with_orjson = json.loads(service.data_path.read_bytes())
+
+        monkeypatch.setattr(calibration, "orjson", None)
+        service.compact()
+
+        assert json.loads(service.data_path.read_bytes()) == with_orjson
+        assert with_orjson["samples"][0]["timestamp"] == service.samples[0].timestamp
+
+
+class TestCalibrationAsync:
+    """Test cases for the async calibration API."""
+
+    async def test_async_calls_run_off_the_event_loop(self, tmp_path, monkeypatch):
+        """Async variants do the same work on a worker thread."""
+        service = CalibrationService(tmp_path / "calibration.json")
+        threads = []
+        original = service._append_log
+
+        def spy(*records):
+            threads.append(threading.current_thread())
+            original(*records)
+
+        monkeypatch.setattr(service, "_append_log", spy)
+
+        await service.record_prediction_async("a", 100, 6000, 3000, "Internal Tool", "M")
+        await service.add_feedback_async("a", actual_hours=50)
+
+        assert service.samples[0].hours_error_pct == 100.0
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+
+
+class TestCalibrationRetention:
+    """Test cases for the bounded recent window and historical reservoir."""
+
+    def record_with_feedback(self, service, count):
+        for i in range(count):
+            record(service, f"a{i}")
+            service.add_feedback(f"a{i}", actual_hours=50)
+
+    def test_memory_is_bounded(self, tmp_path):
+        """Old samples move to a fixed-size reservoir and statistics cover what is kept."""
+        service = CalibrationService(tmp_path / "calibration.json", max_recent=3, max_historical=2)
+        self.record_with_feedback(service, 10)
+
+        assert [s.analysis_id for s in service.samples] == ["a7", "a8", "a9"]
+        assert len(service.historical) == 2
+        assert service.get_stats().sample_count == 5
+        assert len(service._by_id) == 5
+
+        service.add_feedback(service.historical[0].analysis_id, actual_hours=200)
+        assert service.get_stats().sample_count == 5
+
+    def test_reload_keeps_recent_and_reservoir(self, tmp_path):
+        """Both tiers survive compaction and reload."""
+        path = tmp_path / "calibration.json"
+        service = CalibrationService(path, max_recent=3, max_historical=2)
+        self.record_with_feedback(service, 10)
+        service.compact()
+
+        reloaded = CalibrationService(path, max_recent=3, max_historical=2)
+        assert list(reloaded.samples) == list(service.samples)
+        assert reloaded.historical == service.historical
+        assert reloaded._retired == 7
+
+    def test_snapshot_full_reads_everything_from_disk(self, tmp_path):
+        """Audit exports include dropped samples, before and after compaction."""
+        service = CalibrationService(tmp_path / "calibration.json", max_recent=3, max_historical=2)
+        self.record_with_feedback(service, 10)
+
+        before = service.snapshot_full()
+        service.compact()
+        after = service.snapshot_full()
+
+        assert [s.analysis_id for s in before] == [f"a{i}" for i in range(10)]
+        assert sorted(s.analysis_id for s in after) == [f"a{i}" for i in range(10)]
+        assert all(s.hours_error_pct == 100.0 for s in after)
@@ -0,0 +1,86 @@
+"""
+Tests for COCOMO II estimator.
+"""
+import dataclasses
+
+import pytest
+
+from app.services.cocomo_estimator import CocomoEstimator, EffortMultipliers, cost_comparator
+
+
+class TestCocomoEstimator:
+    """Test cases for CocomoEstimator."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.estimator = CocomoEstimator()
+
+    def test_estimate_is_memoized(self):
+        """Repeat estimates return the same result, however the arguments are passed."""
+        first = self.estimator.estimate(12000, 8, 40.0, True)
+        again = self.estimator.estimate(loc=12000, tech_debt_score=8, test_coverage_percent=40.0, has_ci=True)
+
+        assert again is first
+        assert self.estimator.estimate(12000, 9, 40.0, True) is not first
+
+    def test_each_call_is_logged(self, caplog):
+        """Cache hits still log the estimate summary."""
+        with caplog.at_level("INFO", logger="app.services.cocomo_estimator"):
+            self.estimator.estimate(7000)
+            self.estimator.estimate(7000)
+
+        assert sum("[COCOMO]" in r.message for r in caplog.records) == 2
+
+    def test_estimate_is_immutable(self):
+        """Shared estimates can't be modified by one caller."""
+        estimate = self.estimator.estimate(5000)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            estimate.hours_typical = 0
+        with pytest.raises(TypeError):
+            estimate.hours_breakdown["testing"] = 0
+
+    def test_cost_range_matches_region_costs(self):
+        """cost_range agrees with the costs stored for UA and EU and covers every region."""
+        estimate = self.estimator.estimate(20000, 11, 60.0)
+
+        assert estimate.cost_range("ua") == (estimate.cost_ua_typical, estimate.cost_ua_min, estimate.cost_ua_max)
+        assert estimate.cost_range("eu") == (estimate.cost_eu_typical, estimate.cost_eu_min, estimate.cost_eu_max)
+        assert set(CocomoEstimator.RATE_RANGES) == set(CocomoEstimator.RATES)
+
+    def test_to_dict_returns_a_fresh_dict(self):
+        """Changing one serialized estimate doesn't affect the shared estimate."""
+        estimate = self.estimator.estimate(30000, 4)
+
+        result = estimate.to_dict()
+        result["hours"]["typical"] = 0
+
+        assert estimate.to_dict()["hours"]["typical"] == round(estimate.hours_typical)
+
+
+    def test_product_effort_is_part_of_total(self):
+        """product_effort is the product-factor subset of the total EAF."""
+        multipliers = EffortMultipliers(reliability=1.1, complexity=1.2, tool_use=0.9)
+
+        assert multipliers.product_effort == pytest.approx(1.1 * 1.2)
+        assert multipliers.total == pytest.approx(1.1 * 1.2 * 0.9)
+
+class TestCostComparator:
+    """Test cases for CostComparator."""
+
+    @pytest.mark.parametrize("factor, verdict", [
+        (0.5, "significantly_underpaid"),
+        (0.7, "underpaid"),
+        (0.9, "within_range"),
+        (1.1, "within_range"),
+        (1.3, "overpaid"),
+        (1.5, "significantly_overpaid"),
+    ])
+    def test_verdicts(self, factor, verdict):
+        """Verdicts follow the deviation from the typical estimate."""
+        estimate = CocomoEstimator().estimate(5000)
+
+        result = cost_comparator.compare(estimate, estimate.cost_ua_typical * factor)
+
+        assert result.verdict == verdict
+        assert f"{abs(factor - 1) * 100:.1f}%" in result.verdict_description